@@ -1,6 +1,7 @@
-import math
 import time
 
+from cutting_stock.ffd import ffd_heuristic
+
 # # Stock and order information (provided)
 # stocks = {
 #     "Type 1": {"length": 80, "cost": 90},
@@ -54,98 +55,62 @@ order = {
     "L": {"length": 30, "demand": 20},
     "XL": {"length": 40, "demand": 10},
 }
-def ffd_heuristic(stocks, order):
-    """
-    Applies the First-Fit Decreasing heuristic to the cutting stock problem.
-
-    Args:
-        stocks: A dictionary containing stock types, their lengths, and costs.
-        order: A dictionary containing order types, their lengths, and demands.
-
-    Returns:
-        A list of cutting patterns, where each pattern is a dictionary
-        indicating how many of each order type are cut from a stock type.
-    """
-
-    # Sort order items by decreasing length
-    order_items = sorted(order.items(), key=lambda x: x[1]["length"], reverse=True)
 
-    # Initialize residual demands
-    residual_demands = {item: details["demand"] for item, details in order.items()}
 
-    # Initialize patterns list
-    patterns = []
+if __name__ == "__main__":
+    # Start timer
+    start_time = time.time()
 
-    while any(residual_demands.values()):  # Continue until all demands are met
-        for stock_type, stock_details in stocks.items():
-            stock_length = stock_details["length"]
-            remaining_length = stock_length
-            pattern = {item: 0 for item in order}  # Initialize an empty pattern
+    # Get the cutting patterns using FFD heuristic
+    patterns = ffd_heuristic(stocks, order)
 
-            for item, _ in order_items:
-                item_length = order[item]["length"]
-                while remaining_length >= item_length and residual_demands[item] > 0:
-                    pattern[item] += 1
-                    remaining_length -= item_length
-                    residual_demands[item] -= 1
+    # End timer
+    end_time = time.time()
+    execution_time = end_time - start_time
 
-            if any(pattern.values()):  # Add pattern only if it's not empty
-                patterns.append({"stock_type": stock_type, "cuts": pattern})
+    # Prepare the summary output
+    print("Summary of Steel Bars Usage and Demand Fulfillment:\n")
 
-    return patterns
-# Start timer
-start_time = time.time()
+    total_cost = 0
+    for stock_type, stock_details in stocks.items():
+        stock_length = stock_details["length"]
+        stock_cost = stock_details["cost"]
+        stock_total_cost = 0
 
-# Get the cutting patterns using FFD heuristic
-patterns = ffd_heuristic(stocks, order)
+        print(f"Stock {stock_type} (Length: {stock_length}):")
 
-# End timer
-end_time = time.time()
-execution_time = end_time - start_time
+        # Filter patterns for this stock type
+        stock_patterns = [p for p in patterns if p["stock_type"] == stock_type]
 
-# Prepare the summary output
-print("Summary of Steel Bars Usage and Demand Fulfillment:\n")
+        for i, pattern in enumerate(stock_patterns):
+            pattern_cost = stock_cost
+            stock_total_cost += pattern_cost
 
-total_cost = 0
-for stock_type, stock_details in stocks.items():
-    stock_length = stock_details["length"]
-    stock_cost = stock_details["cost"]
-    stock_total_cost = 0
+            # Format cuts into a list for easier printing
+            cuts_list = [pattern["cuts"][item] for item in order]
 
-    print(f"Stock {stock_type} (Length: {stock_length}):")
+            print(f"  Pattern {i+1}: {cuts_list} x1 (Cost: ${pattern_cost} each)")
 
-    # Filter patterns for this stock type
-    stock_patterns = [p for p in patterns if p["stock_type"] == stock_type]
+        total_cost += stock_total_cost
+        print(f"  Total Cost for {stock_type}: ${stock_total_cost}\n")
 
-    for i, pattern in enumerate(stock_patterns):
-        pattern_cost = stock_cost
-        stock_total_cost += pattern_cost
+    # Calculate demand fulfillment
+    demand_fulfillment = {
+        item: sum(p["cuts"][item] for p in patterns) for item in order
+    }
 
-        # Format cuts into a list for easier printing
-        cuts_list = [pattern["cuts"][item] for item in order]
+    print("Demand Fulfillment:")
+    for item, fulfilled in demand_fulfillment.items():
+        print(f"  {item}: {fulfilled}/{order[item]['demand']} pieces cut")
+    print("\n")
 
-        print(f"  Pattern {i+1}: {cuts_list} x1 (Cost: ${pattern_cost} each)")
-
-    total_cost += stock_total_cost
-    print(f"  Total Cost for {stock_type}: ${stock_total_cost}\n")
-
-# Calculate demand fulfillment
-demand_fulfillment = {
-    item: sum(p["cuts"][item] for p in patterns) for item in order
-}
+    print("Total Cost by Stock Type:")
+    for stock_type, stock_details in stocks.items():
+        stock_cost = stock_details["cost"]
+        # Count how many times this stock type is used in patterns
+        stock_count = len([p for p in patterns if p["stock_type"] == stock_type])
+        stock_total_cost = stock_cost * stock_count
+        print(f"  {stock_type}: ${stock_total_cost}")
 
-print("Demand Fulfillment:")
-for item, fulfilled in demand_fulfillment.items():
-    print(f"  {item}: {fulfilled}/{order[item]['demand']} pieces cut")
-print("\n")
-
-print("Total Cost by Stock Type:")
-for stock_type, stock_details in stocks.items():
-    stock_cost = stock_details["cost"]
-    # Count how many times this stock type is used in patterns
-    stock_count = len([p for p in patterns if p["stock_type"] == stock_type])
-    stock_total_cost = stock_cost * stock_count
-    print(f"  {stock_type}: ${stock_total_cost}")
-
-print(f"\nTotal Cost: ${total_cost}")
-print(f"Execution Time: {execution_time:.4f} seconds")
+    print(f"\nTotal Cost: ${total_cost}")
+    print(f"Execution Time: {execution_time:.4f} seconds")
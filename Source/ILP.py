@@ -1,21 +1,57 @@
+import time
 
-import numpy as np
-from numpy import linalg as LA
-# Tạo ma trận A
-A = np.array([[1, 2, 3],
-              [4, 5, 6]])
-
-# Thực hiện SVD
-U, S, VT = np.linalg.svd(A)
-
-# Chuyển đổi S thành ma trận chéo
-Sigma = np.zeros((U.shape[0], VT.shape[0]))
-np.fill_diagonal(Sigma, S)
-
-# In kết quả
-print("Ma trận U:")
-print(U)
-print("\nMa trận Sigma:")
-print(Sigma)
-print("\nMa trận V^T:")
-print(VT)
\ No newline at end of file
+from cutting_stock.column_generation import column_generation_cutting
+
+# Define stock information with their lengths and costs
+stocks = {
+    "Type 1": {"length": 80, "cost": 90},
+    "Type 2": {"length": 100, "cost": 110},
+    "Type 3": {"length": 120, "cost": 130},
+}
+
+# Define order requirements with their lengths and demands
+order = {
+    "S": {"length": 15, "demand": 20},
+    "M": {"length": 30, "demand": 10},
+    "L": {"length": 34, "demand": 15},
+    "XL": {"length": 47, "demand": 5},
+}
+
+
+if __name__ == "__main__":
+    # Perform column generation
+    start_time = time.time()
+    stock_usage, total_cost, lower_bound = column_generation_cutting(order, stocks)
+    end_time = time.time()
+    execution_time = end_time - start_time
+
+    # Print the summary with patterns as vectors and costs
+    print("Summary of Steel Bars Usage and Demand Fulfillment:\n")
+
+    total_cost_by_stock = {stock_id: 0 for stock_id in stocks}
+    cut_counts = {demand: 0 for demand in order}
+
+    for stock_id, patterns in stock_usage.items():
+        print(f"Stock {stock_id} (Length: {stocks[stock_id]['length']}):")
+        pattern_index = 1
+        for pattern_tuple, count in patterns.items():
+            pattern_dict = dict(pattern_tuple)
+            vector = [pattern_dict.get(demand, 0) for demand in order.keys()]
+            pattern_cost = stocks[stock_id]['cost']
+            total_cost_by_stock[stock_id] += pattern_cost * count
+            for demand in order:
+                cut_counts[demand] += pattern_dict.get(demand, 0) * count
+            print(f"  Pattern {pattern_index}: {vector} x{count} (Cost: ${pattern_cost} each)")
+            pattern_index += 1
+
+    print("\nDemand Fulfillment:")
+    for demand in order:
+        print(f"  {demand}: {cut_counts[demand]}/{order[demand]['demand']} pieces cut")
+
+    print("\nTotal Cost by Stock Type:")
+    for stock_id, cost in total_cost_by_stock.items():
+        print(f"  {stock_id}: ${cost}")
+
+    print(f"\nTotal Cost: ${total_cost}")
+    print(f"LP Lower Bound: ${lower_bound:.2f} (gap {(total_cost - lower_bound) / total_cost * 100:.2f}%)\n")
+    print(f"Execution Time: {execution_time:.4f} seconds")
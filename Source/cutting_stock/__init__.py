@@ -0,0 +1,81 @@
+"""
+Cutting stock solvers.
+
+    from cutting_stock import solve
+
+    plan = solve(stocks, order, method="greedy")
+    print(plan.total_cost, plan.demand_met)
+
+Importing the package has no side effects and only loads `api`; the solver
+modules, and NumPy, SciPy and matplotlib with them, are imported on first use.
+"""
+
+from importlib import import_module
+
+from .api import SOLVERS, CuttingPlan, get_solver, plan_summary, solve
+
+# Public name -> submodule defining it, imported on first attribute access
+_LAZY = {
+    "PatternCache": "patterns",
+    "PatternMatrix": "patterns",
+    "PlanScores": "patterns",
+    "evaluate_plans": "patterns",
+    "evaluate_stock_usage": "patterns",
+    "generate_patterns": "patterns",
+    "is_valid_pattern": "patterns",
+    "pattern_cache": "patterns",
+    "pattern_vectors": "patterns",
+    "greedy_cutting": "greedy",
+    "modified_greedy_cutting": "greedy",
+    "ffd_cutting": "ffd",
+    "ffd_heuristic": "ffd",
+    "iter_ffd_cutting": "ffd",
+    "iter_ffd_heuristic": "ffd",
+    "ffd_stock_usage": "ffd",
+    "simulated_annealing": "annealing",
+    "parallel_simulated_annealing": "annealing",
+    "genetic_cutting": "genetic",
+    "column_generation_cutting": "column_generation",
+    "branch_and_bound": "bnb",
+    "solve_batch": "batch",
+    "Incumbent": "anytime",
+    "iter_solve": "anytime",
+    "solve_anytime": "anytime",
+    "apply_delta": "incremental",
+    "repair_plan": "incremental",
+    "resolve": "incremental",
+    "PatternLibrary": "library",
+    "use_library": "library",
+    "PatternFile": "patternfile",
+    "load_pattern_file": "patternfile",
+    "write_pattern_file": "patternfile",
+    "ResultCache": "results",
+    "result_cache": "results",
+    "use_result_cache": "results",
+    "PlanService": "service",
+    "PlanEntry": "stream",
+    "plan_entries": "stream",
+    "solve_stream": "stream",
+    "write_csv": "stream",
+    "write_jsonl": "stream",
+    "MemoryProfile": "profiling",
+    "profile_memory": "profiling",
+    "Trace": "profiling",
+    "profile_solve": "profiling",
+    "plot_pattern": "plot",
+    "plot_patterns": "plot",
+}
+
+__all__ = ["SOLVERS", "CuttingPlan", "get_solver", "plan_summary", "solve", *_LAZY]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,389 @@
+"""
+Simulated Annealing over cutting plans, single chain or parallel chains.
+"""
+
+import itertools
+import math
+import os
+import random
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .patterns import PatternMatrix, empty_stock_usage
+from .profiling import active_trace, count, timer
+
+
+def check_items_fit(matrix):
+    """Raise ValueError if an item with demand is cut by no pattern of `matrix`."""
+    wanted = np.flatnonzero(matrix.demand > 0)
+    fits = matrix.counts[:, wanted].any(axis=0)
+    if not fits.all():
+        raise ValueError(f"item {matrix.items[wanted[~fits][0]]} is longer than every stock type")
+
+def create_initial_solution(matrix, rng=random):
+    """Create an initial random solution (every item with demand must fit, see `check_items_fit`)."""
+    solution = np.zeros(len(matrix), dtype=np.int64)
+    remaining_demand = matrix.demand.copy()
+    
+    while (remaining_demand > 0).any():
+        stock_id = rng.choice(matrix.stock_ids)
+        patterns = matrix.rows(stock_id)
+        if len(patterns):
+            row = rng.choice(patterns)
+            solution[row] += 1
+            remaining_demand -= matrix.counts[row]
+    
+    return solution
+
+class AnnealingState:
+    """
+    A plan under annealing, kept as the list of pattern-matrix rows of its bars.
+
+    Cost, item coverage and shortage are updated incrementally when bars are
+    replaced, so a move costs O(number of items) instead of a full evaluation.
+    """
+
+    def __init__(self, matrix, solution):
+        self.matrix = matrix
+        self.bars = np.repeat(np.arange(len(matrix)), solution).tolist()
+        self.cost, coverage = matrix.evaluate(solution)
+        self.coverage = np.array(coverage, dtype=np.int64)
+        self.shortage = self.shortage_after(0)
+
+    def shortage_after(self, delta):
+        """Number of missing pieces if the coverage changed by `delta`."""
+        return int(np.maximum(self.matrix.demand - self.coverage - delta, 0).sum())
+
+    def replace(self, positions, rows, delta_cost, delta_coverage, shortage):
+        """Remove the bars at `positions`, add bars cut with `rows` and apply the precomputed deltas."""
+        for position in sorted(positions, reverse=True):
+            self.bars[position] = self.bars[-1]
+            self.bars.pop()
+        self.bars.extend(rows)
+        self.cost += delta_cost
+        self.coverage += delta_coverage
+        self.shortage = shortage
+
+    def solution(self):
+        """Return the plan as a row-count vector."""
+        return np.bincount(self.bars, minlength=len(self.matrix))
+
+# Pattern-matrix rows `propose_move` draws from, computed once per run so a move never scans the matrix:
+# the rows of each stock type, the rows cutting each item and the cheapest rows
+MoveRows = namedtuple("MoveRows", ["stock", "item", "cheapest"])
+
+def move_rows(matrix):
+    """Return the `MoveRows` of a pattern matrix."""
+    stock_rows = [matrix.rows(stock_id) for stock_id in matrix.stock_ids]
+    item_rows = [np.flatnonzero(matrix.counts[:, i]) for i in range(len(matrix.items))]
+    cheapest = np.flatnonzero(matrix.cost == matrix.cost.min()) if len(matrix) else np.zeros(0, dtype=np.int64)
+    return MoveRows(stock_rows, item_rows, cheapest)
+
+def propose_move(state, rng, rows):
+    """
+    Draw a local move: swap a bar's pattern, move a bar to another stock type,
+    merge two bars into one, or drop a bar. A bar cutting a missing item is
+    added instead half of the time while the plan is short.
+
+    Args:
+        rows: The `MoveRows` of the state's matrix.
+
+    Returns:
+        The bar positions to remove and the rows to add, or None if the drawn
+        move does not apply to the current plan.
+    """
+    matrix = state.matrix
+    bars = state.bars
+    stock_rows = rows.stock
+    if not bars or (state.shortage > 0 and rng.random() < 0.5):
+        missing = np.flatnonzero(matrix.demand > state.coverage)
+        if not len(missing):
+            return None
+        candidates = rows.item[int(rng.choice(missing))]
+        if not len(candidates):
+            return None
+        return (), (int(rng.choice(candidates)),)
+
+    move = rng.random()
+    position = rng.randrange(len(bars))
+    row = bars[position]
+    stock = matrix.stock_index[row]
+
+    if move < 0.35:
+        # Swap the pattern of a bar, keeping its stock type
+        return (position,), (int(rng.choice(stock_rows[stock])),)
+
+    if move < 0.6:
+        # Cut the bar from another stock type
+        if len(stock_rows) < 2:
+            return None
+        other = rng.randrange(len(stock_rows) - 1)
+        other += other >= stock
+        if not len(stock_rows[other]):
+            return None
+        return (position,), (int(rng.choice(stock_rows[other])),)
+
+    if move < 0.8:
+        # Merge two bars into the cheapest single pattern that still covers what they were needed for
+        if len(bars) < 2:
+            return None
+        second = rng.randrange(len(bars) - 1)
+        second += second >= position
+        coverage = state.coverage - matrix.counts[row] - matrix.counts[bars[second]]
+        need = np.maximum(matrix.demand - coverage, 0)
+        needed = np.flatnonzero(need)
+        if not len(needed):
+            candidates = rows.cheapest
+        else:
+            # Only rows cutting the needed item with the fewest rows can cover everything
+            candidates = min((rows.item[i] for i in needed), key=len)
+            candidates = candidates[(matrix.counts[candidates] >= need).all(axis=1)]
+        if not len(candidates):
+            return None
+        costs = matrix.cost[candidates]
+        return (position, second), (int(rng.choice(candidates[costs == costs.min()])),)
+
+    # Drop the bar (only pays off when it is redundant)
+    return (position,), ()
+
+def anneal(state, rng, temperature, cooling_rate, iterations, penalty, deadline=None, on_improve=None):
+    """
+    Run simulated annealing moves on `state` in place.
+
+    Stops early once `time.monotonic()` passes `deadline`, if given; with
+    `iterations` None it runs until then. `on_improve(solution, cost)` is
+    called with every new best demand-meeting solution.
+
+    Returns:
+        The best demand-meeting solution seen (row-count vector, or None), its
+        cost and the final temperature.
+    """
+    matrix = state.matrix
+    candidate_rows = move_rows(matrix)
+    costs = matrix.cost.tolist()
+    counts = list(matrix.counts)
+    zero = np.zeros(len(matrix.items), dtype=np.int64)
+
+    best_solution, best_cost = None, float("inf")
+    if state.shortage == 0:
+        best_solution, best_cost = state.solution(), state.cost
+        if on_improve is not None:
+            on_improve(best_solution, best_cost)
+
+    # Move statistics are kept in locals and only reported to an active trace at the end
+    trace = active_trace()
+    sample_every = trace.sample_every if trace is not None else 0
+    accepted = rejected = idle = improved = 0
+
+    completed = iterations
+    for iteration in range(iterations) if iterations is not None else itertools.count():
+        if deadline is not None and iteration % 256 == 0 and time.monotonic() >= deadline:
+            completed = iteration
+            break
+        if sample_every and iteration % sample_every == 0:
+            trace.sample("sa.temperature", iteration=iteration, temperature=temperature,
+                         cost=state.cost, shortage=state.shortage)
+        move = propose_move(state, rng, candidate_rows)
+        temperature *= cooling_rate
+        if move is None:
+            idle += 1
+            continue
+
+        positions, rows = move
+        removed = [state.bars[position] for position in positions]
+        delta_cost = sum(costs[r] for r in rows) - sum(costs[r] for r in removed)
+        delta_coverage = zero.copy()
+        for r in rows:
+            delta_coverage += counts[r]
+        for r in removed:
+            delta_coverage -= counts[r]
+        shortage = state.shortage_after(delta_coverage)
+        delta = delta_cost + penalty * (shortage - state.shortage)
+
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            state.replace(positions, rows, delta_cost, delta_coverage, shortage)
+            accepted += 1
+            if shortage == 0 and state.cost < best_cost:
+                best_solution, best_cost = state.solution(), state.cost
+                improved += 1
+                if on_improve is not None:
+                    on_improve(best_solution, best_cost)
+        else:
+            rejected += 1
+
+    if trace is not None:
+        count("sa.iterations", completed)
+        count("sa.accepted", accepted)
+        count("sa.rejected", rejected)
+        count("sa.idle", idle)
+        count("sa.improved", improved)
+    return best_solution, best_cost, temperature
+
+def simulated_annealing(order, stocks, initial_temperature=100, cooling_rate=0.9985, max_iterations=5000, seed=None,
+                        prune=True, initial=None, deadline=None, callback=None):
+    """
+    Perform Simulated Annealing to find the optimal cutting solution.
+
+    Starts from a random plan, or from the `initial` stock usage when given
+    (a warm start, see `PatternMatrix.from_stock_usage`), and applies local
+    moves (see `propose_move`), scoring each by its cost change plus a
+    penalty of the most expensive bar per missing piece. With `prune` (the default) dominated and duplicate
+    patterns are dropped first (see `PatternMatrix.prune`), which never
+    removes a better plan.
+
+    With a `deadline` (wall-clock budget in seconds) the run stops when it
+    runs out, or only then if `max_iterations` is None, and `callback` is
+    called as callback(stock_usage, total_cost) with every improving plan.
+
+    Returns:
+        The best stock usage, its cost and whether it meets the demand; if no
+        plan met the demand in time, the last plan and its cost.
+    """
+    if max_iterations is None and deadline is None:
+        raise ValueError("max_iterations=None needs a deadline")
+    if not any(order[f]["demand"] for f in order):
+        # Nothing to cut (and no pattern to draw a move from)
+        return empty_stock_usage(stocks), 0, True
+    rng = random.Random(seed)
+    with timer("sa.setup"):
+        matrix = PatternMatrix(stocks, order)
+        if prune:
+            matrix, _ = matrix.prune()
+        check_items_fit(matrix)
+        solution = create_initial_solution(matrix, rng) if initial is None else matrix.from_stock_usage(initial)
+        state = AnnealingState(matrix, solution)
+    penalty = matrix.cost.max().item()
+    end = None if deadline is None else time.monotonic() + deadline
+    on_improve = None
+    if callback is not None:
+        def on_improve(solution, cost):
+            callback(matrix.to_stock_usage(solution), cost)
+    with timer("sa.anneal"):
+        best_solution, best_cost, _ = anneal(state, rng, initial_temperature, cooling_rate, max_iterations, penalty,
+                                             end, on_improve)
+
+    if best_solution is None:
+        return matrix.to_stock_usage(state.solution()), state.cost, False
+    return matrix.to_stock_usage(best_solution), best_cost, True
+
+# Pattern matrix and penalty of the chain worker processes, set once by the pool initializer
+_chain_matrix = None
+_chain_penalty = None
+
+def _init_chain_worker(matrix, penalty):
+    global _chain_matrix, _chain_penalty
+    _chain_matrix = matrix
+    _chain_penalty = penalty
+
+def _run_chain(solution, rng_state, temperature, cooling_rate, iterations, deadline):
+    """Continue one annealing chain in a worker and return its new state and best plan."""
+    rng = random.Random()
+    rng.setstate(rng_state)
+    state = AnnealingState(_chain_matrix, solution)
+    best_solution, best_cost, temperature = anneal(
+        state, rng, temperature, cooling_rate, iterations, _chain_penalty, deadline)
+    energy = state.cost + _chain_penalty * state.shortage
+    return state.solution(), rng.getstate(), temperature, energy, best_solution, best_cost
+
+def parallel_simulated_annealing(order, stocks, chains=None, master_seed=0, max_iterations=5000,
+                                 exchange_interval=None, deadline=None, initial_temperature=100,
+                                 cooling_rate=0.9985, temperature_ratio=1.5, workers=None, prune=True, callback=None):
+    """
+    Run several Simulated Annealing chains in a process pool and keep the best plan.
+
+    Every chain gets its own random stream seeded from `master_seed`. Without
+    `exchange_interval` the chains run independently. With it, chain k starts
+    at `initial_temperature * temperature_ratio ** k`, and after every
+    `exchange_interval` moves neighbouring chains swap plans with the parallel
+    tempering acceptance rule.
+
+    Args:
+        chains: Number of chains, defaulting to the number of CPU cores.
+        master_seed: Seed all chain seeds and swap decisions derive from.
+        max_iterations: Moves per chain, or None to run until the deadline.
+        exchange_interval: Moves between plan exchanges, or None for independent chains.
+        deadline: Wall-clock budget in seconds; chains stop early when it runs out.
+        callback: Called as callback(stock_usage, total_cost) with every
+            improving plan, checked after each round of `exchange_interval`
+            moves (1000 moves when running until the deadline without exchanges).
+        workers: Worker processes, defaulting to `chains`; 1 runs every chain in-process.
+        prune: Drop dominated and duplicate patterns first, as in `simulated_annealing`.
+
+    Returns:
+        The best stock usage, its cost and whether it meets the demand; if no
+        plan met the demand in time, the last plan of the chain with the
+        lowest penalized cost. With an iteration budget only, the result does
+        not depend on `workers`.
+    """
+    if max_iterations is None and deadline is None:
+        raise ValueError("max_iterations=None needs a deadline")
+    if not any(order[f]["demand"] for f in order):
+        return empty_stock_usage(stocks), 0, True
+    chains = chains or os.cpu_count()
+    workers = workers or chains
+    end = None if deadline is None else time.monotonic() + deadline
+    matrix = PatternMatrix(stocks, order)
+    if prune:
+        matrix, _ = matrix.prune()
+    check_items_fit(matrix)
+    penalty = matrix.cost.max().item()
+
+    master = random.Random(master_seed)
+    solutions, rng_states, temperatures = [], [], []
+    for k in range(chains):
+        rng = random.Random(master.getrandbits(64))
+        solutions.append(create_initial_solution(matrix, rng))
+        rng_states.append(rng.getstate())
+        ladder = temperature_ratio ** k if exchange_interval else 1
+        temperatures.append(initial_temperature * ladder)
+
+    best_solution, best_cost = None, float("inf")
+    interval = exchange_interval or max_iterations or 1000
+    executor = None
+    if workers > 1:
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_chain_worker, initargs=(matrix, penalty))
+        run = executor.map
+    else:
+        _init_chain_worker(matrix, penalty)
+        run = map
+
+    try:
+        done = 0
+        while max_iterations is None or done < max_iterations:
+            iterations = interval if max_iterations is None else min(interval, max_iterations - done)
+            results = list(run(_run_chain, solutions, rng_states, temperatures,
+                               [cooling_rate] * chains, [iterations] * chains, [end] * chains))
+            done += iterations
+
+            energies = []
+            round_cost = best_cost
+            for k, (solution, rng_state, temperature, energy, chain_best, chain_cost) in enumerate(results):
+                solutions[k], rng_states[k], temperatures[k] = solution, rng_state, temperature
+                energies.append(energy)
+                if chain_cost < best_cost:
+                    best_solution, best_cost = chain_best, chain_cost
+            if callback is not None and best_cost < round_cost:
+                callback(matrix.to_stock_usage(best_solution), best_cost)
+
+            if end is not None and time.monotonic() >= end:
+                break
+            if exchange_interval:
+                # Alternate even and odd neighbour pairs between rounds
+                for k in range((done // interval) % 2, chains - 1, 2):
+                    delta = (energies[k] - energies[k + 1]) * (1 / temperatures[k] - 1 / temperatures[k + 1])
+                    if delta >= 0 or master.random() < math.exp(delta):
+                        solutions[k], solutions[k + 1] = solutions[k + 1], solutions[k]
+                        energies[k], energies[k + 1] = energies[k + 1], energies[k]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if best_solution is None:
+        # As a single chain does, return the last plan of the chain closest to meeting the demand
+        states = [AnnealingState(matrix, solution) for solution in solutions]
+        state = min(states, key=lambda state: state.cost + penalty * state.shortage)
+        return matrix.to_stock_usage(state.solution()), state.cost, state.shortage == 0
+    return matrix.to_stock_usage(best_solution), best_cost, True
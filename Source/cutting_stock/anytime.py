@@ -0,0 +1,99 @@
+"""
+Anytime solving under a wall-clock deadline.
+
+Every solver takes a `deadline` in seconds and reports improving plans as it
+finds them (see `solve`). This module adds the elapsed time to those reports,
+as `Incumbent` records, either through a callback:
+
+    plan = solve_anytime(stocks, order, "sa", deadline=2.0, callback=print)
+
+or as a generator, the solver running in a background thread:
+
+    for incumbent in iter_solve(stocks, order, "genetic", deadline=2.0):
+        send(incumbent.total_cost, incumbent.elapsed)
+
+The last incumbent is marked `final` and is the plan `solve` returns, the
+best one found when time ran out.
+"""
+
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from .api import solve
+
+Incumbent = namedtuple("Incumbent", ["method", "stock_usage", "total_cost", "elapsed", "final"])
+Incumbent.__doc__ = """
+An improving plan reported while solving.
+
+Attributes:
+    method: Solver name.
+    stock_usage: The plan, {stock_id: {pattern_tuple: count}}.
+    total_cost: Its total cost.
+    elapsed: Seconds since solving started.
+    final: Whether this is the plan the solver returned.
+"""
+
+_DONE = object()
+
+
+def solve_anytime(stocks, order, method="sa", deadline=2.0, callback=None, **options):
+    """
+    Solve an order within `deadline` seconds, reporting improving plans.
+
+    Args:
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: A dictionary containing order types, their lengths, and demands.
+        method: Solver name, one of `SOLVERS`.
+        deadline: Wall-clock budget in seconds, None for no limit.
+        callback: Called with an `Incumbent` for every plan cheaper than the
+            ones before, and with the returned plan as the final one.
+        **options: Extra keyword arguments for the solver; solvers with an
+            iteration budget (`max_iterations`, `generations`) may be given
+            None to search until the deadline.
+
+    Returns:
+        The `CuttingPlan` of `solve`.
+    """
+    start_time = time.monotonic()
+    best_cost = float("inf")
+
+    def report(stock_usage, total_cost):
+        nonlocal best_cost
+        if callback is not None and total_cost < best_cost:
+            best_cost = total_cost
+            callback(Incumbent(method, stock_usage, total_cost, time.monotonic() - start_time, False))
+
+    plan = solve(stocks, order, method, deadline=deadline, callback=report, **options)
+    if callback is not None:
+        callback(Incumbent(method, plan.stock_usage, plan.total_cost, time.monotonic() - start_time, True))
+    return plan
+
+
+def iter_solve(stocks, order, method="sa", deadline=2.0, **options):
+    """
+    Generator version of `solve_anytime`: yields the `Incumbent` records as
+    they are found, the last one being final.
+
+    The solver runs in a daemon thread, so stopping the iteration early does
+    not stop it before its deadline. Solver errors are raised here.
+    """
+    records = queue.Queue()
+
+    def run():
+        try:
+            solve_anytime(stocks, order, method, deadline, records.put, **options)
+        except BaseException as error:
+            records.put(error)
+        finally:
+            records.put(_DONE)
+
+    threading.Thread(target=run, daemon=True).start()
+    while True:
+        record = records.get()
+        if record is _DONE:
+            return
+        if isinstance(record, BaseException):
+            raise record
+        yield record
@@ -0,0 +1,131 @@
+"""
+Common `solve` entry point over every solver of the package.
+
+Solver modules are imported on first use, so importing this module is cheap.
+"""
+
+import time
+from collections import namedtuple
+from importlib import import_module
+
+CuttingPlan = namedtuple("CuttingPlan", ["method", "stock_usage", "total_cost", "cut_counts", "demand_met", "stats"])
+CuttingPlan.__doc__ = """
+Result of `solve`.
+
+Attributes:
+    method: Name of the solver that produced the plan.
+    stock_usage: {stock_id: {pattern_tuple: count}} with pattern tuples as
+        `tuple(sorted(pattern.items()))`.
+    total_cost: Total cost of the bars used.
+    cut_counts: Number of pieces cut of every order item.
+    demand_met: Whether every demand is covered.
+    stats: Solver-specific statistics (lower bound, gap, ...), possibly empty.
+"""
+
+# Method name -> (module, function); every function takes (order, stocks, **options)
+SOLVERS = {
+    "greedy": ("greedy", "greedy_cutting"),
+    "modified": ("greedy", "modified_greedy_cutting"),
+    "ffd": ("ffd", "ffd_cutting"),
+    "sa": ("annealing", "simulated_annealing"),
+    "parallel_sa": ("annealing", "parallel_simulated_annealing"),
+    "genetic": ("genetic", "genetic_cutting"),
+    "column_generation": ("column_generation", "column_generation_cutting"),
+    "branch_and_bound": ("bnb", "branch_and_bound"),
+}
+
+# Solvers that enumerate every maximal pattern of the catalog
+PATTERN_SOLVERS = {"greedy", "modified", "sa", "parallel_sa", "genetic"}
+
+# Solvers taking deadline= (a wall-clock budget in seconds) and
+# callback=(stock_usage, total_cost) for improving plans themselves
+ANYTIME_SOLVERS = {"greedy", "modified", "sa", "parallel_sa", "genetic", "column_generation", "branch_and_bound"}
+
+
+def get_solver(method):
+    """Import and return the solver function registered under `method`."""
+    if method not in SOLVERS:
+        raise ValueError(f"unknown method {method!r}, expected one of {sorted(SOLVERS)}")
+    module, name = SOLVERS[method]
+    return getattr(import_module(f".{module}", __package__), name)
+
+
+def solve(stocks, order, method="greedy", cache=None, **options):
+    """
+    Solve a cutting stock order with one of the registered solvers.
+
+    Args:
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: A dictionary containing order types, their lengths, and demands.
+        method: Solver name, one of `SOLVERS`.
+        **options: Extra keyword arguments for the solver (seed, time_limit, ...).
+            Every method takes `deadline`, a wall-clock budget in seconds
+            counted from this call (pattern generation included), and
+            `callback`, called as callback(stock_usage, total_cost) with
+            improving plans; solvers outside `ANYTIME_SOLVERS` run to the end
+            and report their plan once.
+        cache: A `results.ResultCache` to answer repeated identical orders
+            from, True for the shared one, or None to always solve.
+
+    Returns:
+        A `CuttingPlan`.
+    """
+    if cache is not None and cache is not False:
+        if cache is True:
+            from .results import result_cache as cache
+        return cache.solve(stocks, order, method, **options)
+
+    from .patterns import evaluate_stock_usage, order_lengths, pattern_cache
+    from .profiling import phase
+
+    start_time = time.monotonic()
+    solver = get_solver(method)
+    if method in PATTERN_SOLVERS:
+        with phase("patterns"):
+            lengths = order_lengths(order)
+            for stock_info in stocks.values():
+                pattern_cache.get(stock_info["length"], lengths)
+
+    callback = options.get("callback")
+    if method not in ANYTIME_SOLVERS:
+        options.pop("deadline", None)
+        options.pop("callback", None)
+    elif options.get("deadline") is not None:
+        options["deadline"] = max(options["deadline"] - (time.monotonic() - start_time), 0.0)
+
+    with phase("search"):
+        stock_usage, total_cost, extra = solver(order, stocks, **options)
+    if callback is not None and method not in ANYTIME_SOLVERS:
+        callback(stock_usage, total_cost)
+    stats = {}
+    if method == "column_generation":
+        stats = {"lower_bound": extra}
+    elif method == "branch_and_bound":
+        stats = extra
+
+    with phase("evaluation"):
+        total_cost, cut = evaluate_stock_usage(stock_usage, stocks, order)
+        cut_counts = dict(zip(order, cut.tolist()))
+        demand_met = all(cut_counts[f] >= order[f]["demand"] for f in order)
+    return CuttingPlan(method, stock_usage, total_cost, cut_counts, demand_met, stats)
+
+
+def plan_summary(plan, order):
+    """
+    JSON-serializable view of a `CuttingPlan`.
+
+    Patterns are listed as {"stock", "pattern", "count"} with the pattern as a
+    vector of cut counts in the order of `order`.
+    """
+    from .stream import plan_entries
+
+    patterns = [{"stock": entry.stock, "pattern": list(entry.pattern), "count": entry.count}
+                for entry in plan_entries(plan.stock_usage, order)]
+    return {
+        "method": plan.method,
+        "total_cost": plan.total_cost,
+        "demand_met": plan.demand_met,
+        "cut_counts": plan.cut_counts,
+        "stats": {key: value.item() if hasattr(value, "item") else value for key, value in plan.stats.items()},
+        "patterns": patterns,
+    }
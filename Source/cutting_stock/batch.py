@@ -0,0 +1,109 @@
+"""
+Batch solving of many orders against one stock catalog.
+
+`solve_batch` fans the orders out over a process pool and yields each result
+as soon as its order is solved. The pattern tables of every (stock length,
+item lengths) signature in the batch are computed once in the parent, or
+read from pattern files, and preloaded into each worker's pattern cache.
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .api import PATTERN_SOLVERS, SOLVERS, solve
+from .patternfile import load_pattern_file
+from .patterns import order_lengths, pattern_cache
+
+
+def pattern_tables(orders, stocks, skip=()):
+    """Pattern vectors of every (stock length, item lengths) signature in a batch, except those in `skip`."""
+    tables = {}
+    for order in orders:
+        lengths = tuple(order_lengths(order))
+        for stock_info in stocks.values():
+            key = (stock_info["length"], lengths, True)
+            if key not in tables and key not in skip:
+                tables[key] = pattern_cache.get(*key)
+    return tables
+
+
+# Stock catalog of the worker processes, set once by the pool initializer
+_batch_stocks = None
+
+
+def _init_batch_worker(stocks, tables, pattern_files=()):
+    global _batch_stocks
+    _batch_stocks = stocks
+    for path in pattern_files:
+        tables = {**load_pattern_file(path).cache_entries(), **tables}
+    pattern_cache.maxsize = max(pattern_cache.maxsize, len(tables))
+    pattern_cache.update(tables)
+
+
+def _solve_order(method, order, options):
+    return solve(_batch_stocks, order, method, **options)
+
+
+def solve_batch(orders, stocks, method="greedy", workers=None, max_pending=None, pattern_files=(), **options):
+    """
+    Solve many orders on the same stock catalog across a process pool.
+
+    Args:
+        orders: Iterable of order dictionaries.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        method: Solver name, one of `SOLVERS`.
+        workers: Worker processes, defaulting to the number of CPU cores;
+            1 solves every order in-process.
+        max_pending: Orders submitted but not yet finished, defaulting to
+            four per worker, so huge batches do not queue up in memory.
+        pattern_files: Pattern files (see `patternfile`) every worker maps
+            into its pattern cache; their signatures are neither enumerated
+            in the parent nor sent to the workers.
+        **options: Extra keyword arguments for the solver.
+
+    Yields:
+        (index, plan) pairs in completion order, where `index` is the
+        position of the order in `orders` and `plan` its `CuttingPlan`.
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"unknown method {method!r}, expected one of {sorted(SOLVERS)}")
+    orders = list(orders)
+    workers = workers or os.cpu_count()
+    pattern_files = list(pattern_files)
+    tables = {}
+    if method in PATTERN_SOLVERS:
+        known = set()
+        for path in pattern_files:
+            known.update(load_pattern_file(path).cache_entries())
+        tables = pattern_tables(orders, stocks, skip=known)
+
+    if workers == 1:
+        maxsize = pattern_cache.maxsize
+        try:
+            _init_batch_worker(stocks, tables, pattern_files)
+            for index, order in enumerate(orders):
+                yield index, _solve_order(method, order, options)
+        finally:
+            # In-process, the shared cache goes back to its own size (trimming the oldest entries)
+            pattern_cache.maxsize = maxsize
+            pattern_cache.update({})
+        return
+
+    max_pending = max_pending or 4 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                             initargs=(stocks, tables, pattern_files)) as executor:
+        pending = {}
+        queue = iter(enumerate(orders))
+        for index, order in queue:
+            pending[executor.submit(_solve_order, method, order, options)] = index
+            if len(pending) >= max_pending:
+                break
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                for next_index, order in queue:
+                    pending[executor.submit(_solve_order, method, order, options)] = next_index
+                    break
+                yield index, future.result()
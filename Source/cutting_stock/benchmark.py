@@ -0,0 +1,291 @@
+"""
+Benchmark suite over generated instance families.
+
+Every solver is run with warmup and repetitions timed by `time.perf_counter`,
+results are written as JSON or CSV, and a stored baseline flags slowdowns
+and cost regressions. With --memory, every record also gets the per-phase
+memory report of `profiling.profile_memory`:
+
+    python -m cutting_stock.benchmark --json results.json --baseline baseline.json
+    python -m cutting_stock.benchmark --save-baseline baseline.json
+
+The command exits with status 1 when a regression is found.
+"""
+
+import argparse
+import csv
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+from .api import PATTERN_SOLVERS, SOLVERS, solve
+from .patterns import order_lengths, pattern_cache, pattern_vectors
+from .profiling import profile_memory
+
+# Solver options used by the benchmark, so runs are reproducible and bounded
+DEFAULT_OPTIONS = {
+    "sa": {"seed": 0},
+    "parallel_sa": {"master_seed": 0},
+    "genetic": {"seed": 0},
+    "branch_and_bound": {"time_limit": 2.0},
+}
+
+# Pattern solvers are skipped on instances with more patterns than this per stock type
+PATTERN_LIMIT = 20000
+
+
+def catalog(lengths):
+    """Stock catalog in the style of the bundled data: each bar costs its length plus 10."""
+    return {f"Type {i + 1}": {"length": length, "cost": length + 10} for i, length in enumerate(lengths)}
+
+
+def merge_pieces(lengths):
+    """Build an order from a list of piece lengths, merging equal lengths into one item."""
+    order = {}
+    for length in sorted(lengths, reverse=True):
+        name = f"L{length}"
+        if name not in order:
+            order[name] = {"length": length, "demand": 0}
+        order[name]["demand"] += 1
+    return order
+
+
+def uniform_instance(n_pieces, seed=0, stock_lengths=(150,), low=20, high=100):
+    """Falkenauer-style uniform instance: `n_pieces` piece lengths drawn from [low, high]."""
+    rng = random.Random(seed)
+    return catalog(stock_lengths), merge_pieces([rng.randint(low, high) for _ in range(n_pieces)])
+
+
+def triplet_instance(n_triplets, seed=0, stock_length=1000):
+    """
+    Falkenauer-style triplet instance: every bar of the optimum holds exactly
+    three pieces between a quarter and a half of the bar, summing to its length.
+    """
+    rng = random.Random(seed)
+    quarter, half = stock_length // 4, stock_length // 2
+    pieces = []
+    for _ in range(n_triplets):
+        first = rng.randint(quarter, half)
+        second = rng.randint(max(quarter, stock_length - first - half), min(half, stock_length - first - quarter))
+        pieces += [first, second, stock_length - first - second]
+    return catalog([stock_length]), merge_pieces(pieces)
+
+
+def random_instance(n_items, stock_lengths=(80, 100, 120), demand=(1, 20), seed=0):
+    """Order of `n_items` sizes between 10% and 50% of the shortest bar."""
+    rng = random.Random(seed)
+    shortest = min(stock_lengths)
+    order = {}
+    for i in range(n_items):
+        order[f"I{i + 1}"] = {"length": rng.randint(shortest // 10, shortest // 2), "demand": rng.randint(*demand)}
+    return catalog(stock_lengths), order
+
+
+def bundled_instance(scale=1):
+    """The order of the solver scripts with every demand multiplied by `scale`."""
+    order = {
+        "S": {"length": 15, "demand": 20 * scale},
+        "M": {"length": 30, "demand": 10 * scale},
+        "L": {"length": 34, "demand": 15 * scale},
+        "XL": {"length": 47, "demand": 5 * scale},
+    }
+    return catalog([80, 100, 120]), order
+
+
+# Family name -> list of (instance name, zero-argument builder)
+FAMILIES = {
+    "uniform": [(f"u{n}", lambda n=n: uniform_instance(n, seed=n)) for n in (20, 60, 120)],
+    "triplet": [(f"t{3 * n}", lambda n=n: triplet_instance(n, seed=n)) for n in (20, 40)],
+    "items": [(f"n{n}", lambda n=n: random_instance(n, seed=n)) for n in (4, 8, 16, 32)],
+    "demand": [(f"x{scale}", lambda scale=scale: bundled_instance(scale)) for scale in (1, 10, 100, 1000)],
+    "mixed": [(f"m{n}", lambda n=n: random_instance(n, stock_lengths=(60, 80, 100, 150, 200), seed=n)) for n in (6, 10)],
+}
+
+
+def too_many_patterns(stocks, order, limit=PATTERN_LIMIT):
+    """Whether some stock type has more than `limit` maximal patterns for the order."""
+    lengths = order_lengths(order)
+    return any(pattern_vectors(stock_info["length"], lengths, limit=limit) is None for stock_info in stocks.values())
+
+
+def time_solver(stocks, order, method, warmup=1, repeat=3, options=None):
+    """
+    Time one solver on one instance.
+
+    The shared pattern cache is cleared before every run, so pattern
+    generation is part of every measurement.
+
+    Returns:
+        The list of run times in seconds and the `CuttingPlan` of the last run.
+    """
+    options = options or {}
+    times = []
+    for run in range(warmup + repeat):
+        pattern_cache.clear()
+        start_time = time.perf_counter()
+        plan = solve(stocks, order, method, **options)
+        elapsed = time.perf_counter() - start_time
+        if run >= warmup:
+            times.append(elapsed)
+    return times, plan
+
+
+def run_benchmark(families=None, methods=None, warmup=1, repeat=3, options=None, log=None, memory=False):
+    """
+    Run every method on every instance of the selected families.
+
+    Args:
+        families: Family names, defaulting to all of `FAMILIES`.
+        methods: Solver names, defaulting to every solver but `parallel_sa`.
+        warmup: Untimed runs before the measurements.
+        repeat: Timed runs per (instance, method).
+        options: {method: solver options} overriding `DEFAULT_OPTIONS`.
+        log: Optional callable receiving every record as it is produced.
+        memory: Also run every (instance, method) once under
+            `profile_memory` and store its per-phase report in the record;
+            this run is not timed.
+
+    Returns:
+        A list of records (dicts), one per (instance, method).
+    """
+    families = families or list(FAMILIES)
+    methods = methods or [m for m in SOLVERS if m != "parallel_sa"]
+    options = {**DEFAULT_OPTIONS, **(options or {})}
+
+    results = []
+    for family in families:
+        for name, build in FAMILIES[family]:
+            stocks, order = build()
+            record_base = {
+                "family": family,
+                "instance": name,
+                "items": len(order),
+                "pieces": sum(order[f]["demand"] for f in order),
+                "stocks": len(stocks),
+            }
+            skip_patterns = too_many_patterns(stocks, order)
+            for method in methods:
+                record = {**record_base, "method": method}
+                if method in PATTERN_SOLVERS and skip_patterns:
+                    record["status"] = "skipped"
+                else:
+                    times, plan = time_solver(stocks, order, method, warmup, repeat, options.get(method))
+                    record.update({
+                        "status": "ok" if plan.demand_met else "infeasible",
+                        "cost": plan.total_cost,
+                        "lower_bound": plan.stats.get("lower_bound"),
+                        "best": min(times),
+                        "median": statistics.median(times),
+                        "mean": statistics.fmean(times),
+                        "repeat": len(times),
+                    })
+                    if memory:
+                        _, report = profile_memory(stocks, order, method, top=0, **options.get(method, {}))
+                        record["memory_peak"] = report["peak"]
+                        record["memory"] = report["phases"]
+                results.append(record)
+                if log is not None:
+                    log(record)
+    return results
+
+
+def environment():
+    """Machine description stored with the results."""
+    return {"python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine()}
+
+
+def write_json(results, path):
+    with open(path, "w") as f:
+        json.dump({"environment": environment(), "results": results}, f, indent=2)
+
+
+def write_csv(results, path):
+    fields = ["family", "instance", "items", "pieces", "stocks", "method", "status",
+              "cost", "lower_bound", "best", "median", "mean", "repeat", "memory_peak"]
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def load_baseline(path):
+    """Read results written by `write_json`."""
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def find_regressions(results, baseline, tolerance=0.25, min_slowdown=0.002):
+    """
+    Compare results with a baseline run.
+
+    A record regresses when its median time grows by more than `tolerance`
+    (relative) and `min_slowdown` seconds (absolute, to ignore timer noise on
+    very fast solvers), or when its cost grows or its plan stops meeting demand.
+
+    Returns:
+        A list of {"family", "instance", "method", "kind", "baseline", "current"} dicts.
+    """
+    reference = {(r["family"], r["instance"], r["method"]): r for r in baseline}
+    regressions = []
+    for record in results:
+        key = (record["family"], record["instance"], record["method"])
+        base = reference.get(key)
+        if base is None or base["status"] == "skipped" or record["status"] == "skipped":
+            continue
+        checks = [("status", base["status"], record["status"], base["status"] == "ok" and record["status"] != "ok"),
+                  ("cost", base["cost"], record["cost"], record["cost"] > base["cost"]),
+                  ("time", base["median"], record["median"],
+                   record["median"] > base["median"] * (1 + tolerance) and record["median"] - base["median"] > min_slowdown)]
+        for kind, before, after, regressed in checks:
+            if regressed:
+                regressions.append({"family": key[0], "instance": key[1], "method": key[2],
+                                    "kind": kind, "baseline": before, "current": after})
+    return regressions
+
+
+def print_record(record):
+    if record["status"] == "skipped":
+        print(f"{record['family']:<8} {record['instance']:<6} {record['method']:<18} {'skipped (too many patterns)':>32}")
+        return
+    print(f"{record['family']:<8} {record['instance']:<6} {record['method']:<18} "
+          f"{record['cost']:>10} {record['median'] * 1000:>12.3f} {record['best'] * 1000:>10.3f}  {record['status']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cutting stock solvers.")
+    parser.add_argument("--families", nargs="+", choices=list(FAMILIES), help="instance families (default: all)")
+    parser.add_argument("--methods", nargs="+", choices=list(SOLVERS), help="solvers (default: all but parallel_sa)")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--csv", help="write the results to this CSV file")
+    parser.add_argument("--baseline", help="compare with the results stored in this JSON file")
+    parser.add_argument("--save-baseline", help="store the results as a new baseline JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown (default: 0.25)")
+    parser.add_argument("--memory", action="store_true", help="add a tracemalloc profile of every run to the results")
+    args = parser.parse_args(argv)
+
+    print(f"{'Family':<8} {'Case':<6} {'Method':<18} {'Cost':>10} {'Median (ms)':>12} {'Best (ms)':>10}  Status")
+    results = run_benchmark(args.families, args.methods, args.warmup, args.repeat, log=print_record, memory=args.memory)
+
+    for path in (args.json, args.save_baseline):
+        if path:
+            write_json(results, path)
+    if args.csv:
+        write_csv(results, args.csv)
+
+    if args.baseline:
+        regressions = find_regressions(results, load_baseline(args.baseline), args.tolerance)
+        for r in regressions:
+            print(f"REGRESSION {r['family']}/{r['instance']} {r['method']}: {r['kind']} {r['baseline']} -> {r['current']}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Branch-and-bound for the multi-stock cutting stock problem.
+"""
+
+import heapq
+import itertools
+import math
+import time
+
+import numpy as np
+from scipy.optimize import linprog
+
+from .patterns import PatternMatrix, empty_stock_usage, evaluate_stock_usage, order_lengths, pattern_vectors
+from .column_generation import column_generation, columns_to_stock_usage, drop_redundant_bars, farley_bound, round_plan
+from .greedy import greedy_cutting
+from .ffd import ffd_cutting
+from .profiling import count, timer
+
+
+def volume_lower_bound(order, stocks):
+    """Volume lower bound: the total length to cut times the cheapest cost per unit length."""
+    total_length = sum(order[f]["length"] * order[f]["demand"] for f in order)
+    return total_length * min(stock_info["cost"] / stock_info["length"] for stock_info in stocks.values())
+
+
+def branch_and_bound(order, stocks, node_limit=10000, time_limit=10.0, patterns="auto", pattern_limit=5000,
+                     deadline=None, callback=None):
+    """
+    Branch-and-bound on the number of bars of each pattern, with LP relaxation bounds.
+
+    The root bound is the column generation LP value (valid for every
+    pattern), combined with the volume bound. The first incumbent is the best
+    of rounded column generation, FFD and greedy (when the patterns are few
+    enough to enumerate). Nodes are explored best bound first, branching on
+    the variable whose fractional part is closest to 0.5, and pruned when
+    their bound reaches the incumbent.
+
+    Args:
+        order: A dictionary containing order types, their lengths, and demands.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        node_limit: Maximum number of LP nodes.
+        time_limit: Maximum running time in seconds.
+        patterns: "all" to branch on every maximal pattern (exact),
+            "generated" to use only the column generation columns
+            (price-and-branch), or "auto" to pick "all" when every stock type
+            has at most `pattern_limit` patterns.
+        pattern_limit: Pattern count threshold of the "auto" mode.
+        deadline: Wall-clock budget in seconds, root column generation
+            included; the effective limit is min(time_limit, deadline).
+        callback: Called as callback(stock_usage, total_cost) whenever the
+            incumbent improves.
+
+    Returns:
+        The stock usage, its total cost and a dictionary of statistics: lower
+        bound (lower_bound), optimality gap (gap), node count (nodes), status
+        ("optimal", "exhausted" or "limit"), pattern mode, the dominated
+        pattern report (pruning, see `PatternMatrix.prune`; None in the
+        "generated" mode) and the elapsed time.
+    """
+    start_time = time.perf_counter()
+    if deadline is not None:
+        time_limit = min(time_limit, deadline)
+    demand = np.array([order[f]["demand"] for f in order], dtype=np.int64)
+    if not demand.any():
+        # Nothing to cut: the empty plan is optimal (and an empty order has no LP to solve)
+        stats = {"lower_bound": 0, "gap": 0.0, "nodes": 0, "status": "optimal", "patterns": patterns,
+                 "pruning": None, "incumbent": None, "elapsed": time.perf_counter() - start_time}
+        return empty_stock_usage(stocks), 0, stats
+    eps = 1e-6
+    # With integer costs, every plan costs a multiple of their greatest common divisor
+    step = None
+    if all(float(stock_info["cost"]).is_integer() for stock_info in stocks.values()):
+        step = math.gcd(*(int(stock_info["cost"]) for stock_info in stocks.values()))
+
+    def bound_of(value):
+        # Round the lower bound up to the next multiple of step
+        return math.ceil((value - eps) / step) * step if step else value
+
+    # Root lower bound
+    with timer("bnb.root"):
+        gen_columns, x, lp_value, duals = column_generation(order, stocks, end=time.monotonic() + time_limit)
+        # Equal to lp_value if column generation converged, still valid if it stopped early
+        lp_bound = farley_bound(order, stocks, lp_value, duals)
+    root_bound = max(bound_of(lp_bound), bound_of(volume_lower_bound(order, stocks)))
+
+    if patterns == "auto":
+        lengths = order_lengths(order)
+        fits = all(pattern_vectors(stock_info["length"], lengths, limit=pattern_limit) is not None
+                   for stock_info in stocks.values())
+        patterns = "all" if fits else "generated"
+
+    # First incumbent from the heuristics; greedy enumerates every pattern, so only with few patterns
+    with timer("bnb.seeds"):
+        seeds = {
+            "column generation": columns_to_stock_usage(order, stocks, gen_columns, round_plan(order, stocks, gen_columns, x))[0],
+            "ffd": ffd_cutting(order, stocks)[0],
+        }
+        if patterns == "all":
+            seeds["greedy"] = greedy_cutting(order, stocks)[0]
+    incumbent, incumbent_cost, seed = None, math.inf, None
+    for name, stock_usage in seeds.items():
+        cost, cut = evaluate_stock_usage(stock_usage, stocks, order)
+        if (cut >= demand).all() and cost < incumbent_cost:
+            incumbent, incumbent_cost, seed = stock_usage, cost, name
+    if callback is not None and incumbent is not None:
+        callback(incumbent, incumbent_cost)
+
+    pruning = None
+    if patterns == "all":
+        # Drop dominated and duplicate patterns: same optimum, smaller tree
+        matrix, pruning = PatternMatrix(stocks, order).prune()
+        columns = [(matrix.stock_ids[matrix.stock_index[r]], tuple(matrix.counts[r].tolist())) for r in range(len(matrix))]
+    else:
+        columns = gen_columns
+
+    A = np.array([counts for _, counts in columns], dtype=np.int64)
+    costs = np.array([stocks[stock_id]["cost"] for stock_id, _ in columns], dtype=float)
+    nodes = 0
+    heap = []
+    tie = itertools.count()
+
+    def solve_node(branches, depth):
+        """Solve the LP of a node, update the incumbent and queue the node unless it is pruned."""
+        nonlocal nodes, incumbent, incumbent_cost, seed
+        nodes += 1
+        lower = np.zeros(len(columns))
+        upper = np.full(len(columns), np.inf)
+        for j, lo, hi in branches:
+            lower[j] = max(lower[j], lo)
+            upper[j] = min(upper[j], hi)
+        with timer("bnb.lp"):
+            result = linprog(costs, A_ub=-A.T, b_ub=-demand, bounds=np.column_stack([lower, upper]), method="highs")
+        if result.status != 0:
+            count("bnb.infeasible")
+            return
+        bound = bound_of(result.fun)
+        if bound >= incumbent_cost - eps:
+            count("bnb.pruned")
+            return
+
+        # Rounding up is always feasible, so try it as an incumbent
+        bars = drop_redundant_bars(columns, stocks, np.ceil(result.x - eps).astype(np.int64), demand, A)
+        if bars @ costs < incumbent_cost - eps:
+            incumbent, incumbent_cost = columns_to_stock_usage(order, stocks, columns, bars)
+            seed = "branch and bound"
+            count("bnb.incumbents")
+            if callback is not None:
+                callback(incumbent, incumbent_cost)
+        if bound >= incumbent_cost - eps:
+            count("bnb.pruned")
+            return
+        heapq.heappush(heap, (bound, -depth, next(tie), branches, result.x))
+
+    status = "optimal"
+    if incumbent_cost > root_bound + eps:
+        solve_node((), 0)
+        status = "exhausted"
+        while heap:
+            if nodes >= node_limit or time.perf_counter() - start_time >= time_limit:
+                status = "limit"
+                break
+            bound, depth, _, branches, x = heapq.heappop(heap)
+            if bound >= incumbent_cost - eps:
+                count("bnb.pruned")
+                continue
+            # Branch on the variable whose fractional part is closest to 0.5
+            fraction = x - np.floor(x)
+            j = int(np.argmin(np.abs(fraction - 0.5)))
+            solve_node(branches + ((j, 0, math.floor(x[j])),), -depth + 1)
+            solve_node(branches + ((j, math.ceil(x[j]), np.inf),), -depth + 1)
+
+    # Global lower bound: with every pattern, the open nodes give a tighter one
+    lower_bound = root_bound
+    if patterns == "all":
+        lower_bound = max(lower_bound, min([node[0] for node in heap] + [incumbent_cost]))
+    lower_bound = min(lower_bound, incumbent_cost)
+    gap = (incumbent_cost - lower_bound) / incumbent_cost if incumbent_cost > 0 else 0.0
+    if gap <= eps:
+        status = "optimal"
+
+    count("bnb.nodes", nodes)
+    stats = {
+        "lower_bound": lower_bound,
+        "gap": gap,
+        "nodes": nodes,
+        "status": status,
+        "patterns": patterns,
+        "pruning": pruning,
+        "incumbent": seed,
+        "elapsed": time.perf_counter() - start_time,
+    }
+    return incumbent, incumbent_cost, stats
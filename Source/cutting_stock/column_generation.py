@@ -0,0 +1,264 @@
+"""
+Gilmore-Gomory column generation for the multi-stock cutting stock problem.
+"""
+
+import time
+
+import numpy as np
+from scipy.optimize import linprog
+
+from .patterns import empty_stock_usage
+from .profiling import count, timer
+
+
+def knapsack_pattern(capacity, lengths, values, bounds):
+    """
+    Solve the bounded knapsack pricing problem for one stock length.
+
+    Each item count is split into binary chunks (1, 2, 4, ...) and the
+    resulting 0/1 knapsack is solved by dynamic programming over the used
+    length, one vectorized pass per chunk. Lengths must be integers.
+
+    Args:
+        capacity: Stock length.
+        lengths: Item lengths.
+        values: Value of one piece of every item (the LP duals).
+        bounds: Maximum number of pieces of every item.
+
+    Returns:
+        The best total value and the pattern as a list of counts.
+    """
+    chunks = []
+    for i, (length, value, bound) in enumerate(zip(lengths, values, bounds)):
+        bound = min(int(bound), capacity // length)
+        if value <= 0 or bound <= 0:
+            continue
+        size = 1
+        while bound > 0:
+            take = min(size, bound)
+            chunks.append((i, take))
+            bound -= take
+            size *= 2
+
+    best = np.zeros(capacity + 1)
+    taken = np.zeros((len(chunks), capacity + 1), dtype=bool)
+    for k, (i, take) in enumerate(chunks):
+        weight = lengths[i] * take
+        candidate = best[:-weight] + values[i] * take
+        better = candidate > best[weight:]
+        taken[k, weight:] = better
+        best[weight:] = np.where(better, candidate, best[weight:])
+
+    # Walk the chunks backwards from the best used length to rebuild the pattern
+    pattern = [0] * len(lengths)
+    used = int(np.argmax(best))
+    for k in range(len(chunks) - 1, -1, -1):
+        if taken[k, used]:
+            i, take = chunks[k]
+            pattern[i] += take
+            used -= lengths[i] * take
+    return float(best.max()), pattern
+
+
+def solve_master_lp(columns, costs, demand):
+    """
+    Solve the restricted master LP: min c x subject to A x >= demand, x >= 0.
+
+    Returns:
+        The column values, the objective value and the dual price of every item.
+    """
+    A = np.array(columns, dtype=float).T
+    result = linprog(costs, A_ub=-A, b_ub=-np.asarray(demand, dtype=float), bounds=(0, None), method="highs")
+    if result.status != 0:
+        raise RuntimeError(f"master LP failed: {result.message}")
+    return result.x, result.fun, -result.ineqlin.marginals
+
+
+def column_generation(order, stocks, demand=None, columns=None, max_iterations=500, tolerance=1e-9, end=None):
+    """
+    Solve the LP relaxation of the multi-stock cutting stock problem by
+    Gilmore-Gomory column generation.
+
+    Starting from one homogeneous pattern per stock type and item, the
+    restricted master LP is solved and every stock type prices a new pattern
+    with a knapsack on the dual prices, until no pattern has negative reduced cost.
+
+    Args:
+        order: A dictionary containing order types, their lengths, and demands.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        demand: Demand vector to cover, defaulting to the order demands.
+        columns: Existing list of (stock_id, counts) columns to start from; new
+            columns are appended to it.
+        max_iterations: Maximum number of master LP solves.
+        tolerance: Reduced cost below which a pattern enters the master.
+        end: `time.monotonic()` value after which no new pricing round starts.
+
+    Returns:
+        The columns, the LP solution (one value per column), the LP objective
+        value and the item dual prices.
+    """
+    lengths = [order[f]["length"] for f in order]
+    if demand is None:
+        demand = [order[f]["demand"] for f in order]
+    demand = [int(d) for d in demand]
+
+    longest_stock = max(stock_info["length"] for stock_info in stocks.values())
+    for f in order:
+        if order[f]["length"] > longest_stock:
+            raise ValueError(f"item {f} is longer than every stock type")
+
+    if columns is None:
+        columns = []
+    known = set(columns)
+    for stock_id, stock_info in stocks.items():
+        for i, length in enumerate(lengths):
+            pieces = min(stock_info["length"] // length, max(demand[i], 1))
+            if pieces > 0:
+                counts = [0] * len(lengths)
+                counts[i] = pieces
+                column = (stock_id, tuple(counts))
+                if column not in known:
+                    known.add(column)
+                    columns.append(column)
+
+    for iteration in range(max_iterations):
+        count("cg.iterations")
+        costs = [stocks[stock_id]["cost"] for stock_id, _ in columns]
+        with timer("cg.master"):
+            x, value, duals = solve_master_lp([counts for _, counts in columns], costs, demand)
+        # Stop right after a master solve, so the solution covers every column
+        if iteration == max_iterations - 1 or (end is not None and time.monotonic() >= end):
+            break
+
+        added = False
+        with timer("cg.pricing"):
+            for stock_id, stock_info in stocks.items():
+                best_value, pattern = knapsack_pattern(stock_info["length"], lengths, duals, demand)
+                column = (stock_id, tuple(pattern))
+                if stock_info["cost"] - best_value < -tolerance * max(1.0, stock_info["cost"]) and column not in known:
+                    known.add(column)
+                    columns.append(column)
+                    count("cg.columns")
+                    added = True
+        if not added:
+            break
+
+    return columns, x, value, duals
+
+
+def farley_bound(order, stocks, value, duals, demand=None):
+    """
+    Lower bound on the LP optimum from a restricted master that may not have converged.
+
+    Scaling the duals by the largest ratio of a stock type's best pattern
+    value to its cost makes them dual feasible for every pattern, so the
+    master value divided by that ratio bounds the LP from below (Farley's
+    bound). Once no pattern has negative reduced cost it equals `value`.
+    """
+    lengths = [order[f]["length"] for f in order]
+    if demand is None:
+        demand = [order[f]["demand"] for f in order]
+    ratio = max(knapsack_pattern(stock_info["length"], lengths, duals, demand)[0] / stock_info["cost"]
+                for stock_info in stocks.values())
+    return value / max(ratio, 1.0)
+
+
+def round_plan(order, stocks, columns, x, demand=None):
+    """
+    Turn an LP solution into an integer number of bars per column.
+
+    The LP values are rounded down, and the leftover demand is cut bar by bar:
+    every stock type packs the leftover pieces as full as it can (a knapsack
+    on piece lengths) and the bar with the lowest cost per used length is taken.
+
+    Returns:
+        The integer bar count of every column (new patterns are appended to `columns`).
+    """
+    lengths = [order[f]["length"] for f in order]
+    if demand is None:
+        demand = [order[f]["demand"] for f in order]
+    demand = np.asarray(demand, dtype=np.int64)
+
+    bars = list(np.floor(np.asarray(x) + 1e-9).astype(np.int64))
+    index = {column: j for j, column in enumerate(columns)}
+    A = np.array([counts for _, counts in columns], dtype=np.int64)
+    residual = np.maximum(demand - np.asarray(bars) @ A, 0)
+
+    while residual.any():
+        best = None
+        for stock_id, stock_info in stocks.items():
+            used, pattern = knapsack_pattern(stock_info["length"], lengths, lengths, residual)
+            if used > 0 and (best is None or stock_info["cost"] / used < best[0]):
+                best = (stock_info["cost"] / used, (stock_id, tuple(pattern)))
+        column = best[1]
+        if column not in index:
+            index[column] = len(columns)
+            columns.append(column)
+            bars.append(0)
+        bars[index[column]] += 1
+        residual = np.maximum(residual - np.array(column[1]), 0)
+
+    A = np.array([counts for _, counts in columns], dtype=np.int64)
+    return drop_redundant_bars(columns, stocks, np.array(bars, dtype=np.int64), demand, A)
+
+
+def drop_redundant_bars(columns, stocks, bars, demand, A):
+    """
+    Remove bars, most expensive first, whose pieces are not needed to meet the demand.
+
+    A bar is redundant when every item it cuts is overproduced by at least
+    what it cuts; items it does not cut may still be short. All redundant bars
+    of a column are removed in one step.
+    """
+    surplus = bars @ A - demand
+    for j in sorted(np.flatnonzero(bars), key=lambda j: -stocks[columns[j][0]]["cost"]):
+        cut = A[j] > 0
+        drop = bars[j] if not cut.any() else min(bars[j], (surplus[cut] // A[j][cut]).min())
+        if drop > 0:
+            bars[j] -= drop
+            surplus -= drop * A[j]
+    return bars
+
+
+def columns_to_stock_usage(order, stocks, columns, bars):
+    """Convert bar counts per column into the stock usage dictionary and its total cost."""
+    labels = list(order.keys())
+    stock_usage = {stock_id: {} for stock_id in stocks}
+    total_cost = 0
+    for j in np.flatnonzero(bars):
+        stock_id, counts = columns[j]
+        pattern_tuple = tuple(sorted(zip(labels, counts)))
+        stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + int(bars[j])
+        total_cost += stocks[stock_id]["cost"] * int(bars[j])
+    return stock_usage, total_cost
+
+
+def column_generation_cutting(order, stocks, max_iterations=500, deadline=None, callback=None):
+    """
+    Solve the cutting stock problem by column generation and rounding.
+
+    Args:
+        order: A dictionary containing order types, their lengths, and demands.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        max_iterations: Maximum number of master LP solves for the root LP.
+        deadline: Wall-clock budget in seconds for the pricing rounds; the
+            restricted master at that point is rounded.
+        callback: Called as callback(stock_usage, total_cost) with the plan.
+
+    Returns:
+        The stock usage ({stock_id: {pattern_tuple: count}}), its total cost
+        and the LP lower bound on the optimal cost (`farley_bound`, which is
+        the LP value unless pricing was cut short).
+    """
+    if not any(order[f]["demand"] for f in order):
+        # Nothing to cut (an empty order has no LP to solve)
+        return empty_stock_usage(stocks), 0, 0.0
+    end = None if deadline is None else time.monotonic() + deadline
+    columns, x, value, duals = column_generation(order, stocks, max_iterations=max_iterations, end=end)
+    lower_bound = farley_bound(order, stocks, value, duals)
+    with timer("cg.rounding"):
+        bars = round_plan(order, stocks, columns, x)
+    stock_usage, total_cost = columns_to_stock_usage(order, stocks, columns, bars)
+    if callback is not None:
+        callback(stock_usage, total_cost)
+    return stock_usage, total_cost, lower_bound
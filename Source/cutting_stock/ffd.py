@@ -0,0 +1,252 @@
+"""
+First-Fit Decreasing heuristics.
+
+`ffd_heuristic` is the original bar-by-bar heuristic; `ffd_cutting` is the
+bulk engine for orders with very large demands. Both have a generator
+version (`iter_ffd_heuristic`, `iter_ffd_cutting`) that yields the plan as
+it is cut.
+"""
+
+import bisect
+
+from .profiling import count
+
+
+def ffd_heuristic(stocks, order):
+    """
+    Applies the First-Fit Decreasing heuristic to the cutting stock problem.
+
+    Args:
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: A dictionary containing order types, their lengths, and demands.
+
+    Returns:
+        A list of cutting patterns, where each pattern is a dictionary
+        indicating how many of each order type are cut from a stock type.
+    """
+    return list(iter_ffd_heuristic(stocks, order))
+
+
+def iter_ffd_heuristic(stocks, order):
+    """
+    Generator version of `ffd_heuristic`: yields the {"stock_type", "cuts"}
+    dict of every bar as soon as it is cut, so the plan is never held in memory.
+    """
+
+    # Sort order items by decreasing length
+    order_items = sorted(order.items(), key=lambda x: x[1]["length"], reverse=True)
+
+    # Initialize residual demands
+    residual_demands = {item: details["demand"] for item, details in order.items()}
+
+    while any(residual_demands.values()):  # Continue until all demands are met
+        for stock_type, stock_details in stocks.items():
+            stock_length = stock_details["length"]
+            remaining_length = stock_length
+            pattern = {item: 0 for item in order}  # Initialize an empty pattern
+
+            for item, _ in order_items:
+                item_length = order[item]["length"]
+                while remaining_length >= item_length and residual_demands[item] > 0:
+                    pattern[item] += 1
+                    remaining_length -= item_length
+                    residual_demands[item] -= 1
+
+            if any(pattern.values()):  # Add pattern only if it's not empty
+                yield {"stock_type": stock_type, "cuts": pattern}
+
+
+def ffd_stock_usage(patterns):
+    """Aggregate the per-bar FFD output ({"stock_type", "cuts"}) into a stock usage dictionary."""
+    stock_usage = {}
+    for pattern in patterns:
+        pattern_tuple = tuple(sorted(pattern["cuts"].items()))
+        usage = stock_usage.setdefault(pattern["stock_type"], {})
+        usage[pattern_tuple] = usage.get(pattern_tuple, 0) + 1
+    return stock_usage
+
+
+class OpenBars:
+    """
+    Open bars of a decreasing-order packing, grouped by identical content.
+
+    Bars with the same stock type and cut counts are one group with a bar
+    count, so a large order only ever has as many groups as distinct partial
+    patterns. Groups are indexed by their free length in a sorted list, which
+    makes the best-fit lookup a bisection.
+    """
+
+    def __init__(self):
+        self.groups = {}    # (stock_id, counts) -> number of bars
+        self.by_free = {}   # free length -> {(stock_id, counts): None}, insertion ordered
+        self.frees = []     # sorted distinct free lengths
+
+    def add(self, stock_id, counts, free, n):
+        """Add `n` bars of one content."""
+        if n <= 0:
+            return
+        key = (stock_id, counts)
+        if key not in self.groups:
+            self.groups[key] = 0
+            if free not in self.by_free:
+                self.by_free[free] = {}
+                bisect.insort(self.frees, free)
+            self.by_free[free][key] = None
+        self.groups[key] += n
+
+    def remove(self, key, free, n):
+        """Remove `n` bars of one group, dropping the group when it empties."""
+        self.groups[key] -= n
+        if self.groups[key] == 0:
+            del self.groups[key]
+            del self.by_free[free][key]
+            if not self.by_free[free]:
+                del self.by_free[free]
+                del self.frees[bisect.bisect_left(self.frees, free)]
+
+    def pop_closed(self, min_free):
+        """Remove and yield ((stock_id, counts), n) for every group with less than `min_free` free length."""
+        while self.frees and self.frees[0] < min_free:
+            free = self.frees[0]
+            for key in list(self.by_free[free]):
+                n = self.groups[key]
+                self.remove(key, free, n)
+                yield key, n
+
+    def best_fit(self, length):
+        """Return (free, key) of a group with the smallest free length >= `length`, or None."""
+        position = bisect.bisect_left(self.frees, length)
+        if position == len(self.frees):
+            return None
+        free = self.frees[position]
+        return free, next(iter(self.by_free[free]))
+
+
+def _new_stock(stocks, length, pieces, rest_volume):
+    """
+    Choose the stock type for new bars of one item.
+
+    When a single bar can hold the `pieces` left of the item plus every piece of
+    the smaller items still to place, the cheapest such bar is taken. Otherwise
+    bars are cut from the stock type with the lowest cost per unit length.
+    """
+    candidates = [(stock_id, info) for stock_id, info in stocks.items() if info["length"] >= length]
+    needed = pieces * length + rest_volume
+    closing = [(info["cost"], info["length"], stock_id) for stock_id, info in candidates if info["length"] >= needed]
+    if closing:
+        return min(closing)[2]
+    return min(candidates, key=lambda x: (x[1]["cost"] / x[1]["length"], x[1]["length"] % length))[0]
+
+
+def ffd_cutting(order, stocks):
+    """
+    Decreasing-order packing with best-fit placement and bulk placement.
+
+    Items are placed longest first. Each item first goes into the open bars
+    with the least free space that still fits it, then into new bars from a
+    cost-effective stock type (see `_new_stock`). Pieces are placed in bulk,
+    `min(demand, free // length)` per bar and whole groups of identical bars
+    at a time, so the running time depends on the number of distinct patterns
+    rather than on the number of pieces.
+
+    Args:
+        order: A dictionary containing order types, their lengths, and demands.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+
+    Returns:
+        The stock usage ({stock_id: {pattern_tuple: count}}), its total cost
+        and the number of pieces cut of every item.
+    """
+    items = list(order.keys())
+    stock_usage = {stock_id: {} for stock_id in stocks}
+    total_cost = 0
+    cut_counts = {f: 0 for f in items}
+    for stock_id, counts, n in iter_ffd_cutting(order, stocks):
+        pattern_tuple = tuple(sorted(zip(items, counts)))
+        stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + n
+        total_cost += stocks[stock_id]["cost"] * n
+        for f, pieces in zip(items, counts):
+            cut_counts[f] += pieces * n
+    return stock_usage, total_cost, cut_counts
+
+
+def iter_ffd_cutting(order, stocks):
+    """
+    Generator core of `ffd_cutting`.
+
+    Yields (stock_id, counts, n) for `n` bars cut with the count vector
+    `counts` (in the order of `order`). A group of bars is yielded as soon as
+    its free length is shorter than every item, so only the open bars are
+    held in memory. The same pattern may be yielded more than once.
+    """
+    items = list(order.keys())
+    longest_stock = max(stock_info["length"] for stock_info in stocks.values())
+    for f in items:
+        if order[f]["length"] > longest_stock:
+            raise ValueError(f"item {f} is longer than every stock type")
+    if not items:
+        return
+
+    index = {f: i for i, f in enumerate(items)}
+    by_length = sorted(items, key=lambda f: order[f]["length"], reverse=True)
+    min_length = order[by_length[-1]]["length"]
+    rest_volume = sum(order[f]["length"] * order[f]["demand"] for f in items)
+    bars = OpenBars()
+    groups = 0
+
+    for f in by_length:
+        i = index[f]
+        length = order[f]["length"]
+        left = order[f]["demand"]
+        rest_volume -= length * left
+
+        # Best fit into the open bars: the bar with the least free space keeps
+        # being the best fit until it cannot take another piece
+        while left > 0:
+            found = bars.best_fit(length)
+            if found is None:
+                break
+            free, key = found
+            count("ffd.best_fit")
+            stock_id, counts = key
+            per_bar = free // length
+            n = bars.groups[key]
+            full = min(n, left // per_bar)
+            if full:
+                bars.remove(key, free, full)
+                bars.add(stock_id, _bump(counts, i, per_bar), free - per_bar * length, full)
+                left -= full * per_bar
+            if left and full < n:
+                bars.remove(key, free, 1)
+                bars.add(stock_id, _bump(counts, i, left), free - left * length, 1)
+                left = 0
+
+        # New bars for what is left
+        while left > 0:
+            count("ffd.new_bars")
+            stock_id = _new_stock(stocks, length, left, rest_volume)
+            stock_length = stocks[stock_id]["length"]
+            per_bar = stock_length // length
+            zero = (0,) * len(items)
+            full = left // per_bar
+            if full:
+                bars.add(stock_id, _bump(zero, i, per_bar), stock_length - per_bar * length, full)
+                left -= full * per_bar
+            elif left:
+                bars.add(stock_id, _bump(zero, i, left), stock_length - left * length, 1)
+                left = 0
+
+        # Bars that cannot take even the shortest item are final
+        for (stock_id, counts), n in bars.pop_closed(min_length):
+            groups += 1
+            yield stock_id, counts, n
+
+    for (stock_id, counts), n in bars.pop_closed(float("inf")):
+        groups += 1
+        yield stock_id, counts, n
+    count("ffd.groups", groups)
+
+
+def _bump(counts, i, k):
+    """Return `counts` with `k` more pieces of item `i`."""
+    return counts[:i] + (counts[i] + k,) + counts[i + 1:]
@@ -0,0 +1,194 @@
+"""
+Genetic algorithm over cutting plans.
+
+A plan is a vector with the number of bars cut with each row of the pattern
+matrix, and the whole population is a plans x rows matrix, scored in one
+batch by `PatternMatrix.evaluate_batch`. Every generation:
+
+- parents are drawn by tournament on cost,
+- a child takes the pattern multiplicities of each stock type from one of
+  its two parents (crossover per stock type),
+- mutation adds or removes a bar of a random pattern,
+- repair cuts the missing pieces with the patterns covering the most of
+  them per unit cost, then drops the bars, most expensive first, whose
+  pieces are not needed,
+- the best plans (the elite) are carried over unchanged.
+
+The initial population holds the plans of the greedy and FFD heuristics
+(those computed before the deadline, if any), the rest is random, so the
+best plan found is never worse than the seeds.
+"""
+
+import itertools
+import time
+
+import numpy as np
+
+from .ffd import ffd_cutting
+from .greedy import greedy_cutting, modified_greedy_cutting
+from .patterns import PatternMatrix, empty_stock_usage
+from .profiling import count, timer
+
+
+def seed_plans(matrix, order, stocks, end=None):
+    """
+    Row-count vectors of the greedy, modified greedy and FFD plans, computed
+    in that order until `time.monotonic()` passes `end`, if given.
+    """
+    plans = []
+    for heuristic in (greedy_cutting, modified_greedy_cutting, ffd_cutting):
+        if end is not None and time.monotonic() >= end:
+            break
+        plans.append(matrix.from_stock_usage(heuristic(order, stocks)[0]))
+    return plans
+
+
+def random_plans(matrix, n, rng):
+    """
+    `n` random plans: about half the bars a plan needs, cut with random
+    patterns, to be completed by `repair`.
+    """
+    plans = np.zeros((n, len(matrix)), dtype=np.int64)
+    if n and len(matrix):
+        volume = (matrix.demand * matrix.item_lengths).sum()
+        bars = max(int(volume / matrix.stock_lengths.max() / 2), 1)
+        np.add.at(plans, (np.repeat(np.arange(n), bars), rng.integers(len(matrix), size=n * bars)), 1)
+    return plans
+
+
+def repair(matrix, plans, candidates=32):
+    """
+    Make every plan (a row of `plans`, changed in place) meet the demand, then
+    drop its bars whose pieces are not needed.
+
+    Missing pieces are cut with the row covering the most missing length per
+    unit of cost, as many bars at a time as the shortage allows, for all short
+    plans at once. Rows are ranked by the length they cut of the missing items
+    with one matrix product, and only the best `candidates` of them are scored
+    exactly (counting only pieces still needed). Redundant bars are then
+    dropped row by row, most expensive (and most wasteful) rows first, again
+    for all plans at once.
+    """
+    counts = matrix.counts
+    lengths = matrix.item_lengths
+    weighted = (counts * lengths / matrix.cost[:, None]).T
+    while True:
+        shortage = matrix.evaluate_batch(plans).shortage
+        short = np.flatnonzero(shortage.any(axis=1))
+        if not len(short):
+            break
+        missing = shortage[short]
+        rank = (missing > 0) @ weighted
+        k = min(candidates, len(matrix))
+        top = np.argpartition(-rank, k - 1, axis=1)[:, :k]
+        useful = (np.minimum(counts[top], missing[:, None, :]) @ lengths) / matrix.cost[top]
+        if not useful.max(axis=1).all():
+            raise ValueError("remaining demand cannot be cut from any stock type")
+        rows = top[np.arange(len(short)), useful.argmax(axis=1)]
+        # As many bars of the chosen row as the shortage of the missing items it cuts allows, at least one
+        covered = (counts[rows] > 0) & (missing > 0)
+        need = np.where(covered, missing // np.maximum(counts[rows], 1), np.iinfo(np.int64).max)
+        plans[short, rows] += np.maximum(need.min(axis=1), 1)
+        count("ga.repairs", len(short))
+
+    surplus = matrix.evaluate_batch(plans).coverage - matrix.demand
+    used = np.flatnonzero(plans.any(axis=0))
+    for row in used[np.lexsort((-matrix.waste[used], -matrix.cost[used]))]:
+        holders = np.flatnonzero(plans[:, row])
+        cut = counts[row] > 0
+        drop = np.minimum(plans[holders, row], (surplus[holders][:, cut] // counts[row, cut]).min(axis=1))
+        drop = np.maximum(drop, 0)
+        plans[holders, row] -= drop
+        surplus[holders] -= drop[:, None] * counts[row]
+    return plans
+
+
+def genetic_cutting(order, stocks, population=60, generations=200, elite=2, tournament=3,
+                    mutation_rate=0.3, patience=50, seed=None, prune=True, deadline=None, callback=None):
+    """
+    Solve the cutting stock problem with a genetic algorithm.
+
+    Args:
+        order: A dictionary containing order types, their lengths, and demands.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        population: Number of plans per generation.
+        generations: Maximum number of generations, or None to run until the deadline.
+        elite: Number of best plans carried over unchanged.
+        tournament: Number of plans drawn per parent selection.
+        mutation_rate: Probability that a child gets a mutation.
+        patience: Stop after this many generations without improvement (None never stops early).
+        seed: Random seed.
+        prune: Drop dominated and duplicate patterns first (see `PatternMatrix.prune`).
+        deadline: Wall-clock budget in seconds, checked once per generation.
+        callback: Called as callback(stock_usage, total_cost) with every improving plan.
+
+    Returns:
+        The best stock usage, its cost and whether it meets the demand.
+    """
+    if generations is None and deadline is None:
+        raise ValueError("generations=None needs a deadline")
+    if not any(order[f]["demand"] for f in order):
+        # Nothing to cut (an empty order has no patterns at all)
+        return empty_stock_usage(stocks), 0, True
+    end = None if deadline is None else time.monotonic() + deadline
+    rng = np.random.default_rng(seed)
+    with timer("ga.setup"):
+        matrix = PatternMatrix(stocks, order)
+        if prune:
+            matrix, _ = matrix.prune()
+        if not len(matrix):
+            raise ValueError("no pattern fits any stock type")
+
+        seeds = np.array(seed_plans(matrix, order, stocks, end)[:population], dtype=np.int64).reshape(-1, len(matrix))
+        plans = repair(matrix, np.concatenate([seeds, random_plans(matrix, population - len(seeds), rng)]))
+
+    n_stocks = len(matrix.stock_ids)
+    costs = matrix.evaluate_batch(plans).cost
+    best = int(costs.argmin())
+    best_plan, best_cost = plans[best].copy(), costs[best].item()
+    if callback is not None:
+        callback(matrix.to_stock_usage(best_plan), best_cost)
+    stale = 0
+
+    for _ in range(generations) if generations is not None else itertools.count():
+        if end is not None and time.monotonic() >= end:
+            break
+        count("ga.generations")
+        with timer("ga.breed"):
+            n_children = population - elite
+            # Tournament selection on cost (every plan meets the demand after repair)
+            entrants = rng.integers(len(plans), size=(2, n_children, tournament))
+            winners = np.take_along_axis(entrants, costs[entrants].argmin(axis=2)[..., None], axis=2)[..., 0]
+            mothers, fathers = plans[winners[0]], plans[winners[1]]
+
+            # Crossover on the pattern multiplicities of each stock type
+            inherit = rng.random((n_children, n_stocks)) < 0.5
+            children = np.where(inherit[:, matrix.stock_index], mothers, fathers)
+
+            # Mutation: one more or one fewer bar of a random pattern
+            mutants = np.flatnonzero(rng.random(n_children) < mutation_rate)
+            rows = rng.integers(len(matrix), size=len(mutants))
+            steps = rng.choice((-1, 1), size=len(mutants))
+            children[mutants, rows] = np.maximum(children[mutants, rows] + steps, 0)
+
+            children = repair(matrix, children)
+
+        with timer("ga.evaluate"):
+            elites = plans[np.argsort(costs, kind="stable")[:elite]]
+            plans = np.concatenate([elites, children])
+            costs = matrix.evaluate_batch(plans).cost
+
+        best = int(costs.argmin())
+        if costs[best] < best_cost:
+            best_plan, best_cost = plans[best].copy(), costs[best].item()
+            count("ga.improved")
+            stale = 0
+            if callback is not None:
+                callback(matrix.to_stock_usage(best_plan), best_cost)
+        else:
+            stale += 1
+            if patience is not None and stale >= patience:
+                break
+
+    total_cost, cut = matrix.evaluate(best_plan)
+    return matrix.to_stock_usage(best_plan), total_cost, bool((cut >= matrix.demand).all())
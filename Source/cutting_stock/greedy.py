@@ -0,0 +1,205 @@
+"""
+Greedy cutting heuristics.
+
+Both variants cycle through the stock types, cheapest per unit length first,
+and cut the first pattern (in their own preference order) that does not cut
+more pieces than are still needed.
+
+Patterns are sorted once per stock type. Since the remaining demand only goes
+down, a pattern that cuts too many pieces of some item never fits again, so
+`FeasibleRows` drops it for good and every selection resumes where the last
+one stopped: over a whole run each pattern is checked and dropped at most
+once, and the cost per bar does not grow with the number of patterns.
+
+After a round through the stock types, the same round is repeated as many
+times as the remaining demand covers it whole, in one step: the repeated
+rounds would pick the same patterns, so the plan is unchanged, and the
+running time depends on the number of distinct rounds rather than on the
+demand volume.
+
+With `prune=True` they search the pattern set with dominated and duplicate
+patterns removed (see `PatternMatrix.prune`). That is faster on catalogs with
+many redundant patterns, but it changes which pattern is cut first and can
+leave fewer exact fits near the end, so it is off by default.
+
+With a `deadline` (in seconds), the demand still missing when it runs out is
+cut with the FFD packing, which is fast on any order size.
+"""
+
+import time
+
+import numpy as np
+
+from .ffd import iter_ffd_cutting
+from .patterns import PatternMatrix
+from .profiling import count, timer
+
+
+class FeasibleRows:
+    """
+    Presorted pattern rows of one stock type that may still fit the remaining demand.
+
+    Args:
+        matrix: The `PatternMatrix`.
+        rows: Row indices in preference order.
+        block: Number of rows checked per vectorized step.
+    """
+
+    def __init__(self, matrix, rows, block=64):
+        self.rows = rows
+        self.counts = matrix.counts[rows]
+        self.start = 0
+        self.block = block
+        self.checked = 0
+
+    def first(self, remaining):
+        """
+        Return the first row that cuts no more of any item than `remaining`,
+        or None when no row is left. Rows found not to fit are dropped.
+        """
+        if self.start < len(self.rows) and (self.counts[self.start] <= remaining).all():
+            # Usually the row cut last still fits
+            self.checked += 1
+            return self.rows[self.start]
+        while self.start < len(self.rows):
+            stop = min(self.start + self.block, len(self.rows))
+            fits = (self.counts[self.start:stop] <= remaining).all(axis=1)
+            if fits.any():
+                self.start += int(fits.argmax())
+                self.checked += int(fits.argmax()) + 1
+                return self.rows[self.start]
+            self.checked += stop - self.start
+            self.start = stop
+        return None
+
+
+def _cut_greedily(matrix, stocks, stock_rows, deadline=None, callback=None):
+    """
+    Run the greedy loop over presorted rows.
+
+    Args:
+        matrix: The `PatternMatrix`.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        stock_rows: {stock_id: row indices in preference order}.
+        deadline: Wall-clock budget in seconds. When it runs out, the demand
+            still missing is cut with `iter_ffd_cutting` instead.
+        callback: Called as callback(stock_usage, total_cost) with the plan.
+
+    Returns:
+        The stock usage, its total cost and the cut counts.
+    """
+    end = None if deadline is None else time.monotonic() + deadline
+    sorted_stocks = sorted(stocks.items(), key=lambda x: x[1]['cost'] / x[1]['length'])
+    remaining_demand = matrix.demand.copy()
+    stock_usage = {stock_id: {} for stock_id in stocks}
+    total_cost = 0
+
+    active = [(stock_id, stock_info["cost"], FeasibleRows(matrix, stock_rows[stock_id]))
+              for stock_id, stock_info in sorted_stocks]
+    engines = [candidates for _, _, candidates in active]
+    pattern_tuples = {}
+    while (remaining_demand > 0).any():
+        if end is not None and time.monotonic() >= end:
+            total_cost += _finish_with_ffd(matrix, stocks, remaining_demand, stock_usage)
+            break
+        count("greedy.rounds")
+        progress = False
+        picks = []
+        for stock_id, stock_cost, candidates in active:
+            # Cost is the same for every pattern of a stock type, so take the first feasible one
+            best_row = candidates.first(remaining_demand)
+            if best_row is None:
+                continue
+
+            if best_row not in pattern_tuples:
+                pattern_tuples[best_row] = matrix.pattern_tuple(best_row)
+            pattern_tuple = pattern_tuples[best_row]
+            stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + 1
+            remaining_demand -= matrix.counts[best_row]
+            total_cost += stock_cost
+            count("greedy.bars")
+            progress = True
+            picks.append((stock_id, stock_cost, best_row))
+
+            if (remaining_demand <= 0).all():
+                break
+
+        if picks:
+            # Repeating the round picks the same rows as long as the remaining
+            # demand covers a whole round, so cut every such repetition at once
+            round_counts = matrix.counts[[row for _, _, row in picks]].sum(axis=0)
+            cut = round_counts > 0
+            repeat = int((remaining_demand[cut] // round_counts[cut]).min())
+            if repeat > 0:
+                for stock_id, stock_cost, row in picks:
+                    stock_usage[stock_id][pattern_tuples[row]] += repeat
+                    total_cost += repeat * stock_cost
+                remaining_demand -= repeat * round_counts
+                count("greedy.rounds", repeat)
+                count("greedy.bars", repeat * len(picks))
+
+        # Stock types without a fitting row stay without one
+        active = [entry for entry in active if entry[2].start < len(entry[2].rows)]
+
+        if not progress:
+            # No pattern fits the leftover demand exactly, so cut a trimmed one
+            best_row, counts = matrix.cover_remaining(remaining_demand)
+            stock_id = matrix.stock_ids[matrix.stock_index[best_row]]
+            pattern_tuple = matrix.pattern_tuple(best_row, counts)
+            stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + 1
+            remaining_demand -= counts
+            total_cost += matrix.cost[best_row].item()
+            count("greedy.fallbacks")
+
+    count("greedy.feasibility_checks", sum(candidates.checked for candidates in engines))
+    cut_counts = dict(zip(matrix.items, (matrix.demand - remaining_demand).tolist()))
+    if callback is not None:
+        callback(stock_usage, total_cost)
+    return stock_usage, total_cost, cut_counts
+
+
+def _finish_with_ffd(matrix, stocks, remaining_demand, stock_usage):
+    """Cut the remaining demand with FFD into `stock_usage` (in place) and return its cost."""
+    order = {f: {"length": int(length), "demand": int(demand)}
+             for f, length, demand in zip(matrix.items, matrix.item_lengths, remaining_demand) if demand > 0}
+    index = [matrix.items.index(f) for f in order]
+    cost = 0
+    for stock_id, counts, n in iter_ffd_cutting(order, stocks):
+        full = [0] * len(matrix.items)
+        for i, pieces in zip(index, counts):
+            full[i] = pieces
+        pattern_tuple = tuple(sorted(zip(matrix.items, full)))
+        stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + n
+        remaining_demand -= n * np.array(full)
+        cost += n * stocks[stock_id]["cost"]
+    count("greedy.ffd_finish")
+    return cost
+
+
+def greedy_cutting(order, stocks, prune=False, deadline=None, callback=None):
+    """Perform the greedy cutting based on cost minimization."""
+    with timer("greedy.matrix"):
+        matrix = PatternMatrix(stocks, order)
+        if prune:
+            matrix, _ = matrix.prune()
+
+    # Most pieces first, presorted once per stock type
+    with timer("greedy.sort"):
+        stock_rows = {stock_id: matrix.sorted_rows(stock_id, -matrix.pieces) for stock_id in stocks}
+
+    return _cut_greedily(matrix, stocks, stock_rows, deadline, callback)
+
+
+def modified_greedy_cutting(order, stocks, prune=False, deadline=None, callback=None):
+    """Perform the modified greedy cutting based on multiple criteria."""
+    with timer("greedy.matrix"):
+        matrix = PatternMatrix(stocks, order)
+        if prune:
+            matrix, _ = matrix.prune()
+
+    # Modify: Sort patterns based on a combined objective function
+    # (most pieces first, then least used length; cost is constant per stock type)
+    with timer("greedy.sort"):
+        stock_rows = {stock_id: matrix.sorted_rows(stock_id, -matrix.pieces, matrix.length) for stock_id in stocks}
+
+    return _cut_greedily(matrix, stocks, stock_rows, deadline, callback)
@@ -0,0 +1,146 @@
+"""
+Incremental re-solving when an order changes.
+
+When a few pieces are added to or cancelled from an order that already has a
+cut plan, `resolve` updates the plan instead of solving the new order from
+scratch:
+
+    plan = solve(stocks, order, "sa", seed=1)
+    plan = resolve(stocks, order, plan, {"M": +3, "XL": -2})
+
+The repair step keeps the bars of the previous plan, drops the bars that the
+cancellations made redundant, and cuts only the pieces still missing, so
+unchanged bars stay as they were. Optionally the repaired plan then
+warm-starts Simulated Annealing, or its patterns seed the column generation
+LP, which may move bars but never returns a worse plan than the repair.
+"""
+
+import numpy as np
+
+from .api import CuttingPlan, get_solver
+from .column_generation import column_generation, columns_to_stock_usage, drop_redundant_bars, round_plan
+from .patterns import evaluate_stock_usage
+from .profiling import phase
+from .stream import plan_entries
+
+METHODS = ("repair", "sa", "column_generation")
+
+
+def apply_delta(order, delta):
+    """
+    Return a copy of `order` with `delta` ({item: change in pieces}) added to
+    its demands; demands do not go below zero.
+    """
+    unknown = set(delta) - set(order)
+    if unknown:
+        raise ValueError(f"items {sorted(unknown)} are not in the order; add them to the order instead")
+    return {f: {**info, "demand": max(info["demand"] + delta.get(f, 0), 0)} for f, info in order.items()}
+
+
+def _kept_bars(previous, stock_usage):
+    """Number of bars of `previous` that `stock_usage` cuts the same way."""
+    return sum(min(count, stock_usage.get(stock_id, {}).get(pattern_tuple, 0))
+               for stock_id, patterns in previous.items() for pattern_tuple, count in patterns.items())
+
+
+def repair_plan(stocks, order, stock_usage, residual="ffd", **options):
+    """
+    Adapt a plan to the demands of `order` while keeping its bars.
+
+    Bars whose pieces are all overproduced are dropped, most expensive first,
+    and the pieces still missing are cut by the `residual` solver on an order
+    holding only the shortage.
+
+    Args:
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: The changed order.
+        stock_usage: The previous plan, {stock_id: {pattern_tuple: count}}.
+        residual: Name of the solver (see `SOLVERS`) for the missing pieces.
+        **options: Extra keyword arguments for the residual solver.
+
+    Returns:
+        The repaired stock usage and {"dropped", "added"} bar counts.
+    """
+    entries = list(plan_entries(stock_usage, order))
+    columns = [(entry.stock, entry.pattern) for entry in entries]
+    bars = np.array([entry.count for entry in entries], dtype=np.int64)
+    A = np.array([entry.pattern for entry in entries], dtype=np.int64).reshape(len(entries), len(order))
+    demand = np.array([order[f]["demand"] for f in order], dtype=np.int64)
+
+    before = int(bars.sum())
+    bars = drop_redundant_bars(columns, stocks, bars, demand, A)
+    repaired, _ = columns_to_stock_usage(order, stocks, columns, bars)
+
+    shortage = np.maximum(demand - bars @ A, 0)
+    added = 0
+    if shortage.any():
+        residual_order = {f: {**order[f], "demand": int(short)} for f, short in zip(order, shortage) if short}
+        extra, _, _ = get_solver(residual)(residual_order, stocks, **options)
+        for stock_id, patterns in extra.items():
+            usage = repaired.setdefault(stock_id, {})
+            for pattern_tuple, count in patterns.items():
+                # Residual patterns only name the short items
+                pattern_dict = dict(pattern_tuple)
+                key = tuple(sorted((f, pattern_dict.get(f, 0)) for f in order))
+                usage[key] = usage.get(key, 0) + count
+                added += count
+    return repaired, {"dropped": before - int(bars.sum()), "added": added}
+
+
+def resolve(stocks, order, previous, delta, method="repair", residual="ffd", **options):
+    """
+    Re-solve an order after a demand change, starting from its previous plan.
+
+    Args:
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: The order the previous plan was made for.
+        previous: The previous `CuttingPlan` or its stock usage.
+        delta: {item: change in pieces}, positive for additions and negative
+            for cancellations.
+        method: "repair" keeps every bar it can (see `repair_plan`); "sa"
+            also runs Simulated Annealing warm-started from the repaired plan;
+            "column_generation" also runs column generation with the repaired
+            plan's patterns as starting columns and rounds its LP solution.
+        residual: Solver for the missing pieces in the repair step.
+        **options: Extra keyword arguments for the SA or column generation step.
+
+    Returns:
+        A `CuttingPlan` for the changed order, whose stats hold the changed
+        order ("order"), the bars dropped and added by the repair and the
+        number of bars of the previous plan that were kept unchanged ("kept").
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}, expected one of {list(METHODS)}")
+    new_order = apply_delta(order, delta)
+    previous = getattr(previous, "stock_usage", previous)
+
+    with phase("repair"):
+        stock_usage, stats = repair_plan(stocks, new_order, previous, residual)
+    total_cost, _ = evaluate_stock_usage(stock_usage, stocks, new_order)
+
+    # An order cancelled down to nothing keeps the repaired plan, which cuts no bars
+    search = method if any(info["demand"] for info in new_order.values()) else "repair"
+    with phase("search"):
+        candidate = None
+        if search == "sa":
+            from .annealing import simulated_annealing
+
+            candidate, _, _ = simulated_annealing(new_order, stocks, initial=stock_usage, **options)
+        elif search == "column_generation":
+            columns = [(entry.stock, entry.pattern) for entry in plan_entries(stock_usage, new_order)]
+            columns, x, lower_bound, _ = column_generation(new_order, stocks, columns=columns, **options)
+            bars = round_plan(new_order, stocks, columns, x)
+            candidate, _ = columns_to_stock_usage(new_order, stocks, columns, bars)
+            stats["lower_bound"] = lower_bound
+        if candidate is not None:
+            cost, cut = evaluate_stock_usage(candidate, stocks, new_order)
+            demand = np.array([new_order[f]["demand"] for f in new_order])
+            if (cut >= demand).all() and cost < total_cost:
+                stock_usage, total_cost = candidate, cost
+
+    with phase("evaluation"):
+        total_cost, cut = evaluate_stock_usage(stock_usage, stocks, new_order)
+        cut_counts = dict(zip(new_order, cut.tolist()))
+    stats.update({"order": new_order, "kept": _kept_bars(previous, stock_usage)})
+    demand_met = all(cut_counts[f] >= new_order[f]["demand"] for f in new_order)
+    return CuttingPlan(f"resolve:{method}", stock_usage, total_cost, cut_counts, demand_met, stats)
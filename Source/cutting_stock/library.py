@@ -0,0 +1,105 @@
+"""
+Persistent on-disk pattern library.
+
+A `PatternLibrary` is a directory of pattern files (see `patternfile`), one
+per (stock length, item lengths, validity rule), named by a hash of that key.
+Attached to the shared pattern cache, it is read on a cache miss before
+enumerating, and every enumerated pattern set is stored in it, so any process
+using the same directory skips the enumeration next time:
+
+    from cutting_stock.library import use_library
+    use_library("~/.cache/cutting_stock/patterns", max_bytes=512 * 2**20)
+
+Setting the CUTTING_STOCK_PATTERN_LIBRARY environment variable to a
+directory does the same for every process at import time, which also covers
+pool workers.
+
+Files are written under a temporary name and renamed into place, so readers
+in other processes never see partial files. When the directory grows over
+`max_bytes`, the least recently used files (by modification time, which a
+read refreshes) are deleted (see `storage`).
+"""
+
+import hashlib
+import json
+
+from .patternfile import load_pattern_file, write_vectors
+from .storage import CappedDirectory
+
+ENVIRONMENT_VARIABLE = "CUTTING_STOCK_PATTERN_LIBRARY"
+SUFFIX = ".pat"
+
+
+class PatternLibrary(CappedDirectory):
+    """
+    Directory of pattern files shared between processes.
+
+    Args:
+        directory: Library directory, created if missing.
+        max_bytes: Total size above which the least recently used files are evicted.
+    """
+
+    def __init__(self, directory, max_bytes=256 * 2**20):
+        super().__init__(directory, SUFFIX, max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(stock_length, lengths, maximal=True):
+        """Hash of a (stock length, item lengths, rule) signature."""
+        signature = json.dumps({"stock_length": stock_length, "lengths": list(lengths),
+                                "rule": "maximal" if maximal else "fits"})
+        return hashlib.sha256(signature.encode("utf-8")).hexdigest()[:32]
+
+    def path(self, stock_length, lengths, maximal=True):
+        return self.file_path(self.key(stock_length, lengths, maximal))
+
+    def load(self, stock_length, lengths, maximal=True):
+        """
+        Return the stored pattern vectors of a signature, or None.
+
+        A file whose header does not match the signature, or that cannot be
+        read, is treated as missing.
+        """
+        path = self.path(stock_length, lengths, maximal)
+        try:
+            pattern_file = load_pattern_file(path)
+            entries = pattern_file.cache_entries()
+            self.touch(path)
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        vectors = entries.get((stock_length, tuple(lengths), maximal))
+        if vectors is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return vectors
+
+    def store(self, stock_length, lengths, maximal, vectors):
+        """Write the pattern vectors of a signature and evict old files if the library is too big."""
+        try:
+            write_vectors(self.path(stock_length, lengths, maximal), stock_length, lengths, vectors, maximal)
+        except OSError:
+            # A read-only or full library only loses its caching
+            return
+        self.evict()
+
+    def info(self):
+        return {**super().info(), "hits": self.hits, "misses": self.misses}
+
+
+def use_library(directory, max_bytes=256 * 2**20, cache=None):
+    """
+    Attach a `PatternLibrary` to a pattern cache (the shared one by default).
+
+    Passing None as `directory` detaches the library.
+
+    Returns:
+        The library, or None.
+    """
+    from .patterns import pattern_cache
+
+    cache = pattern_cache if cache is None else cache
+    cache.library = PatternLibrary(directory, max_bytes) if directory is not None else None
+    return cache.library
@@ -0,0 +1,182 @@
+"""
+Binary pattern files.
+
+A pattern file stores the pattern set of a stock catalog and an order's item
+lengths so it can be memory-mapped straight into NumPy arrays:
+
+    8 bytes   magic b"CSPATTN1"
+    4 bytes   header size, little-endian uint32
+    header    UTF-8 JSON: items, stocks (with their row ranges), validity rule,
+              row count and row dtype
+    padding   up to a multiple of 64 bytes
+    rows      C-ordered matrix with one row per pattern:
+              [count of every item..., used length, waste]
+
+Rows are grouped by stock type in catalog order, empty patterns are left out,
+and the row dtype is the smallest signed integer type holding every value.
+`load_pattern_file` maps the rows read-only without copying them, so a worker
+process only pages in what it touches.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+from .storage import atomic_file
+
+MAGIC = b"CSPATTN1"
+ALIGNMENT = 64
+
+
+def _row_dtype(max_value):
+    for dtype in ("<i1", "<i2", "<i4"):
+        if max_value <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype("<i8")
+
+
+def write_pattern_file(path, stocks, order, maximal=True):
+    """
+    Enumerate the patterns of a catalog and write them as a pattern file.
+
+    The file is written to a temporary name and renamed into place, so readers
+    never see a partial file.
+
+    Args:
+        path: Destination file.
+        stocks: A dictionary containing stock types, their lengths, and costs.
+        order: A dictionary containing order types and their lengths (demands
+            are not stored).
+        maximal: Validity rule, as in `generate_patterns`.
+
+    Returns:
+        The number of pattern rows written.
+    """
+    from .patterns import PatternMatrix
+
+    matrix = PatternMatrix(stocks, order, maximal)
+    items = [{"label": f, "length": order[f]["length"]} for f in order]
+    stock_list = [{"id": stock_id, "length": stocks[stock_id]["length"], "cost": stocks[stock_id]["cost"],
+                   "rows": list(map(int, matrix._bounds[stock_id]))} for stock_id in stocks]
+    _write(path, items, stock_list, maximal, np.column_stack([matrix.counts, matrix.length, matrix.waste]))
+    return len(matrix)
+
+
+def write_vectors(path, stock_length, lengths, vectors, maximal=True):
+    """
+    Write the pattern vectors of one stock length (as returned by
+    `pattern_vectors`) as a pattern file with a single stock type "stock" and
+    items labelled by their index. Empty patterns are left out, as usual.
+    """
+    lengths = np.asarray(lengths, dtype=np.int64)
+    counts = np.array(vectors, dtype=np.int64).reshape(len(vectors), len(lengths))
+    counts = counts[counts.any(axis=1)]
+    length = counts @ lengths
+    items = [{"label": str(i), "length": int(l)} for i, l in enumerate(lengths)]
+    stock_list = [{"id": "stock", "length": int(stock_length), "cost": 0, "rows": [0, len(counts)]}]
+    _write(path, items, stock_list, maximal, np.column_stack([counts, length, stock_length - length]))
+    return len(counts)
+
+
+def _write(path, items, stock_list, maximal, rows):
+    dtype = _row_dtype(int(rows.max()) if rows.size else 0)
+    header = {
+        "version": 1,
+        "rule": "maximal" if maximal else "fits",
+        "items": items,
+        "stocks": stock_list,
+        "rows": len(rows),
+        "dtype": dtype.str,
+    }
+    encoded = json.dumps(header).encode("utf-8")
+    prefix = len(MAGIC) + 4 + len(encoded)
+    padding = b"\0" * (-prefix % ALIGNMENT)
+
+    with atomic_file(path, prefix=".patterns-") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(encoded)
+        f.write(padding)
+        f.write(np.ascontiguousarray(rows, dtype=dtype).tobytes())
+
+
+class PatternFile:
+    """
+    A pattern file mapped into memory.
+
+    Attributes:
+        path: File path.
+        maximal: Validity rule of the stored patterns.
+        items: Item labels, one per count column.
+        item_lengths: Length of every item.
+        stocks: {stock_id: {"length", "cost"}} in file order.
+        data: Read-only memory map of the whole row matrix.
+        counts: View of the count columns.
+        length: View of the used-length column.
+        waste: View of the waste column.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            magic = f.read(len(MAGIC))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a pattern file")
+            (size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(size).decode("utf-8"))
+        if header["version"] != 1:
+            raise ValueError(f"unsupported pattern file version {header['version']}")
+
+        self.header = header
+        self.maximal = header["rule"] == "maximal"
+        self.items = [item["label"] for item in header["items"]]
+        self.item_lengths = [item["length"] for item in header["items"]]
+        self.stocks = {s["id"]: {"length": s["length"], "cost": s["cost"]} for s in header["stocks"]}
+        self._bounds = {s["id"]: tuple(s["rows"]) for s in header["stocks"]}
+
+        offset = len(MAGIC) + 4 + size
+        offset += -offset % ALIGNMENT
+        shape = (header["rows"], len(self.items) + 2)
+        dtype = np.dtype(header["dtype"])
+        if header["rows"]:
+            self.data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=shape)
+        else:
+            self.data = np.zeros(shape, dtype=dtype)
+        n = len(self.items)
+        self.counts = self.data[:, :n]
+        self.length = self.data[:, n]
+        self.waste = self.data[:, n + 1]
+
+    def __len__(self):
+        return len(self.data)
+
+    def bounds(self, stock_id):
+        """(start, stop) row range of one stock type."""
+        return self._bounds[stock_id]
+
+    def vectors(self, stock_id):
+        """Count vectors of one stock type as tuples, the entry format of `PatternCache`."""
+        start, stop = self._bounds[stock_id]
+        return [tuple(row) for row in self.counts[start:stop].tolist()]
+
+    def cache_entries(self):
+        """
+        `PatternCache.update` entries for every stock length in the file, equal
+        to what `pattern_vectors` returns (the empty pattern, which the file
+        leaves out, is put back first where the rule allows it).
+        """
+        lengths = tuple(self.item_lengths)
+        shortest = min(lengths, default=0)
+        entries = {}
+        for stock_id, stock in self.stocks.items():
+            vectors = self.vectors(stock_id)
+            if lengths and (not self.maximal or stock["length"] < shortest):
+                vectors.insert(0, (0,) * len(lengths))
+            entries[(stock["length"], lengths, self.maximal)] = tuple(vectors)
+        return entries
+
+
+def load_pattern_file(path):
+    """Map a pattern file written by `write_pattern_file` into memory."""
+    return PatternFile(path)
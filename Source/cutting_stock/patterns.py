@@ -0,0 +1,576 @@
+"""
+Shared pattern engine for the cutting stock solvers.
+
+Patterns are enumerated by a depth-first search over the order items that
+only walks cut counts fitting in the remaining stock length, instead of
+filtering the full Cartesian product of `range(stock_length // length + 1)`.
+Generated patterns are memoized in `pattern_cache`, which every solver shares,
+so repeated solves on the same stock catalog only enumerate patterns once,
+and can be backed by a persistent on-disk library (see `library`).
+`PatternMatrix` packs the patterns of a whole catalog into NumPy arrays so
+solvers can filter and score them with masks and dot products.
+"""
+
+import os
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from .profiling import count
+
+
+def is_valid_pattern(pattern, order, stock_length):
+    """
+    Check if the pattern is valid, i.e., total length of the cuts does not exceed the stock length,
+    and the remaining length does not exceed any of the required sizes.
+    """
+    total_length = sum(order[f]["length"] * count for f, count in pattern.items())
+    remaining_length = stock_length - total_length
+
+    # Check if remaining length is not larger than any required size
+    if remaining_length > 0 and remaining_length >= min(order[f]["length"] for f in order):
+        return False
+
+    return total_length <= stock_length
+
+
+def pattern_vectors(stock_length, lengths, maximal=True, limit=None):
+    """
+    Enumerate cut-count vectors for one stock length by depth-first search.
+
+    Args:
+        stock_length: Length of the stock bar.
+        lengths: Item lengths, one per order item (in order).
+        maximal: If True, only keep patterns whose leftover is shorter than the
+            smallest item (the rule of `is_valid_pattern`); otherwise keep every
+            pattern that fits in the bar.
+        limit: Stop as soon as more than this many patterns are found.
+
+    Returns:
+        A list of tuples, in the same lexicographic order as
+        `itertools.product` over the per-item cut ranges, or None if there
+        are more than `limit` patterns.
+    """
+    lengths = list(lengths)
+    if not lengths:
+        return []
+
+    n = len(lengths)
+    last = n - 1
+    min_length = min(lengths)
+    counts = [0] * n
+    vectors = []
+    rejected = [0]
+
+    def walk(i, remaining):
+        if limit is not None and len(vectors) > limit:
+            return
+        length = lengths[i]
+        top = remaining // length
+        if i == last:
+            if maximal:
+                # Only the fullest count of the last item can leave less than
+                # the smallest item, since that item is at least min_length long.
+                if remaining - top * length < min_length:
+                    counts[i] = top
+                    vectors.append(tuple(counts))
+                else:
+                    rejected[0] += 1
+            else:
+                for count in range(top + 1):
+                    counts[i] = count
+                    vectors.append(tuple(counts))
+            counts[i] = 0
+            return
+
+        for count in range(top + 1):
+            counts[i] = count
+            walk(i + 1, remaining - count * length)
+        counts[i] = 0
+
+    walk(0, stock_length)
+    count("patterns.generated", len(vectors))
+    count("patterns.rejected", rejected[0])
+    if limit is not None and len(vectors) > limit:
+        return None
+    return vectors
+
+
+class PatternCache:
+    """
+    LRU store of pattern vectors keyed by (stock length, item lengths, rule).
+
+    Entries are tuples of count vectors, so they can be shared between callers
+    without copying. `hits` and `misses` count lookups since the last `clear`.
+    An optional `library` (a `library.PatternLibrary`) is read on a miss before
+    enumerating, and receives every enumerated entry.
+    """
+
+    def __init__(self, maxsize=256, library=None):
+        self.maxsize = maxsize
+        self.library = library
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, stock_length, lengths, maximal=True):
+        """Return the pattern vectors for a stock length, generating them on a miss."""
+        key = (stock_length, tuple(lengths), maximal)
+        vectors = self._entries.get(key)
+        if vectors is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return vectors
+
+        self.misses += 1
+        if self.library is not None:
+            vectors = self.library.load(*key)
+            if vectors is None:
+                vectors = tuple(pattern_vectors(stock_length, key[1], maximal))
+                self.library.store(*key, vectors)
+        else:
+            vectors = tuple(pattern_vectors(stock_length, key[1], maximal))
+        self._entries[key] = vectors
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return vectors
+
+    def update(self, entries):
+        """Insert precomputed {(stock_length, lengths, maximal): vectors} entries."""
+        for (stock_length, lengths, maximal), vectors in entries.items():
+            key = (stock_length, tuple(lengths), maximal)
+            self._entries[key] = tuple(vectors)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def info(self):
+        """Return the cache statistics as a dictionary."""
+        info = {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "maxsize": self.maxsize}
+        if self.library is not None:
+            info["library"] = self.library.info()
+        return info
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Process-wide cache shared by every solver module
+pattern_cache = PatternCache()
+if os.environ.get("CUTTING_STOCK_PATTERN_LIBRARY"):
+    from .library import use_library
+
+    use_library(os.environ["CUTTING_STOCK_PATTERN_LIBRARY"])
+
+
+PlanScores = namedtuple("PlanScores", ["cost", "coverage", "overproduction", "shortage", "waste", "demand_met"])
+PlanScores.__doc__ = """
+Scores of a batch of plans, one entry (or row) per plan.
+
+Attributes:
+    cost: Total cost of every plan.
+    coverage: Plans x items matrix of the pieces cut.
+    overproduction: Plans x items matrix of the pieces cut beyond the demand.
+    shortage: Plans x items matrix of the pieces still missing.
+    waste: Total leftover length of every plan.
+    demand_met: Whether every plan covers the demand.
+"""
+
+
+def score_plans(plans, counts, waste, cost, demand):
+    """
+    Score a batch of plans given as a plans x patterns matrix of bar counts.
+
+    All sums come out of a single float64 matrix product (BLAS, far faster
+    than NumPy's integer product), which is exact for integers below 2**53.
+
+    Args:
+        plans: Bar count of every pattern in every plan (a vector for one plan).
+        counts: Patterns x items matrix of pieces per bar.
+        waste: Leftover length of every pattern.
+        cost: Stock cost of every pattern.
+        demand: Demand of every item.
+
+    Returns:
+        A `PlanScores`.
+    """
+    return _score(plans, _score_columns(counts, waste, cost), np.issubdtype(np.asarray(cost).dtype, np.integer), demand)
+
+
+def _score_columns(counts, waste, cost):
+    """The float64 [counts | waste | cost] matrix `score_plans` multiplies with."""
+    return np.column_stack([counts, waste, cost]).astype(np.float64, copy=False)
+
+
+def _score(plans, columns, integer_cost, demand):
+    plans = np.atleast_2d(plans).astype(np.float64, copy=False)
+    product = plans @ columns
+    n = columns.shape[1] - 2
+    coverage = np.rint(product[:, :n]).astype(np.int64)
+    total_cost = product[:, n + 1]
+    if integer_cost:
+        total_cost = np.rint(total_cost).astype(np.int64)
+    surplus = coverage - demand
+    return PlanScores(total_cost, coverage, np.maximum(surplus, 0), np.maximum(-surplus, 0),
+                      np.rint(product[:, n]).astype(np.int64), (surplus >= 0).all(axis=1))
+
+
+def order_lengths(order):
+    """Return the item lengths of an order, in order."""
+    return [order[f]["length"] for f in order]
+
+
+def generate_patterns(stock_length, order, maximal=True):
+    """
+    Generate all feasible patterns for a given stock length.
+    """
+    vectors = pattern_cache.get(stock_length, order_lengths(order), maximal)
+    labels = list(order.keys())
+    return [dict(zip(labels, vector)) for vector in vectors]
+
+
+class PatternMatrix:
+    """
+    Array-backed pattern set for a stock catalog and an order.
+
+    Rows are grouped by stock type, in catalog order, and keep the order of
+    `generate_patterns` within each stock type. Empty patterns are left out.
+
+    Attributes:
+        items: Order item labels, one per column.
+        stock_ids: Stock type labels.
+        item_lengths: Length of every item.
+        demand: Demand of every item.
+        counts: Int matrix with one row per pattern and one column per item.
+        stock_index: Index into `stock_ids` of every row.
+        pieces: Number of pieces cut by every row.
+        length: Used length of every row.
+        waste: Leftover length of every row.
+        cost: Stock cost of every row.
+        stock_lengths: Length of every stock type.
+        stock_costs: Cost of every stock type.
+    """
+
+    def __init__(self, stocks, order, maximal=True):
+        self.items = list(order.keys())
+        self.stock_ids = list(stocks.keys())
+        self.item_lengths = np.array(order_lengths(order), dtype=np.int64)
+        self.demand = np.array([order[f]["demand"] for f in order], dtype=np.int64)
+
+        blocks = []
+        self._bounds = {}
+        start = 0
+        for stock_id, stock_info in stocks.items():
+            vectors = pattern_cache.get(stock_info["length"], self.item_lengths.tolist(), maximal)
+            block = np.array(vectors, dtype=np.int64).reshape(len(vectors), len(self.items))
+            # Empty patterns only cost money, so no solver should ever pick them
+            block = block[block.any(axis=1)]
+            blocks.append(block)
+            self._bounds[stock_id] = (start, start + len(block))
+            start += len(block)
+
+        counts = np.concatenate(blocks) if blocks else np.zeros((0, len(self.items)), dtype=np.int64)
+        self._set_rows(stocks, counts)
+
+    def _set_rows(self, stocks, counts, length=None, waste=None):
+        """Set the count matrix (rows grouped as in `_bounds`) and the per-row arrays derived from it."""
+        self.counts = counts
+        self.stock_index = np.repeat(np.arange(len(self.stock_ids)),
+                                     [self._bounds[s][1] - self._bounds[s][0] for s in self.stock_ids])
+        self.stock_lengths = np.array([stocks[s]["length"] for s in self.stock_ids], dtype=np.int64)
+        self.stock_costs = np.array([stocks[s]["cost"] for s in self.stock_ids])
+        self.pieces = counts.sum(axis=1)
+        self.length = counts @ self.item_lengths if length is None else length
+        self.waste = self.stock_lengths[self.stock_index] - self.length if waste is None else waste
+        self.cost = self.stock_costs[self.stock_index]
+        self._columns = None
+
+    @classmethod
+    def from_file(cls, pattern_file, order, stocks=None):
+        """
+        Build the matrix on the rows of a `PatternFile` instead of enumerating them.
+
+        The order must have the item lengths of the file, in the same order.
+        When `stocks` is left out, or lists the file's stock types in file
+        order, the count, length and waste arrays are views of the memory map
+        and nothing is copied; otherwise the rows of the requested stock types
+        are gathered.
+
+        Args:
+            pattern_file: A `PatternFile` (see `load_pattern_file`).
+            order: A dictionary containing order types, their lengths, and demands.
+            stocks: Stock catalog, defaulting to the one stored in the file;
+                every stock type must be in the file with the same length.
+        """
+        if order_lengths(order) != list(pattern_file.item_lengths):
+            raise ValueError("order item lengths do not match the pattern file")
+        stocks = pattern_file.stocks if stocks is None else stocks
+        for stock_id, stock_info in stocks.items():
+            if pattern_file.stocks.get(stock_id, {}).get("length") != stock_info["length"]:
+                raise ValueError(f"stock {stock_id} is not in the pattern file")
+
+        self = cls.__new__(cls)
+        self.items = list(order.keys())
+        self.stock_ids = list(stocks.keys())
+        self.item_lengths = np.array(order_lengths(order), dtype=np.int64)
+        self.demand = np.array([order[f]["demand"] for f in order], dtype=np.int64)
+
+        if self.stock_ids == list(pattern_file.stocks):
+            self._bounds = {s: pattern_file.bounds(s) for s in self.stock_ids}
+            self._set_rows(stocks, pattern_file.counts, pattern_file.length, pattern_file.waste)
+        else:
+            self._bounds = {}
+            start = 0
+            for stock_id in self.stock_ids:
+                first, last = pattern_file.bounds(stock_id)
+                self._bounds[stock_id] = (start, start + last - first)
+                start += last - first
+            rows = np.concatenate([np.arange(*pattern_file.bounds(s)) for s in self.stock_ids] or [np.zeros(0, dtype=np.int64)])
+            self._set_rows(stocks, pattern_file.counts[rows], pattern_file.length[rows], pattern_file.waste[rows])
+        return self
+
+    def __len__(self):
+        return len(self.counts)
+
+    def subset(self, rows):
+        """New matrix on the given rows, which must be in ascending order."""
+        rows = np.asarray(rows, dtype=np.int64)
+        matrix = self.__class__.__new__(self.__class__)
+        matrix.items = self.items
+        matrix.stock_ids = self.stock_ids
+        matrix.item_lengths = self.item_lengths
+        matrix.demand = self.demand
+        matrix.stock_lengths = self.stock_lengths
+        matrix.stock_costs = self.stock_costs
+        sizes = np.bincount(self.stock_index[rows], minlength=len(self.stock_ids))
+        stops = np.cumsum(sizes)
+        matrix._bounds = {s: (int(stop - size), int(stop)) for s, size, stop in zip(self.stock_ids, sizes, stops)}
+        for name in ("counts", "stock_index", "pieces", "length", "waste", "cost"):
+            setattr(matrix, name, getattr(self, name)[rows])
+        matrix._columns = None
+        return matrix
+
+    def redundant(self):
+        """
+        Find the rows that another row makes redundant.
+
+        Row p (stock s) is dominated by row q (stock t) when q cuts at least as
+        many pieces of every item at no higher cost, and duplicated when q cuts
+        exactly the same pieces. Since every stock type holds its complete
+        pattern set, such a q exists exactly when p fits on a stock type t
+        that is no more expensive than s: if an item still fits after p on t,
+        p extended to a maximal pattern of t strictly dominates it, and
+        otherwise p itself is a pattern of t. So the rows are compared against
+        the stock types (sorted by cost) rather than against each other.
+
+        Of several duplicates the one on the cheapest stock type (the first in
+        catalog order on ties) is kept, so every removed row has a kept row
+        dominating or duplicating it.
+
+        Returns:
+            Boolean masks (dominated, duplicate) over the rows.
+        """
+        dominated = np.zeros(len(self), dtype=bool)
+        duplicate = np.zeros(len(self), dtype=bool)
+        if not len(self):
+            return dominated, duplicate
+        shortest = self.item_lengths.min()
+        rank = np.empty(len(self.stock_ids), dtype=np.int64)
+        rank[np.lexsort((np.arange(len(self.stock_ids)), self.stock_costs))] = np.arange(len(self.stock_ids))
+        row_rank = rank[self.stock_index]
+        for t in np.argsort(rank):
+            free = self.stock_lengths[t] - self.length
+            holds = (self.stock_costs[t] <= self.cost) & (free >= 0)
+            dominated |= holds & (free >= shortest)
+            duplicate |= holds & (rank[t] < row_rank)
+        return dominated, duplicate & ~dominated
+
+    def prune(self):
+        """
+        Drop the dominated and duplicate rows (see `redundant`).
+
+        Any plan using a dropped row can use its dominating row instead at no
+        higher cost and still cover the demand, so the pruned matrix keeps the
+        optimum of every covering search over the rows.
+
+        Returns:
+            The pruned matrix and a report {"before", "after", "dominated",
+            "duplicates", "by_stock": {stock_id: [before, after]}}.
+        """
+        dominated, duplicate = self.redundant()
+        keep = np.flatnonzero(~(dominated | duplicate))
+        matrix = self.subset(keep)
+        report = {
+            "before": len(self),
+            "after": len(matrix),
+            "dominated": int(dominated.sum()),
+            "duplicates": int(duplicate.sum()),
+            "by_stock": {s: [self._bounds[s][1] - self._bounds[s][0], matrix._bounds[s][1] - matrix._bounds[s][0]]
+                         for s in self.stock_ids},
+        }
+        count("patterns.pruned", report["before"] - report["after"])
+        return matrix, report
+
+    def rows(self, stock_id):
+        """Row indices of one stock type."""
+        return np.arange(*self._bounds[stock_id])
+
+    def sorted_rows(self, stock_id, *keys):
+        """Row indices of one stock type, stably sorted by ascending keys (first key primary)."""
+        rows = self.rows(stock_id)
+        if not keys:
+            return rows
+        return rows[np.lexsort(tuple(np.asarray(key)[rows] for key in reversed(keys)))]
+
+    def feasible(self, remaining, rows=None):
+        """Mask of the rows that cut no more of any item than `remaining`."""
+        counts = self.counts if rows is None else self.counts[rows]
+        return (counts <= remaining).all(axis=1)
+
+    def pattern_tuple(self, row, counts=None):
+        """Return a row as the `tuple(sorted(pattern.items()))` key used in `stock_usage`."""
+        counts = self.counts[row] if counts is None else counts
+        return tuple(sorted(zip(self.items, counts.tolist())))
+
+    def evaluate(self, x):
+        """
+        Score a plan given as the number of bars cut with each row.
+
+        Returns:
+            The total cost and the number of pieces cut of every item.
+        """
+        return (x @ self.cost).item(), x @ self.counts
+
+    def evaluate_batch(self, plans):
+        """
+        Score many plans at once (see `score_plans`).
+
+        Args:
+            plans: Plans x rows matrix of bar counts, or one row-count vector.
+
+        Returns:
+            A `PlanScores`.
+        """
+        if self._columns is None:
+            self._columns = _score_columns(self.counts, self.waste, self.cost)
+        return _score(plans, self._columns, np.issubdtype(self.cost.dtype, np.integer), self.demand)
+
+    def to_stock_usage(self, x):
+        """Convert a row-count vector into the `stock_usage` dictionary of the solvers."""
+        stock_usage = {stock_id: {} for stock_id in self.stock_ids}
+        for row in np.flatnonzero(x):
+            stock_id = self.stock_ids[self.stock_index[row]]
+            stock_usage[stock_id][self.pattern_tuple(row)] = int(x[row])
+        return stock_usage
+
+    def from_stock_usage(self, stock_usage):
+        """
+        Convert a `stock_usage` dictionary into a row-count vector.
+
+        A pattern that is not a row (a trimmed pattern, or one dropped by
+        `prune`) is replaced by the cheapest row cutting at least the same
+        pieces at no higher cost, so the plan still covers what it covered.
+        """
+        x = np.zeros(len(self), dtype=np.int64)
+        for stock_id, patterns in stock_usage.items():
+            stock_cost = self.stock_costs[self.stock_ids.index(stock_id)]
+            for pattern_tuple, bars in patterns.items():
+                pattern_dict = dict(pattern_tuple)
+                vector = np.array([pattern_dict.get(f, 0) for f in self.items], dtype=np.int64)
+                covering = np.flatnonzero((self.counts >= vector).all(axis=1) & (self.cost <= stock_cost))
+                if not len(covering):
+                    raise ValueError(f"pattern {pattern_dict} of stock {stock_id} is not covered by any row")
+                # Cheapest first, then the fewest extra pieces, then the same stock type
+                row = covering[np.lexsort((self.stock_index[covering] != self.stock_ids.index(stock_id),
+                                           self.pieces[covering], self.cost[covering]))[0]]
+                x[row] += bars
+        return x
+
+    def cover_remaining(self, remaining):
+        """
+        Pick a bar for leftover demand that no pattern fits without overcutting.
+
+        Chooses the row covering the most still-needed pieces (the cheapest one
+        on ties) and trims it to the remaining demand.
+
+        Returns:
+            The row index and the trimmed count vector.
+        """
+        covered = np.minimum(self.counts, np.maximum(remaining, 0))
+        useful = covered.sum(axis=1)
+        if len(useful) == 0 or useful.max() == 0:
+            raise ValueError("remaining demand cannot be cut from any stock type")
+        candidates = np.flatnonzero(useful == useful.max())
+        row = candidates[np.argmin(self.cost[candidates])]
+        return row, covered[row]
+
+
+def empty_stock_usage(stocks):
+    """The `stock_usage` of a plan that cuts nothing, for orders without demand."""
+    return {stock_id: {} for stock_id in stocks}
+
+
+def evaluate_stock_usage(stock_usage, stocks, order):
+    """
+    Score a `stock_usage` dictionary whose patterns need not be matrix rows.
+
+    Returns:
+        The total cost and the number of pieces cut of every item, in order.
+    """
+    items = list(order.keys())
+    bars = []
+    costs = []
+    vectors = []
+    for stock_id, patterns in stock_usage.items():
+        for pattern_tuple, count in patterns.items():
+            pattern_dict = dict(pattern_tuple)
+            bars.append(count)
+            costs.append(stocks[stock_id]["cost"])
+            vectors.append([pattern_dict.get(f, 0) for f in items])
+    if not bars:
+        return 0, np.zeros(len(items), dtype=np.int64)
+    bars = np.array(bars, dtype=np.int64)
+    return (bars @ np.array(costs)).item(), bars @ np.array(vectors, dtype=np.int64)
+
+
+def evaluate_plans(stock_usages, stocks, order):
+    """
+    Score a batch of `stock_usage` dictionaries, whose patterns need not be matrix rows.
+
+    The distinct (stock type, pattern) pairs of all plans become the columns
+    of one plans x patterns count matrix, scored by `score_plans`.
+
+    Returns:
+        A `PlanScores`.
+    """
+    items = list(order.keys())
+    columns = {}
+    entries = []
+    for plan, stock_usage in enumerate(stock_usages):
+        for stock_id, patterns in stock_usage.items():
+            for pattern_tuple, bars in patterns.items():
+                column = columns.setdefault((stock_id, pattern_tuple), len(columns))
+                entries.append((plan, column, bars))
+
+    counts = np.zeros((len(columns), len(items)), dtype=np.int64)
+    stock_length = np.zeros(len(columns), dtype=np.int64)
+    cost = np.zeros(len(columns), dtype=np.array([stocks[s]["cost"] for s in stocks]).dtype)
+    for (stock_id, pattern_tuple), column in columns.items():
+        pattern_dict = dict(pattern_tuple)
+        counts[column] = [pattern_dict.get(f, 0) for f in items]
+        stock_length[column] = stocks[stock_id]["length"]
+        cost[column] = stocks[stock_id]["cost"]
+    waste = stock_length - counts @ np.array(order_lengths(order), dtype=np.int64)
+
+    plans = np.zeros((len(stock_usages), len(columns)), dtype=np.int64)
+    if entries:
+        plan, column, bars = np.array(entries, dtype=np.int64).T
+        np.add.at(plans, (plan, column), bars)
+    demand = np.array([order[f]["demand"] for f in items], dtype=np.int64)
+    return score_plans(plans, counts, waste, cost, demand)
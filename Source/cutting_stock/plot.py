@@ -0,0 +1,68 @@
+"""
+Plotting of cutting patterns. matplotlib is only imported when a plot is drawn.
+"""
+
+DEFAULT_COLORS = {'S': 'red', 'M': 'blue', 'L': 'green', 'XL': 'orange'}
+
+
+def pattern_colors(order):
+    """Color of every order item, falling back to the matplotlib color cycle."""
+    return {f: DEFAULT_COLORS.get(f, f"C{i % 10}") for i, f in enumerate(order)}
+
+
+def plot_pattern(stock_length, pattern, order, ax, stock_label, colors=None):
+    """
+    Plot the cutting pattern on a chart.
+    """
+    import matplotlib.patches as patches
+
+    x_offset = 0
+    if colors is None:
+        colors = pattern_colors(order)
+
+    # Add cutting pieces to the chart
+    for size, count in pattern.items():
+        piece_length = order[size]['length']
+        for _ in range(count):
+            # Create a rectangle for each piece and add it to the plot
+            rect = patches.Rectangle((x_offset, 0), piece_length, 1, linewidth=1, edgecolor='black', facecolor=colors[size])
+            ax.add_patch(rect)
+            x_offset += piece_length
+
+    # Draw the remaining part of the stock bar if there is any leftover
+    if x_offset < stock_length:
+        remaining_length = stock_length - x_offset
+        # Create a rectangle for the remaining part with a dashed line style
+        rect = patches.Rectangle((x_offset, 0), remaining_length, 1, linewidth=1, edgecolor='black', facecolor='gray', linestyle='--')
+        ax.add_patch(rect)
+
+    # Set the x-axis limits and ticks
+    ax.set_xlim(0, stock_length)
+    ax.set_ylim(0, 1.5)
+    ax.set_yticks([])
+    ax.set_xticks([x for x in range(0, stock_length + 1, 10)])
+    ax.set_xticklabels([str(x) for x in range(0, stock_length + 1, 10)])
+    ax.set_title(stock_label)
+
+    # Add a legend to the chart
+    patches_list = [patches.Patch(color=color, label=label) for label, color in colors.items()]
+    ax.legend(handles=patches_list, loc='upper left')
+
+
+def plot_patterns(stocks, order, all_patterns, per_stock=3):
+    """
+    Plot the first `per_stock` patterns of every stock type, one subplot per stock type.
+
+    Returns:
+        The matplotlib figure.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, axs = plt.subplots(len(stocks), figsize=(12, 3 * len(stocks)), squeeze=False)
+    for ax, (stock_id, stock_info) in zip(axs[:, 0], stocks.items()):
+        stock_length = stock_info['length']
+        for i, pattern in enumerate(all_patterns[stock_id][:per_stock]):
+            plot_pattern(stock_length, pattern, order, ax, f"{stock_id} - Pattern {i+1}")
+
+    fig.tight_layout()
+    return fig
@@ -0,0 +1,278 @@
+"""
+Profiling of the solver phases and hot loops.
+
+Two recorders can be active, alone or together:
+
+- `MemoryProfile` records the peak and net allocations of the phases of
+  `solve` (pattern generation, search, evaluation; `profile_memory` adds the
+  reporting phase) with tracemalloc, plus the top allocation sites from
+  snapshot differences.
+- `Trace` records timers and counters from inside the solvers (patterns
+  generated and rejected, greedy rounds, SA moves accepted and rejected, a
+  sampled temperature trace, ...), exported as a JSON lines log, and
+  `profile_solve` can also dump a cProfile of the run.
+
+    plan, report = profile_memory(stocks, order, method="greedy")
+    plan, report = profile_solve(stocks, order, method="sa", log="sa.jsonl")
+
+When nothing is active, `phase` and `timer` return a shared no-op context
+manager and `count` only checks a global, so the hooks cost about nothing.
+Hot loops fetch `active_trace()` once and keep their counts in locals.
+Work done in other processes (parallel SA chains, batch workers) is not traced.
+"""
+
+import gc
+import json
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_null_phase = nullcontext()
+_active = None
+_trace = None
+
+
+def phase(name):
+    """Context manager measuring phase `name` in the active profile and trace, if any."""
+    if _active is None and _trace is None:
+        return _null_phase
+    return _recorded_phase(name)
+
+
+@contextmanager
+def _recorded_phase(name):
+    with _active.phase(name) if _active is not None else _null_phase:
+        with _trace.timer(name) if _trace is not None else _null_phase:
+            yield
+
+
+def timer(name):
+    """Context manager timing a step of a solver in the active trace, if any."""
+    if _trace is None:
+        return _null_phase
+    return _trace.timer(name)
+
+
+def count(name, n=1):
+    """Add `n` to counter `name` of the active trace, if any."""
+    if _trace is not None:
+        _trace.counters[name] += n
+
+
+def active_trace():
+    """The active `Trace`, or None."""
+    return _trace
+
+
+class MemoryProfile:
+    """
+    Peak and net allocations per phase.
+
+    Phases may nest: the peak of an outer phase includes the peaks of the
+    phases inside it. A phase entered several times accumulates its net
+    allocations and time and keeps its largest peak.
+
+    Args:
+        top: Number of allocation sites (file:line) kept per phase, from
+            tracemalloc snapshots; 0 skips the snapshots, which are slow.
+    """
+
+    def __init__(self, top=3):
+        self.top = top
+        self.phases = {}
+        self._stack = []
+        self._started = False
+
+    def __enter__(self):
+        global _active
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        self._previous, _active = _active, self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = self._previous
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+        return False
+
+    @contextmanager
+    def phase(self, name):
+        # Garbage left by earlier phases is collected first, and the snapshot is
+        # taken before the counters are read, so neither is charged to this phase
+        gc.collect()
+        snapshot = self._snapshot() if self.top else None
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Keep the enclosing phase's peak before the counter is reset for this one
+            self._stack[-1]["peak"] = max(self._stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"start": current, "peak": current}
+        self._stack.append(frame)
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            gc.collect()
+            current, peak = tracemalloc.get_traced_memory()
+            self._stack.pop()
+            frame["peak"] = max(frame["peak"], peak)
+            if self._stack:
+                self._stack[-1]["peak"] = max(self._stack[-1]["peak"], frame["peak"])
+
+            record = self.phases.setdefault(name, {"peak": 0, "net": 0, "calls": 0, "elapsed": 0.0})
+            record["peak"] = max(record["peak"], frame["peak"] - frame["start"])
+            record["net"] += current - frame["start"]
+            record["calls"] += 1
+            record["elapsed"] += elapsed
+            if snapshot is not None:
+                diff = self._snapshot().compare_to(snapshot, "lineno")
+                record["top"] = [{"site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                                  "size": stat.size_diff, "count": stat.count_diff}
+                                 for stat in diff[:self.top] if stat.size_diff > 0]
+
+    @staticmethod
+    def _snapshot():
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+
+    def report(self):
+        """Machine-readable report: the phases and the largest phase peak, in bytes."""
+        return {
+            "phases": self.phases,
+            "peak": max((record["peak"] for record in self.phases.values()), default=0),
+        }
+
+
+class Trace:
+    """
+    Timers, counters and sampled values recorded from inside the solvers.
+
+    Args:
+        sample_every: Loops that sample values over time (the SA temperature
+            trace) record one sample every `sample_every` iterations.
+    """
+
+    def __init__(self, sample_every=100):
+        self.sample_every = sample_every
+        self.timers = {}
+        self.counters = Counter()
+        self.samples = {}
+
+    def __enter__(self):
+        global _trace
+        self._previous, _trace = _trace, self
+        return self
+
+    def __exit__(self, *exc):
+        global _trace
+        _trace = self._previous
+        return False
+
+    @contextmanager
+    def timer(self, name):
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            record = self.timers.setdefault(name, {"calls": 0, "total": 0.0})
+            record["calls"] += 1
+            record["total"] += time.perf_counter() - start_time
+
+    def sample(self, name, **values):
+        """Append one sample (a dict of values) to series `name`."""
+        self.samples.setdefault(name, []).append(values)
+
+    def report(self):
+        """Machine-readable report of the timers, counters and samples."""
+        return {"timers": self.timers, "counters": dict(self.counters), "samples": self.samples}
+
+    def records(self):
+        """The report as flat records, one per timer, counter and sample."""
+        for name, record in self.timers.items():
+            yield {"kind": "timer", "name": name, **record}
+        for name, value in self.counters.items():
+            yield {"kind": "counter", "name": name, "value": value}
+        for name, series in self.samples.items():
+            for values in series:
+                yield {"kind": "sample", "name": name, **values}
+
+    def write_log(self, path):
+        """Write `records` as JSON lines."""
+        with open(path, "w") as f:
+            for record in self.records():
+                f.write(json.dumps(record) + "\n")
+
+
+def profile_memory(stocks, order, method="greedy", top=3, **options):
+    """
+    Solve an order under a `MemoryProfile`.
+
+    The shared pattern cache is cleared first, so pattern generation is
+    measured. The reporting phase serializes the plan with `plan_summary`.
+
+    Returns:
+        The `CuttingPlan` and the report of `MemoryProfile.report`, with the
+        method name and the total time added.
+    """
+    from .api import plan_summary, solve
+    from .patterns import pattern_cache
+
+    pattern_cache.clear()
+    start_time = time.perf_counter()
+    with MemoryProfile(top=top) as profile:
+        plan = solve(stocks, order, method, **options)
+        with profile.phase("reporting"):
+            json.dumps(plan_summary(plan, order))
+    report = profile.report()
+    report.update({"method": method, "elapsed": time.perf_counter() - start_time})
+    return plan, report
+
+
+def profile_solve(stocks, order, method="greedy", log=None, cprofile=None, sample_every=100, **options):
+    """
+    Solve an order under a `Trace`.
+
+    Args:
+        log: Path of a JSON lines log of the trace, written if given.
+        cprofile: Path of a cProfile dump of the run (readable with `pstats`),
+            written if given.
+        sample_every: See `Trace`.
+
+    Returns:
+        The `CuttingPlan` and the report of `Trace.report`, with the method
+        name and the total time added.
+    """
+    from .api import solve
+
+    profiler = None
+    if cprofile is not None:
+        import cProfile
+
+        profiler = cProfile.Profile()
+
+    start_time = time.perf_counter()
+    with Trace(sample_every) as trace:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            plan = solve(stocks, order, method, **options)
+        finally:
+            if profiler is not None:
+                profiler.disable()
+    elapsed = time.perf_counter() - start_time
+
+    if profiler is not None:
+        profiler.dump_stats(cprofile)
+    if log is not None:
+        trace.write_log(log)
+    report = trace.report()
+    report.update({"method": method, "elapsed": elapsed})
+    return plan, report
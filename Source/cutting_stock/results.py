@@ -0,0 +1,249 @@
+"""
+Cache of solved plans for repeated identical orders.
+
+A `ResultCache` maps a canonical hash of (stocks, order, method, solver
+options with their defaults filled in) to the `CuttingPlan` solved for it.
+It keeps the most recently used plans in memory and, optionally, every plan
+as a JSON file in a directory shared between processes:
+
+    from cutting_stock import solve
+    from cutting_stock.results import use_result_cache
+
+    use_result_cache("~/.cache/cutting_stock/results", max_bytes=64 * 2**20)
+    plan = solve(stocks, order, "sa", seed=1, cache=True)   # solved
+    plan = solve(stocks, order, "sa", seed=1, cache=True)   # cached
+
+Only reproducible solves are cached: runs with a `deadline`, whose plan
+depends on the machine load, runs of a randomized solver without a seed and
+options without a JSON form are solved every time, and plans found under a
+`time_limit` are only kept when proven optimal. Setting the CUTTING_STOCK_RESULT_CACHE environment
+variable to a directory attaches the on-disk tier to the shared cache at
+import time, which also covers pool workers.
+
+Files are written atomically, and the least recently used ones are deleted
+when the directory grows over `max_bytes` (see `storage`).
+"""
+
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+from functools import lru_cache
+
+from .api import CuttingPlan, get_solver
+from .storage import CappedDirectory, atomic_file
+
+ENVIRONMENT_VARIABLE = "CUTTING_STOCK_RESULT_CACHE"
+SUFFIX = ".plan.json"
+
+# Options that do not change the plan of a reproducible solve
+_IGNORED_OPTIONS = {"deadline", "callback"}
+
+
+@lru_cache(maxsize=None)
+def _solver_defaults(method):
+    parameters = inspect.signature(get_solver(method)).parameters
+    return {name: parameter.default for name, parameter in list(parameters.items())[2:]
+            if parameter.default is not inspect.Parameter.empty}
+
+
+def solver_options(method, options):
+    """Return `options` with the defaults of the solver of `method` filled in."""
+    full = {**_solver_defaults(method), **options}
+    return {name: value for name, value in full.items() if name not in _IGNORED_OPTIONS}
+
+
+def cacheable(method, options):
+    """Whether solving `method` with `options` may give a plan worth caching."""
+    if options.get("deadline") is not None:
+        return False
+    return solver_options(method, options).get("seed", 0) is not None
+
+
+def reproducible(plan, method, options):
+    """
+    Whether a `cacheable` request solved into `plan` would give it again.
+
+    Under a `time_limit` (branch and bound) the plan depends on the machine
+    load, unless it was proven optimal.
+    """
+    if solver_options(method, options).get("time_limit") is None:
+        return True
+    return plan.stats.get("status") == "optimal"
+
+
+def _json_default(value):
+    if hasattr(value, "item"):
+        return value.item()
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def result_key(stocks, order, method, options=None):
+    """
+    Hash of a solve request, equal for identical orders, catalogs and solver options.
+
+    The order of the items and of the stock types is part of the key (it
+    decides the plan and how patterns are listed), so they are hashed as
+    [key, value] lists; the fields of each entry and the options are not.
+    """
+    signature = json.dumps({"version": 2, "stocks": [[stock_id, stocks[stock_id]] for stock_id in stocks],
+                            "order": [[f, order[f]] for f in order], "method": method,
+                            "options": solver_options(method, options or {})},
+                           sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(signature.encode("utf-8")).hexdigest()[:32]
+
+
+def _copy_plan(plan):
+    # Plans are handed out to callers that may change their dictionaries
+    stock_usage = {stock_id: dict(patterns) for stock_id, patterns in plan.stock_usage.items()}
+    return plan._replace(stock_usage=stock_usage, cut_counts=dict(plan.cut_counts), stats=dict(plan.stats))
+
+
+def plan_to_json(plan):
+    """JSON-serializable form of a `CuttingPlan`, read back by `plan_from_json`."""
+    return {
+        "method": plan.method,
+        "stock_usage": [[stock_id, [list(pair) for pair in pattern_tuple], count]
+                        for stock_id, patterns in plan.stock_usage.items()
+                        for pattern_tuple, count in patterns.items()],
+        "stocks": list(plan.stock_usage),
+        "total_cost": plan.total_cost,
+        "cut_counts": [[f, n] for f, n in plan.cut_counts.items()],
+        "demand_met": plan.demand_met,
+        "stats": plan.stats,
+    }
+
+
+def plan_from_json(data):
+    stock_usage = {stock_id: {} for stock_id in data["stocks"]}
+    for stock_id, pattern, count in data["stock_usage"]:
+        stock_usage[stock_id][tuple(tuple(pair) for pair in pattern)] = count
+    return CuttingPlan(data["method"], stock_usage, data["total_cost"], dict(map(tuple, data["cut_counts"])),
+                       data["demand_met"], data["stats"])
+
+
+class ResultCache:
+    """
+    LRU store of solved plans, with an optional on-disk tier.
+
+    Args:
+        maxsize: Number of plans kept in memory.
+        directory: Directory of the on-disk tier, created if missing, or None.
+        max_bytes: Total size above which the least recently used files are evicted.
+    """
+
+    def __init__(self, maxsize=1024, directory=None, max_bytes=64 * 2**20):
+        self.maxsize = maxsize
+        self.disk = CappedDirectory(directory, SUFFIX, max_bytes) if directory is not None else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Return a copy of the plan stored under `key`, or None."""
+        plan = self._entries.get(key)
+        if plan is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return _copy_plan(plan)
+
+        if self.disk is not None:
+            path = self.disk.file_path(key)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    plan = plan_from_json(json.load(f))
+                self.disk.touch(path)
+            except (OSError, ValueError, KeyError, TypeError):
+                plan = None
+            if plan is not None:
+                self.disk_hits += 1
+                self._remember(key, plan)
+                return _copy_plan(plan)
+        self.misses += 1
+        return None
+
+    def put(self, key, plan):
+        """Store a plan in memory and, with a directory, on disk."""
+        self._remember(key, _copy_plan(plan))
+        if self.disk is not None:
+            try:
+                encoded = json.dumps(plan_to_json(plan), default=_json_default).encode("utf-8")
+                with atomic_file(self.disk.file_path(key), prefix=".plan-") as f:
+                    f.write(encoded)
+            except (OSError, TypeError, ValueError):
+                # A read-only or full directory, or stats that are not JSON, only lose the disk tier
+                return
+            self.disk.evict()
+
+    def _remember(self, key, plan):
+        self._entries[key] = plan
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def solve(self, stocks, order, method="greedy", **options):
+        """
+        `api.solve` through the cache: return the stored plan of an identical
+        reproducible request, or solve and store it.
+        """
+        from .api import solve
+
+        key = None
+        if cacheable(method, options):
+            try:
+                key = result_key(stocks, order, method, options)
+            except (TypeError, ValueError):
+                # Options that are not JSON (an initial plan with tuple keys, ...) have no canonical key
+                pass
+        if key is None:
+            return solve(stocks, order, method, **options)
+
+        plan = self.get(key)
+        if plan is not None:
+            if options.get("callback") is not None:
+                options["callback"](plan.stock_usage, plan.total_cost)
+            return plan
+        plan = solve(stocks, order, method, **options)
+        if reproducible(plan, method, options):
+            self.put(key, plan)
+        return plan
+
+    def clear(self):
+        """Drop all entries, in memory and on disk, and reset the counters."""
+        self._entries.clear()
+        if self.disk is not None:
+            self.disk.clear()
+        self.hits = self.disk_hits = self.misses = 0
+
+    def info(self):
+        """Return the cache statistics as a dictionary."""
+        info = {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses,
+                "size": len(self._entries), "maxsize": self.maxsize}
+        if self.disk is not None:
+            info.update(self.disk.info())
+        return info
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def use_result_cache(directory, max_bytes=64 * 2**20):
+    """
+    Attach an on-disk tier to the shared result cache, or detach it when
+    `directory` is None.
+
+    Returns:
+        The shared cache.
+    """
+    result_cache.disk = CappedDirectory(directory, SUFFIX, max_bytes) if directory is not None else None
+    return result_cache
+
+
+# Process-wide cache used by `solve(..., cache=True)`
+result_cache = ResultCache()
+if os.environ.get(ENVIRONMENT_VARIABLE):
+    use_result_cache(os.environ[ENVIRONMENT_VARIABLE])
@@ -0,0 +1,439 @@
+"""
+Local HTTP/JSON service for cut plans.
+
+    python -m cutting_stock.service --port 8080 --workers 2
+
+serves, with the standard library only:
+
+    POST /solve   {"stocks": {...}, "order": {...}, "method": "greedy",
+                   "options": {...}, "stream": false}
+    GET  /status  queue length, orders in flight and counters
+
+`/solve` answers with the `plan_summary` of the plan. With "stream": true
+the answer is chunked JSON Lines instead: a {"status": "queued"} line, one
+{"stock", "pattern", "count"} line per plan entry, and a last
+{"status": "done", ...} line with the summary without its pattern list.
+
+Orders wait in a bounded queue and are solved in a process pool, whose
+workers keep their pattern caches warm across requests. An order identical
+to one already queued or being solved (same stocks, order, method and
+options) does not take a queue slot: it waits for the same result. When the
+queue is full, new orders are refused with 503 and a Retry-After header.
+
+Requests are checked before they are queued: stock lengths and item
+lengths must be positive integers, demands non-negative integers, every item
+must fit some stock type, and only the options listed in `OPTION_RULES` may
+be set, within their bounds. Solvers that take a deadline get the server's
+default (--deadline) unless the request sets one, and never more than
+--max-deadline seconds.
+
+With a `results.ResultCache` (--cache-size, --cache-dir), repeated
+reproducible orders are answered from it without being queued.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .api import SOLVERS, get_solver, plan_summary, solve
+from .results import ResultCache, cacheable, reproducible, result_key
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+# Bounds of a solver option: its kind (bool, int, float or a tuple of allowed values), its lowest and
+# highest value, and whether it may be null
+OptionRule = namedtuple("OptionRule", ["kind", "low", "high", "nullable"], defaults=(None, None, False))
+
+_FLAG = OptionRule(bool)
+_SEED = OptionRule(int, 0, 2**63 - 1, nullable=True)
+_TEMPERATURE = OptionRule(float, 1e-6, 1e6)
+_COOLING_RATE = OptionRule(float, 0.0, 1.0)
+
+# Options a client may set, per method. "deadline" is accepted by every solver that takes one (see
+# `takes_deadline` and `PlanService`); anything else, such as the process count of parallel SA, is the
+# service's to choose.
+OPTION_RULES = {
+    "greedy": {"prune": _FLAG},
+    "modified": {"prune": _FLAG},
+    "ffd": {},
+    "sa": {"seed": _SEED, "max_iterations": OptionRule(int, 0, 10**6), "initial_temperature": _TEMPERATURE,
+           "cooling_rate": _COOLING_RATE, "prune": _FLAG},
+    "parallel_sa": {"master_seed": OptionRule(int, 0, 2**63 - 1), "chains": OptionRule(int, 1, 32),
+                    "max_iterations": OptionRule(int, 0, 10**6),
+                    "exchange_interval": OptionRule(int, 1, 10**6, nullable=True),
+                    "initial_temperature": _TEMPERATURE, "cooling_rate": _COOLING_RATE,
+                    "temperature_ratio": OptionRule(float, 1.0, 10.0), "prune": _FLAG},
+    "genetic": {"seed": _SEED, "population": OptionRule(int, 2, 2000), "generations": OptionRule(int, 0, 10**4),
+                "elite": OptionRule(int, 0, 100), "tournament": OptionRule(int, 1, 100),
+                "mutation_rate": OptionRule(float, 0.0, 1.0), "patience": OptionRule(int, 1, 10**4), "prune": _FLAG},
+    "column_generation": {"max_iterations": OptionRule(int, 1, 10**4)},
+    "branch_and_bound": {"node_limit": OptionRule(int, 1, 10**6), "time_limit": OptionRule(float, 0.0, 3600.0),
+                         "patterns": OptionRule(("auto", "all", "generated")),
+                         "pattern_limit": OptionRule(int, 1, 10**5)},
+}
+
+# Options the service sets itself: parallel SA runs its chains inside its pool worker
+SERVICE_OPTIONS = {"parallel_sa": {"workers": 1}}
+
+
+class RequestError(Exception):
+    """An invalid request, answered with `status`."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _solve_plan(stocks, order, method, options):
+    """Solve in a worker process; return the plan and the solve time in seconds."""
+    start = time.monotonic()
+    plan = solve(stocks, order, method, **options)
+    return plan, time.monotonic() - start
+
+
+def _is_integer(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def check_order(stocks, order):
+    """
+    Check the stock catalog and the order of a request.
+
+    Raises:
+        RequestError: 400 for a malformed entry or an item longer than every stock type.
+    """
+    if not isinstance(stocks, dict) or not isinstance(order, dict):
+        raise RequestError(400, "stocks and order must be JSON objects")
+    for stock_id, stock_info in stocks.items():
+        if not isinstance(stock_info, dict):
+            raise RequestError(400, f"stock {stock_id} must be an object with length and cost")
+        if not _is_integer(stock_info.get("length")) or stock_info["length"] <= 0:
+            raise RequestError(400, f"stock {stock_id} needs a positive integer length")
+        if not _is_number(stock_info.get("cost")) or stock_info["cost"] < 0:
+            raise RequestError(400, f"stock {stock_id} needs a non-negative cost")
+    longest = max((stock_info["length"] for stock_info in stocks.values()), default=0)
+    for f, info in order.items():
+        if not isinstance(info, dict):
+            raise RequestError(400, f"item {f} must be an object with length and demand")
+        if not _is_integer(info.get("length")) or info["length"] <= 0:
+            raise RequestError(400, f"item {f} needs a positive integer length")
+        if not _is_integer(info.get("demand")) or info["demand"] < 0:
+            raise RequestError(400, f"item {f} needs a non-negative integer demand")
+        if info["length"] > longest:
+            raise RequestError(400, f"item {f} is longer than every stock type")
+
+
+def takes_deadline(method):
+    """Whether the solver of `method` takes a `deadline` option."""
+    return "deadline" in inspect.signature(get_solver(method)).parameters
+
+
+def check_options(method, options):
+    """
+    Check the options of a request against `OPTION_RULES`.
+
+    Raises:
+        RequestError: 400 for an option the client may not set or a value out of bounds.
+    """
+    rules = OPTION_RULES[method]
+    for name, value in options.items():
+        if name == "deadline" and takes_deadline(method):
+            if value is not None and (not _is_number(value) or value <= 0):
+                raise RequestError(400, "option 'deadline' must be a positive number of seconds or null")
+            continue
+        rule = rules.get(name)
+        if rule is None:
+            raise RequestError(400, f"option {name!r} is not accepted for method {method!r}, "
+                                    f"expected one of {sorted(rules)}")
+        if value is None:
+            valid = rule.nullable
+        elif isinstance(rule.kind, tuple):
+            valid = value in rule.kind
+        elif rule.kind is bool:
+            valid = isinstance(value, bool)
+        else:
+            valid = (_is_integer(value) if rule.kind is int else _is_number(value)) and rule.low <= value <= rule.high
+        if not valid:
+            if isinstance(rule.kind, tuple):
+                expected = f"one of {list(rule.kind)}"
+            elif rule.kind is bool:
+                expected = "a boolean"
+            else:
+                expected = f"{'an integer' if rule.kind is int else 'a number'} in [{rule.low}, {rule.high}]"
+            raise RequestError(400, f"option {name!r} of method {method!r} must be {expected}"
+                                    + (" or null" if rule.nullable else ""))
+
+
+class PlanService:
+    """
+    Queue and process pool behind the HTTP front-end.
+
+    Args:
+        workers: Worker processes (and queue consumers), defaulting to the
+            number of CPU cores.
+        max_pending: Orders that may wait in the queue before new ones are refused.
+        max_body: Largest request body accepted, in bytes.
+        cache: A `ResultCache` answering repeated orders, or None.
+        deadline: Seconds given to solvers that take a deadline when the request sets none.
+        max_deadline: Longest deadline a request may set; longer ones are cut to it.
+    """
+
+    def __init__(self, workers=None, max_pending=64, max_body=2**20, cache=None, deadline=10.0, max_deadline=60.0):
+        self.workers = workers or os.cpu_count()
+        self.max_pending = max_pending
+        self.max_body = max_body
+        self.cache = cache
+        self.deadline = deadline
+        self.max_deadline = max_deadline
+        self.counters = {"requests": 0, "solved": 0, "cached": 0, "coalesced": 0, "rejected": 0, "failed": 0}
+        self._queue = None
+        self._inflight = {}
+        self._executor = None
+        self._consumers = []
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """Start the pool, the queue consumers and the HTTP server; return the server."""
+        self._queue = asyncio.Queue(self.max_pending)
+        # Forked workers would inherit the listening socket and the client connections open when
+        # they start, keeping those connections alive after `handle` closes them
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        self._executor = ProcessPoolExecutor(self.workers, mp_context=context)
+        self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        self._server = await asyncio.start_server(self.handle, host, port)
+        return self._server
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+    def status(self):
+        status = {"queued": self._queue.qsize() if self._queue else 0, "in_flight": len(self._inflight),
+                  "workers": self.workers, "max_pending": self.max_pending, **self.counters}
+        if self.cache is not None:
+            status["cache"] = self.cache.info()
+        return status
+
+    def submit(self, stocks, order, method="greedy", options=None):
+        """
+        Queue an order, or join the identical one already queued or running,
+        unless the result cache holds its plan.
+
+        Returns:
+            A future resolving to the `CuttingPlan`.
+
+        Raises:
+            RequestError: 400 for an unknown method or an invalid order or
+                option (see `check_order` and `check_options`), 503 when the
+                queue is full.
+        """
+        if method not in SOLVERS:
+            raise RequestError(400, f"unknown method {method!r}, expected one of {sorted(SOLVERS)}")
+        options = options or {}
+        check_order(stocks, order)
+        check_options(method, options)
+        key = result_key(stocks, order, method, options)
+        store = self.cache is not None and cacheable(method, options)
+        future = asyncio.get_running_loop().create_future()
+        if store:
+            plan = self.cache.get(key)
+            if plan is not None:
+                self.counters["cached"] += 1
+                future.set_result(plan)
+                return future
+        if key in self._inflight:
+            self.counters["coalesced"] += 1
+            return self._inflight[key]
+
+        options = self.solver_options(method, options)
+        try:
+            self._queue.put_nowait((key, (stocks, order, method, options), store, future))
+        except asyncio.QueueFull:
+            self.counters["rejected"] += 1
+            raise RequestError(503, "too many pending orders, retry later") from None
+        self._inflight[key] = future
+        return future
+
+    def solver_options(self, method, options):
+        """The options a checked request is solved with: the service's own and a bounded deadline."""
+        options = {**options, **SERVICE_OPTIONS.get(method, {})}
+        if takes_deadline(method):
+            deadline = options.get("deadline")
+            options["deadline"] = min(self.deadline if deadline is None else deadline, self.max_deadline)
+        return options
+
+    async def _consume(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            key, args, store, future = await self._queue.get()
+            try:
+                plan, elapsed = await loop.run_in_executor(self._executor, _solve_plan, *args)
+            except Exception as error:
+                self.counters["failed"] += 1
+                if not future.done():
+                    future.set_exception(error)
+            else:
+                self.counters["solved"] += 1
+                # A solve that ran into the service's deadline may have been cut short
+                deadline = args[3].get("deadline")
+                if store and (deadline is None or elapsed < deadline) and reproducible(plan, *args[2:]):
+                    self.cache.put(key, plan)
+                if not future.done():
+                    future.set_result(plan)
+            finally:
+                del self._inflight[key]
+                self._queue.task_done()
+
+    async def handle(self, reader, writer):
+        """Serve one HTTP request on a connection, then close it."""
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                self.counters["requests"] += 1
+                if path == "/status":
+                    if method != "GET":
+                        raise RequestError(405, "use GET")
+                    await self._respond(writer, 200, self.status())
+                elif path == "/solve":
+                    if method != "POST":
+                        raise RequestError(405, "use POST")
+                    await self._solve(writer, body)
+                else:
+                    raise RequestError(404, f"no such path {path}")
+            except RequestError as error:
+                headers = {"Retry-After": "1"} if error.status == 503 else {}
+                await self._respond(writer, error.status, {"error": str(error)}, headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _solve(self, writer, body):
+        try:
+            request = json.loads(body or b"{}")
+            stocks, order = request["stocks"], request["order"]
+        except (ValueError, KeyError, TypeError) as error:
+            raise RequestError(400, f"expected a JSON object with stocks and order: {error}") from None
+        method, options = request.get("method", "greedy"), request.get("options")
+        if not isinstance(method, str):
+            raise RequestError(400, "method must be a string")
+        if options is not None and not isinstance(options, dict):
+            raise RequestError(400, "options must be a JSON object")
+        future = self.submit(stocks, order, method, options)
+
+        if not request.get("stream"):
+            try:
+                plan = await asyncio.shield(future)
+            except Exception as error:
+                raise RequestError(500, f"{type(error).__name__}: {error}") from None
+            await self._respond(writer, 200, plan_summary(plan, order))
+            return
+
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\n"
+                     b"Transfer-Encoding: chunked\r\nConnection: close\r\n\r\n")
+        await self._chunk(writer, {"status": "queued", "queued": self._queue.qsize()})
+        try:
+            summary = plan_summary(await asyncio.shield(future), order)
+        except Exception as error:
+            await self._chunk(writer, {"status": "failed", "error": f"{type(error).__name__}: {error}"})
+        else:
+            for pattern in summary["patterns"]:
+                await self._chunk(writer, pattern)
+            await self._chunk(writer, {"status": "done", **{k: v for k, v in summary.items() if k != "patterns"}})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "malformed request line") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, "invalid Content-Length")
+        if length > self.max_body:
+            raise RequestError(413, f"request body over {self.max_body} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], body
+
+    async def _respond(self, writer, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}", "Content-Type: application/json",
+                f"Content-Length: {len(body)}", "Connection: close"]
+        head += [f"{name}: {value}" for name, value in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    @staticmethod
+    async def _chunk(writer, record):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        writer.write(f"{len(line):x}\r\n".encode("latin-1") + line + b"\r\n")
+        await writer.drain()
+
+
+async def serve(host="127.0.0.1", port=8080, workers=None, max_pending=64, cache=None, deadline=10.0,
+                max_deadline=60.0):
+    """Run a `PlanService` until cancelled."""
+    service = PlanService(workers, max_pending, cache=cache, deadline=deadline, max_deadline=max_deadline)
+    server = await service.start(host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve cut plans over HTTP/JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: CPU cores)")
+    parser.add_argument("--max-pending", type=int, default=64, help="queued orders before refusing new ones")
+    parser.add_argument("--cache-size", type=int, default=1024, help="plans kept in memory (0: no result cache)")
+    parser.add_argument("--cache-dir", default=None, help="directory of the on-disk result cache")
+    parser.add_argument("--deadline", type=float, default=10.0, help="seconds per solve when a request sets none")
+    parser.add_argument("--max-deadline", type=float, default=60.0, help="longest deadline a request may set")
+    args = parser.parse_args(argv)
+    cache = ResultCache(args.cache_size, args.cache_dir) if args.cache_size > 0 else None
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.max_pending, cache, args.deadline,
+                          args.max_deadline))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
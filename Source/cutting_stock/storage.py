@@ -0,0 +1,96 @@
+"""
+Files shared between processes: atomic writes and size-capped directories.
+
+`atomic_file` writes under a temporary name and renames the file into place,
+so readers in other processes never see partial files. A `CappedDirectory`
+deletes its least recently used files (by modification time, which readers
+refresh with `touch`) when it grows over `max_bytes`. The pattern library
+and the on-disk result cache are built on both.
+"""
+
+import os
+import tempfile
+from contextlib import contextmanager
+
+
+@contextmanager
+def atomic_file(path, prefix=".tmp-"):
+    """Open a binary file that replaces `path` only once it is completely written."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=prefix, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        # mkstemp creates the file private to the owner; use the usual umask mode instead
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class CappedDirectory:
+    """
+    Directory of files ending in `suffix`, trimmed to `max_bytes` by `evict`.
+
+    Args:
+        directory: Directory path, created if missing.
+        suffix: File name suffix of the managed files; other files are left alone.
+        max_bytes: Total size above which the least recently used files are evicted.
+    """
+
+    def __init__(self, directory, suffix, max_bytes):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.suffix = suffix
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def file_path(self, name):
+        return os.path.join(self.directory, name + self.suffix)
+
+    @staticmethod
+    def touch(path):
+        """Mark a file as just used."""
+        os.utime(path)
+
+    def files(self):
+        """(mtime, size, path) of every managed file, oldest first."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self):
+        """Delete the least recently used files until the directory fits in `max_bytes`."""
+        entries = self.files()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, path in self.files():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def info(self):
+        entries = self.files()
+        return {"directory": self.directory, "files": len(entries), "bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes}
@@ -0,0 +1,141 @@
+"""
+Streaming cut plans.
+
+`solve_stream` yields a plan as `PlanEntry(stock, pattern, count)` records,
+and the sinks write them one line at a time as JSON Lines or CSV, so a plan
+can be consumed (by a saw line, another process, ...) while it is produced.
+FFD plans are streamed straight from the packing; the other solvers build
+their plan first and then stream it.
+
+    python -m cutting_stock.stream problem.json --method ffd --format csv
+
+where problem.json holds {"stocks": {...}, "order": {...}} in the format of
+the solver scripts.
+"""
+
+import argparse
+import csv
+import json
+import sys
+from collections import namedtuple
+
+PlanEntry = namedtuple("PlanEntry", ["stock", "pattern", "count"])
+PlanEntry.__doc__ = """
+`count` bars of stock type `stock` cut with `pattern`, a tuple of piece
+counts in the order of the order items.
+"""
+
+
+def plan_entries(stock_usage, order):
+    """Yield the `PlanEntry` records of a stock usage dictionary."""
+    for stock_id, usage in stock_usage.items():
+        for pattern_tuple, count in usage.items():
+            pattern_dict = dict(pattern_tuple)
+            yield PlanEntry(stock_id, tuple(pattern_dict.get(f, 0) for f in order), count)
+
+
+def solve_stream(stocks, order, method="ffd", **options):
+    """
+    Solve an order and yield its plan as `PlanEntry` records.
+
+    With method "ffd" the entries are yielded while the packing runs, and
+    only the open bars are held in memory; the packing takes no options.
+    Other methods go through `solve`.
+    """
+    if method == "ffd":
+        from .ffd import iter_ffd_cutting
+
+        if options:
+            raise TypeError(f"method 'ffd' streams the packing and takes no options, got {sorted(options)}")
+        for stock_id, counts, n in iter_ffd_cutting(order, stocks):
+            yield PlanEntry(stock_id, counts, n)
+        return
+
+    from .api import solve
+
+    plan = solve(stocks, order, method, **options)
+    yield from plan_entries(plan.stock_usage, order)
+
+
+def _open(target):
+    """Return (file, should_close) for a path, "-" (stdout) or an open file."""
+    if target == "-":
+        return sys.stdout, False
+    if isinstance(target, str):
+        return open(target, "w", newline=""), True
+    return target, False
+
+
+def write_jsonl(entries, target, order, flush=True):
+    """
+    Write plan entries as JSON Lines, {"stock", "pattern", "count"} per line.
+
+    Args:
+        entries: Iterable of `PlanEntry`.
+        target: File path, "-" for stdout, or an open text file.
+        order: The order, whose item labels are written once as a header line.
+        flush: Flush after every line, so readers see each entry immediately.
+
+    Returns:
+        The number of entries written.
+    """
+    f, close = _open(target)
+    written = 0
+    try:
+        f.write(json.dumps({"items": list(order)}) + "\n")
+        for entry in entries:
+            f.write(json.dumps({"stock": entry.stock, "pattern": list(entry.pattern), "count": entry.count}) + "\n")
+            written += 1
+            if flush:
+                f.flush()
+    finally:
+        if close:
+            f.close()
+    return written
+
+
+def write_csv(entries, target, order, flush=True):
+    """
+    Write plan entries as CSV, with one column per order item.
+
+    Args: see `write_jsonl`.
+
+    Returns:
+        The number of entries written.
+    """
+    f, close = _open(target)
+    written = 0
+    try:
+        writer = csv.writer(f)
+        writer.writerow(["stock", *order, "count"])
+        for entry in entries:
+            writer.writerow([entry.stock, *entry.pattern, entry.count])
+            written += 1
+            if flush:
+                f.flush()
+    finally:
+        if close:
+            f.close()
+    return written
+
+
+SINKS = {"jsonl": write_jsonl, "csv": write_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve an order and stream its cut plan.")
+    parser.add_argument("problem", help='JSON file with "stocks" and "order"')
+    parser.add_argument("--method", default="ffd")
+    parser.add_argument("--format", choices=list(SINKS), default="jsonl")
+    parser.add_argument("--output", default="-", help="output file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    with open(args.problem) as f:
+        problem = json.load(f)
+    stocks, order = problem["stocks"], problem["order"]
+    SINKS[args.format](solve_stream(stocks, order, args.method), args.output, order)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+
+import pytest
+
+SOURCE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SOURCE)
+
+
+@pytest.fixture
+def stocks():
+    """Stock catalog of the solver scripts."""
+    return {
+        "Type 1": {"length": 80, "cost": 90},
+        "Type 2": {"length": 100, "cost": 110},
+        "Type 3": {"length": 120, "cost": 130},
+    }
+
+
+@pytest.fixture
+def order():
+    """Order of the solver scripts."""
+    return {
+        "S": {"length": 15, "demand": 20},
+        "M": {"length": 30, "demand": 10},
+        "L": {"length": 34, "demand": 15},
+        "XL": {"length": 47, "demand": 5},
+    }
+
+
+def random_instance(seed, items=4):
+    """A small random (stocks, order) pair."""
+    rng = random.Random(seed)
+    stocks = {f"Type {k + 1}": {"length": length, "cost": length + rng.randint(0, 20)}
+              for k, length in enumerate(sorted(rng.sample(range(60, 130), 3)))}
+    lengths = rng.sample(range(8, 45), items)
+    order = {f"I{i}": {"length": length, "demand": rng.randint(1, 25)} for i, length in enumerate(lengths)}
+    return stocks, order
+
+
+def check_stock_usage(stock_usage, total_cost, stocks, order):
+    """Check that every pattern fits its bar, the demand is met and the cost adds up; return the cut counts."""
+    cut = dict.fromkeys(order, 0)
+    cost = 0
+    for stock_id, patterns in stock_usage.items():
+        for pattern_tuple, count in patterns.items():
+            pattern = dict(pattern_tuple)
+            assert count > 0
+            assert sum(order[f]["length"] * n for f, n in pattern.items()) <= stocks[stock_id]["length"]
+            for f, n in pattern.items():
+                cut[f] += n * count
+            cost += stocks[stock_id]["cost"] * count
+    assert all(cut[f] >= order[f]["demand"] for f in order)
+    assert total_cost == cost
+    return cut
@@ -0,0 +1,67 @@
+"""Simulated annealing moves, incremental scoring and plans."""
+
+import random
+
+import numpy as np
+import pytest
+
+from conftest import check_stock_usage, random_instance
+from cutting_stock.patterns import PatternMatrix
+from cutting_stock.annealing import (AnnealingState, create_initial_solution, move_rows, parallel_simulated_annealing,
+                                     propose_move, simulated_annealing)
+
+
+def test_incremental_state_matches_full_evaluation(stocks, order):
+    rng = random.Random(5)
+    matrix = PatternMatrix(stocks, order)
+    state = AnnealingState(matrix, create_initial_solution(matrix, rng))
+    candidate_rows = move_rows(matrix)
+    for _ in range(500):
+        move = propose_move(state, rng, candidate_rows)
+        if move is None:
+            continue
+        positions, rows = move
+        removed = [state.bars[position] for position in positions]
+        delta_cost = matrix.cost[list(rows)].sum() - matrix.cost[removed].sum()
+        delta_coverage = matrix.counts[list(rows)].sum(axis=0) - matrix.counts[removed].sum(axis=0)
+        state.replace(positions, rows, delta_cost, delta_coverage, state.shortage_after(delta_coverage))
+
+        cost, coverage = matrix.evaluate(state.solution())
+        assert state.cost == cost
+        assert state.coverage.tolist() == coverage.tolist()
+        assert state.shortage == int(np.maximum(matrix.demand - coverage, 0).sum())
+
+
+def test_initial_solution_meets_the_demand(stocks, order):
+    matrix = PatternMatrix(stocks, order)
+    solution = create_initial_solution(matrix, random.Random(0))
+    assert (matrix.evaluate(solution)[1] >= matrix.demand).all()
+
+
+@pytest.mark.parametrize("seed", [None, 3, 7])
+def test_plan_meets_the_demand(seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    stock_usage, total_cost, demand_met = simulated_annealing(order, stocks, seed=1)
+    assert demand_met
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+
+
+def test_same_seed_same_plan(stocks, order):
+    assert simulated_annealing(order, stocks, seed=4) == simulated_annealing(order, stocks, seed=4)
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    assert simulated_annealing(order, stocks, seed=1) == ({stock_id: {} for stock_id in stocks}, 0, True)
+
+
+@pytest.mark.parametrize("solver", [simulated_annealing, parallel_simulated_annealing], ids=["sa", "parallel_sa"])
+def test_item_longer_than_every_stock(solver, stocks, order):
+    order = {**order, "XXL": {"length": 150, "demand": 1}}
+    with pytest.raises(ValueError, match="item XXL is longer than every stock type"):
+        solver(order, stocks, max_iterations=10)
+    # Without demand the item does not matter
+    order["XXL"]["demand"] = 0
+    assert solver(order, stocks, max_iterations=10)[2]
@@ -0,0 +1,75 @@
+"""Deadlines and improving incumbents."""
+
+import time
+
+import pytest
+
+from conftest import random_instance
+from cutting_stock import SOLVERS, solve
+from cutting_stock.anytime import iter_solve, solve_anytime
+from cutting_stock.column_generation import column_generation, farley_bound
+
+# Searches that only stop at the deadline
+UNBOUNDED = {
+    "sa": {"max_iterations": None, "seed": 1},
+    "parallel_sa": {"max_iterations": None, "chains": 2, "workers": 1},
+    "genetic": {"generations": None, "patience": None, "seed": 0},
+}
+
+
+@pytest.mark.parametrize("method", sorted(UNBOUNDED))
+def test_iter_solve_respects_the_deadline(method):
+    stocks, order = random_instance(2, items=10)
+    start = time.monotonic()
+    incumbents = list(iter_solve(stocks, order, method, deadline=0.5, **UNBOUNDED[method]))
+    elapsed = time.monotonic() - start
+    assert 0.5 <= elapsed < 1.5
+    assert incumbents[-1].final and not any(incumbent.final for incumbent in incumbents[:-1])
+    costs = [incumbent.total_cost for incumbent in incumbents[:-1]]
+    assert costs == sorted(set(costs), reverse=True)
+    assert all(incumbent.elapsed <= elapsed for incumbent in incumbents)
+    assert incumbents[-1].total_cost <= min(costs, default=float("inf"))
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+def test_final_incumbent_is_the_returned_plan(method, stocks, order):
+    incumbents = []
+    plan = solve_anytime(stocks, order, method, deadline=2.0, callback=incumbents.append,
+                         **{"sa": {"seed": 1}, "genetic": {"seed": 0, "generations": 30},
+                            "parallel_sa": {"chains": 2, "workers": 1}}.get(method, {}))
+    final = incumbents[-1]
+    assert final.final and final.method == method
+    assert (final.stock_usage, final.total_cost) == (plan.stock_usage, plan.total_cost)
+    assert plan.demand_met
+
+
+def test_tiny_deadline_still_returns_a_plan():
+    stocks, order = random_instance(2, items=10)
+    order = {f: {**info, "demand": info["demand"] * 1000} for f, info in order.items()}
+    for method in ("greedy", "column_generation", "branch_and_bound"):
+        plan = solve(stocks, order, method, deadline=0.0)
+        assert plan.demand_met
+
+
+def test_unbounded_search_needs_a_deadline(stocks, order):
+    for method, options in UNBOUNDED.items():
+        with pytest.raises(ValueError, match="needs a deadline"):
+            solve(stocks, order, method, **options)
+
+
+def test_farley_bound_is_below_the_lp_value(stocks, order):
+    _, _, value, duals = column_generation(order, stocks, max_iterations=2)
+    _, _, optimum, final_duals = column_generation(order, stocks)
+    assert farley_bound(order, stocks, value, duals) <= optimum + 1e-6
+    assert farley_bound(order, stocks, optimum, final_duals) == pytest.approx(optimum)
+
+
+def test_iter_solve_raises_solver_errors(stocks, order):
+    with pytest.raises(ValueError, match="unknown method"):
+        list(iter_solve(stocks, order, "simplex"))
+
+
+def test_order_without_demand_reports_only_the_final_plan(stocks, order):
+    order = {f: {**info, "demand": 0} for f, info in order.items()}
+    incumbents = list(iter_solve(stocks, order, "sa", deadline=1.0, seed=1))
+    assert len(incumbents) == 1 and incumbents[0].final and incumbents[0].total_cost == 0
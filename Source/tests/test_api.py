@@ -0,0 +1,58 @@
+"""The `solve` entry point and the package's lazy imports."""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import SOURCE, check_stock_usage, random_instance
+from cutting_stock import SOLVERS, CuttingPlan, get_solver, solve
+
+# Small budgets, so every solver runs in well under a second
+OPTIONS = {
+    "sa": {"seed": 1},
+    "parallel_sa": {"chains": 2, "workers": 1, "max_iterations": 2000},
+    "genetic": {"seed": 0, "generations": 30},
+    "branch_and_bound": {"time_limit": 5.0},
+}
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+@pytest.mark.parametrize("seed", [None, 3, 7])
+def test_every_solver_meets_the_demand(method, seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    plan = solve(stocks, order, method, **OPTIONS.get(method, {}))
+    assert isinstance(plan, CuttingPlan) and plan.method == method
+    assert plan.demand_met
+    assert plan.cut_counts == check_stock_usage(plan.stock_usage, plan.total_cost, stocks, order)
+
+
+def test_stats(stocks, order):
+    assert solve(stocks, order, "column_generation").stats["lower_bound"] <= 1500
+    assert solve(stocks, order, "branch_and_bound").stats["status"] == "optimal"
+    assert solve(stocks, order).stats == {}
+
+
+@pytest.mark.parametrize("method", sorted(SOLVERS))
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(method, empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    plan = solve(stocks, order, method, **OPTIONS.get(method, {}))
+    assert plan.total_cost == 0
+    assert plan.demand_met
+    assert not any(plan.stock_usage.values())
+
+
+def test_unknown_method(stocks, order):
+    with pytest.raises(ValueError, match="unknown method"):
+        get_solver("simplex")
+    with pytest.raises(ValueError, match="unknown method"):
+        solve(stocks, order, "simplex")
+
+
+def test_import_is_lazy():
+    code = ("import sys, cutting_stock; "
+            "print(sorted(m for m in ('numpy', 'scipy', 'matplotlib', 'cutting_stock.greedy') if m in sys.modules))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=SOURCE, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,52 @@
+"""Batch solving over a process pool."""
+
+import pytest
+
+from conftest import random_instance
+from cutting_stock import pattern_cache, solve, solve_batch
+
+
+def batch_orders(n):
+    return [random_instance(seed)[1] for seed in range(n)]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+@pytest.mark.parametrize("method", ["greedy", "ffd", "column_generation"])
+def test_batch_matches_single_solves(method, workers, stocks):
+    orders = batch_orders(6)
+    results = dict(solve_batch(orders, stocks, method, workers=workers, max_pending=2))
+    assert sorted(results) == list(range(len(orders)))
+    for index, order in enumerate(orders):
+        assert results[index] == solve(stocks, order, method)
+
+
+def test_pattern_tables_are_preloaded(stocks):
+    orders = batch_orders(4)
+    pattern_cache.clear()
+    list(solve_batch(orders, stocks, "greedy", workers=1))
+    # Every table was computed once for the batch, so the solvers only hit the cache
+    assert pattern_cache.misses == len(orders) * len(stocks)
+    assert pattern_cache.hits >= len(orders) * len(stocks)
+
+
+def test_unknown_method(stocks, order):
+    with pytest.raises(ValueError, match="unknown method"):
+        list(solve_batch([order], stocks, "simplex"))
+
+
+@pytest.mark.parametrize("abandoned", [False, True], ids=["finished", "abandoned"])
+def test_in_process_batch_restores_the_cache_size(abandoned, stocks):
+    maxsize = pattern_cache.maxsize
+    # The batch needs more tables than the cache holds, so the workers enlarge it
+    pattern_cache.maxsize = 4
+    try:
+        results = solve_batch(batch_orders(3), stocks, "greedy", workers=1)
+        next(results)
+        if abandoned:
+            results.close()
+        else:
+            list(results)
+        assert pattern_cache.maxsize == 4
+        assert len(pattern_cache) <= 4
+    finally:
+        pattern_cache.maxsize = maxsize
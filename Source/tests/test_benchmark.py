@@ -0,0 +1,40 @@
+"""Benchmark records and the regression check."""
+
+from cutting_stock.benchmark import find_regressions, load_baseline, run_benchmark, write_json
+
+
+def record(method="greedy", status="ok", cost=100, median=0.010, instance="u20"):
+    return {"family": "uniform", "instance": instance, "method": method,
+            "status": status, "cost": cost, "median": median}
+
+
+def test_unchanged_run_has_no_regressions():
+    baseline = [record(), record("ffd", cost=90)]
+    assert find_regressions(baseline, baseline) == []
+
+
+def test_regression_kinds():
+    baseline = [record(), record("ffd"), record("sa"), record("bnb")]
+    results = [record(cost=110), record("ffd", median=0.020), record("sa", status="infeasible"),
+               record("bnb", median=0.011)]
+    regressions = find_regressions(results, baseline)
+    assert [(r["method"], r["kind"]) for r in regressions] == [("greedy", "cost"), ("ffd", "time"), ("sa", "status")]
+    assert regressions[1]["baseline"] == 0.010 and regressions[1]["current"] == 0.020
+
+
+def test_small_slowdowns_and_unmatched_records_are_ignored():
+    baseline = [record(median=0.0001), record("ffd", status="skipped")]
+    results = [record(median=0.0015), record("ffd", median=5.0), record("sa", instance="u60", median=5.0)]
+    assert find_regressions(results, baseline) == []
+    # A cheaper plan is never a regression
+    assert find_regressions([record(cost=50)], [record()]) == []
+
+
+def test_run_round_trips_as_baseline(tmp_path):
+    results = run_benchmark(families=["demand"], methods=["greedy", "ffd"], warmup=0, repeat=1)
+    assert [(r["instance"], r["method"]) for r in results[:2]] == [("x1", "greedy"), ("x1", "ffd")]
+    assert all(r["status"] == "ok" and r["repeat"] == 1 for r in results)
+    path = tmp_path / "baseline.json"
+    write_json(results, path)
+    assert load_baseline(path) == results
+    assert find_regressions(results, load_baseline(path)) == []
@@ -0,0 +1,65 @@
+"""Branch-and-bound optimality, bounds and limits."""
+
+from itertools import product
+
+import pytest
+
+from cutting_stock.bnb import branch_and_bound
+from conftest import check_stock_usage, random_instance
+from cutting_stock.patterns import PatternMatrix
+
+
+def brute_force_optimum(order, stocks, max_bars=4):
+    """Cheapest plan of at most `max_bars` bars, by trying every multiset of patterns."""
+    matrix = PatternMatrix(stocks, order)
+    best = None
+    for bars in range(1, max_bars + 1):
+        for rows in product(range(len(matrix)), repeat=bars):
+            if list(rows) != sorted(rows):
+                continue
+            if (matrix.counts[list(rows)].sum(axis=0) >= matrix.demand).all():
+                cost = matrix.cost[list(rows)].sum().item()
+                best = cost if best is None else min(best, cost)
+    return best
+
+
+def test_bundled_instance_is_optimal(stocks, order):
+    stock_usage, total_cost, stats = branch_and_bound(order, stocks)
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+    assert total_cost == 1500
+    assert stats["status"] == "optimal"
+    assert stats["gap"] == 0.0 and stats["lower_bound"] == 1500
+
+
+def test_small_instance_matches_brute_force(stocks):
+    order = {"A": {"length": 45, "demand": 3}, "B": {"length": 28, "demand": 2}, "C": {"length": 17, "demand": 4}}
+    _, total_cost, stats = branch_and_bound(order, stocks)
+    assert stats["status"] == "optimal"
+    assert total_cost == brute_force_optimum(order, stocks)
+
+
+@pytest.mark.parametrize("patterns", ["all", "generated"])
+@pytest.mark.parametrize("seed", [3, 7])
+def test_bounds_hold(patterns, seed):
+    stocks, order = random_instance(seed)
+    stock_usage, total_cost, stats = branch_and_bound(order, stocks, patterns=patterns, time_limit=5.0)
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+    assert stats["patterns"] == patterns
+    assert stats["lower_bound"] <= total_cost
+    assert stats["status"] in ("optimal", "exhausted", "limit")
+
+
+def test_node_limit_stops_the_search():
+    stocks, order = random_instance(11, items=8)
+    stock_usage, total_cost, stats = branch_and_bound(order, stocks, node_limit=1, patterns="generated")
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+    assert stats["nodes"] <= 1
+    assert stats["status"] in ("optimal", "limit")
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    stock_usage, total_cost, stats = branch_and_bound(order, stocks)
+    assert (stock_usage, total_cost) == ({stock_id: {} for stock_id in stocks}, 0)
+    assert stats["status"] == "optimal" and stats["nodes"] == 0
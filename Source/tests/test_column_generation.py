@@ -0,0 +1,44 @@
+"""Column generation pricing, bounds and rounding."""
+
+from itertools import product
+
+import pytest
+
+from conftest import check_stock_usage, random_instance
+from cutting_stock.column_generation import column_generation_cutting, knapsack_pattern
+
+
+@pytest.mark.parametrize("capacity", [37, 80, 121])
+def test_knapsack_pattern_matches_brute_force(capacity):
+    lengths = [15, 30, 34, 47]
+    values = [0.2, 0.45, 0.5, 0.8]
+    bounds = [5, 2, 3, 1]
+    best = max(sum(v * n for v, n in zip(values, counts))
+               for counts in product(*(range(b + 1) for b in bounds))
+               if sum(l * n for l, n in zip(lengths, counts)) <= capacity)
+    value, pattern = knapsack_pattern(capacity, lengths, values, bounds)
+    assert value == pytest.approx(best)
+    assert sum(l * n for l, n in zip(lengths, pattern)) <= capacity
+    assert all(n <= b for n, b in zip(pattern, bounds))
+    assert sum(v * n for v, n in zip(values, pattern)) == pytest.approx(value)
+
+
+@pytest.mark.parametrize("seed", [None, 3, 7])
+def test_rounded_plan_is_feasible_and_bounded(seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    stock_usage, total_cost, lower_bound = column_generation_cutting(order, stocks)
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+    assert lower_bound <= total_cost + 1e-6
+
+
+def test_bundled_instance(stocks, order):
+    _, total_cost, lower_bound = column_generation_cutting(order, stocks)
+    assert total_cost == 1500
+    assert lower_bound == pytest.approx(1489.5833, abs=1e-3)
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    assert column_generation_cutting(order, stocks) == ({stock_id: {} for stock_id in stocks}, 0, 0.0)
@@ -0,0 +1,57 @@
+"""Batch scoring of cut plans."""
+
+import numpy as np
+
+from conftest import random_instance
+from cutting_stock import solve
+from cutting_stock.patterns import PatternMatrix, evaluate_plans, evaluate_stock_usage
+
+
+def single_scores(stock_usage, stocks, order):
+    """Cost, coverage, shortage, overproduction and waste of one plan, scored on its own."""
+    cost, cut = evaluate_stock_usage(stock_usage, stocks, order)
+    demand = np.array([order[f]["demand"] for f in order])
+    waste = sum((stocks[stock_id]["length"] - sum(order[f]["length"] * n for f, n in pattern_tuple)) * bars
+                for stock_id, patterns in stock_usage.items() for pattern_tuple, bars in patterns.items())
+    return cost, cut.tolist(), np.maximum(demand - cut, 0).tolist(), np.maximum(cut - demand, 0).tolist(), waste
+
+
+def test_evaluate_plans_matches_per_plan_evaluation(stocks, order):
+    plans = [solve(stocks, order, method, **options).stock_usage
+             for method, options in [("greedy", {}), ("ffd", {}), ("sa", {"seed": 1}), ("column_generation", {})]]
+    # A short plan and an empty one
+    plans.append({"Type 1": {(("L", 0), ("M", 0), ("S", 5), ("XL", 0)): 2}})
+    plans.append({})
+    scores = evaluate_plans(plans, stocks, order)
+    for k, stock_usage in enumerate(plans):
+        cost, coverage, shortage, overproduction, waste = single_scores(stock_usage, stocks, order)
+        assert scores.cost[k] == cost
+        assert scores.coverage[k].tolist() == coverage
+        assert scores.shortage[k].tolist() == shortage
+        assert scores.overproduction[k].tolist() == overproduction
+        assert scores.waste[k] == waste
+        assert scores.demand_met[k] == (not any(shortage))
+    assert scores.demand_met.tolist() == [True] * 4 + [False] * 2
+    assert scores.cost.dtype == np.int64
+
+
+def test_matrix_batch_matches_evaluate():
+    stocks, order = random_instance(5)
+    matrix = PatternMatrix(stocks, order)
+    rng = np.random.default_rng(0)
+    plans = rng.integers(0, 3, size=(20, len(matrix)))
+    scores = matrix.evaluate_batch(plans)
+    for plan, cost, coverage in zip(plans, scores.cost, scores.coverage):
+        expected_cost, expected_coverage = matrix.evaluate(plan)
+        assert cost == expected_cost
+        assert coverage.tolist() == expected_coverage.tolist()
+    assert scores.waste.tolist() == (plans @ matrix.waste).tolist()
+    # A single plan scores as a batch of one
+    assert matrix.evaluate_batch(plans[0]).cost.tolist() == [scores.cost[0]]
+
+
+def test_float_costs(stocks, order):
+    stocks = {stock_id: {**info, "cost": info["cost"] + 0.25} for stock_id, info in stocks.items()}
+    plan = solve(stocks, order, "ffd").stock_usage
+    scores = evaluate_plans([plan, plan], stocks, order)
+    assert scores.cost.tolist() == [evaluate_stock_usage(plan, stocks, order)[0]] * 2
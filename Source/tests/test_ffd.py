@@ -0,0 +1,73 @@
+"""Bulk decreasing-order packing."""
+
+import time
+from collections import Counter
+
+import pytest
+
+from conftest import check_stock_usage, random_instance
+from cutting_stock.ffd import OpenBars, ffd_cutting
+
+
+def piecewise_best_fit(order, stock_id, stock_length):
+    """
+    Best-fit decreasing one piece at a time on a single stock type: each piece
+    goes into the open bar with the least free length that still fits it, the
+    bar that reached that free length first on ties, or else into a new bar.
+    """
+    bars = []  # [free, stamp, counts]
+    stamp = 0
+    for f in sorted(order, key=lambda f: order[f]["length"], reverse=True):
+        length = order[f]["length"]
+        for _ in range(order[f]["demand"]):
+            fitting = [bar for bar in bars if bar[0] >= length]
+            if fitting:
+                bar = min(fitting, key=lambda bar: (bar[0], bar[1]))
+            else:
+                bar = [stock_length, 0, dict.fromkeys(order, 0)]
+                bars.append(bar)
+            stamp += 1
+            bar[0] -= length
+            bar[1] = stamp
+            bar[2][f] += 1
+    return {stock_id: dict(Counter(tuple(sorted(bar[2].items())) for bar in bars))}
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_matches_piecewise_best_fit(seed):
+    stocks, order = random_instance(seed, items=5)
+    stock_id, stock_info = next(iter(stocks.items()))
+    stocks = {stock_id: {**stock_info, "length": max(info["length"] for info in stocks.values())}}
+    stock_usage, total_cost, cut_counts = ffd_cutting(order, stocks)
+    assert stock_usage == piecewise_best_fit(order, stock_id, stocks[stock_id]["length"])
+    assert cut_counts == check_stock_usage(stock_usage, total_cost, stocks, order)
+
+
+def test_open_bars_best_fit():
+    bars = OpenBars()
+    bars.add("A", (1, 0), 50, 2)
+    bars.add("A", (0, 1), 30, 1)
+    bars.add("B", (2, 0), 40, 3)
+    assert bars.best_fit(35) == (40, ("B", (2, 0)))
+    assert bars.best_fit(25) == (30, ("A", (0, 1)))
+    assert bars.best_fit(55) is None
+    bars.remove(("B", (2, 0)), 40, 3)
+    assert bars.best_fit(35) == (50, ("A", (1, 0)))
+    assert bars.frees == [30, 50]
+
+
+def test_bulk_order_with_many_pieces():
+    stocks, order = random_instance(2, items=12)
+    order = {f: {**info, "demand": info["demand"] * 20000} for f, info in order.items()}
+    assert sum(info["demand"] for info in order.values()) >= 10 ** 5
+    start = time.perf_counter()
+    stock_usage, total_cost, cut_counts = ffd_cutting(order, stocks)
+    assert time.perf_counter() - start < 2.0
+    assert cut_counts == check_stock_usage(stock_usage, total_cost, stocks, order)
+    # Whole groups of identical bars are placed at once, so few distinct patterns remain
+    assert sum(len(patterns) for patterns in stock_usage.values()) < 200
+
+
+def test_item_longer_than_every_stock(stocks):
+    with pytest.raises(ValueError, match="item A is longer than every stock type"):
+        ffd_cutting({"A": {"length": 150, "demand": 1}}, stocks)
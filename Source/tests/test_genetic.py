@@ -0,0 +1,54 @@
+"""Genetic algorithm over pattern-count vectors."""
+
+import time
+
+import numpy as np
+import pytest
+
+from conftest import check_stock_usage, random_instance
+from cutting_stock.genetic import genetic_cutting, random_plans, repair, seed_plans
+from cutting_stock.patterns import PatternMatrix
+
+
+@pytest.mark.parametrize("seed", [None, 3, 7])
+def test_plan_is_never_worse_than_the_seeds(seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    stock_usage, total_cost, demand_met = genetic_cutting(order, stocks, generations=30, seed=0)
+    assert demand_met
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+    matrix, _ = PatternMatrix(stocks, order).prune()
+    seeds = np.array(seed_plans(matrix, order, stocks))
+    assert total_cost <= matrix.evaluate_batch(seeds).cost.min()
+
+
+def test_seeding_stops_at_the_deadline(stocks, order):
+    matrix = PatternMatrix(stocks, order)
+    assert len(seed_plans(matrix, order, stocks)) == 3
+    assert seed_plans(matrix, order, stocks, end=time.monotonic()) == []
+    # Without time for any seed the population is all random
+    stock_usage, total_cost, demand_met = genetic_cutting(order, stocks, seed=0, generations=None, deadline=1e-9)
+    assert demand_met
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+
+
+def test_same_seed_same_plan(stocks, order):
+    assert genetic_cutting(order, stocks, generations=20, seed=5) == genetic_cutting(order, stocks, generations=20, seed=5)
+
+
+def test_repair_meets_the_demand_without_spare_bars():
+    stocks, order = random_instance(4)
+    matrix = PatternMatrix(stocks, order)
+    plans = repair(matrix, random_plans(matrix, 10, np.random.default_rng(1)))
+    scores = matrix.evaluate_batch(plans)
+    assert scores.demand_met.all()
+    # No bar can be removed without leaving some piece short
+    for plan, coverage in zip(plans, scores.coverage):
+        for row in np.flatnonzero(plan):
+            assert (coverage - matrix.counts[row] < matrix.demand).any()
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    assert genetic_cutting(order, stocks, seed=0) == ({stock_id: {} for stock_id in stocks}, 0, True)
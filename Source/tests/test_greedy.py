@@ -0,0 +1,139 @@
+"""PatternMatrix and the greedy heuristics against the original scripts."""
+
+import numpy as np
+import pytest
+
+from conftest import random_instance
+from cutting_stock.benchmark import bundled_instance
+from cutting_stock.greedy import greedy_cutting, modified_greedy_cutting
+from cutting_stock.patterns import PatternMatrix, evaluate_stock_usage, generate_patterns
+from test_patterns import baseline_generate_patterns
+
+
+def baseline_greedy(order, stocks, key, fallback=False):
+    """
+    The original greedy loop with the pattern sort `key`. Where it would loop
+    forever (a whole pass over the stock types without a fitting pattern) it
+    returns None, or with `fallback` cuts the trimmed pattern of
+    `PatternMatrix.cover_remaining` as the package does.
+    """
+    sorted_stocks = sorted(stocks.items(), key=lambda x: x[1]['cost'] / x[1]['length'])
+    patterns = {stock_id: sorted(baseline_generate_patterns(stock_info["length"], order),
+                                 key=lambda p: key(p, stock_info["cost"]), reverse=True)
+                for stock_id, stock_info in stocks.items()}
+    remaining_demand = {k: v['demand'] for k, v in order.items()}
+    stock_usage = {stock_id: {} for stock_id in stocks}
+    total_cost = 0
+
+    while any(remaining_demand[f] > 0 for f in remaining_demand):
+        progress = False
+        for stock_id, stock_info in sorted_stocks:
+            best_pattern = next((p for p in patterns[stock_id]
+                                 if all(remaining_demand[f] >= p[f] for f in p)), None)
+            if not best_pattern:
+                continue
+            pattern_tuple = tuple(sorted(best_pattern.items()))
+            stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + 1
+            for item in best_pattern:
+                remaining_demand[item] -= best_pattern[item]
+            total_cost += stock_info["cost"]
+            progress = True
+            if all(remaining_demand[f] <= 0 for f in remaining_demand):
+                break
+        if not progress:
+            if not fallback:
+                return None
+            matrix = PatternMatrix(stocks, order)
+            row, counts = matrix.cover_remaining(np.array([remaining_demand[f] for f in order]))
+            stock_id = matrix.stock_ids[matrix.stock_index[row]]
+            pattern_tuple = matrix.pattern_tuple(row, counts)
+            stock_usage[stock_id][pattern_tuple] = stock_usage[stock_id].get(pattern_tuple, 0) + 1
+            for item, n in zip(order, counts.tolist()):
+                remaining_demand[item] -= n
+            total_cost += stocks[stock_id]["cost"]
+    return stock_usage, total_cost
+
+
+def greedy_key(order):
+    return lambda pattern, cost: sum(pattern.values())
+
+
+def modified_key(order):
+    return lambda pattern, cost: (sum(pattern.values()), -sum(order[f]["length"] * pattern[f] for f in pattern), cost)
+
+
+VARIANTS = {"greedy": (greedy_cutting, greedy_key), "modified": (modified_greedy_cutting, modified_key)}
+
+
+def terminating_seeds(n):
+    """Seeds of the first `n` random instances on which both original loops terminate."""
+    seeds = []
+    seed = 0
+    while len(seeds) < n:
+        stocks, order = random_instance(seed)
+        if all(baseline_greedy(order, stocks, key(order)) is not None for _, key in VARIANTS.values()):
+            seeds.append(seed)
+        seed += 1
+    return seeds
+
+
+INSTANCES = [None] + terminating_seeds(8)
+
+
+def test_pattern_matrix_rows(stocks, order):
+    matrix = PatternMatrix(stocks, order)
+    lengths = np.array([order[f]["length"] for f in order])
+    for stock_id, stock_info in stocks.items():
+        expected = [[p[f] for f in order] for p in generate_patterns(stock_info["length"], order) if any(p.values())]
+        rows = matrix.rows(stock_id)
+        assert matrix.counts[rows].tolist() == expected
+        assert (matrix.waste[rows] == stock_info["length"] - matrix.counts[rows] @ lengths).all()
+        assert (matrix.cost[rows] == stock_info["cost"]).all()
+    assert len(matrix) == sum(len(matrix.rows(s)) for s in stocks)
+
+
+def test_evaluate_matches_stock_usage(stocks, order):
+    matrix = PatternMatrix(stocks, order)
+    x = np.zeros(len(matrix), dtype=np.int64)
+    x[[0, 5, len(matrix) - 1]] = [2, 1, 3]
+    cost, cut = matrix.evaluate(x)
+    usage_cost, usage_cut = evaluate_stock_usage(matrix.to_stock_usage(x), stocks, order)
+    assert cost == usage_cost
+    assert cut.tolist() == usage_cut.tolist()
+
+
+@pytest.mark.parametrize("seed", INSTANCES)
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def test_greedy_matches_baseline(variant, seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    solver, key = VARIANTS[variant]
+    expected = baseline_greedy(order, stocks, key(order))
+
+    stock_usage, total_cost, cut_counts = solver(order, stocks)
+    if expected is not None:
+        assert (stock_usage, total_cost) == expected
+    # Where the original loop never ends, the matrix version finishes with a trimmed pattern instead
+    assert all(cut_counts[f] >= order[f]["demand"] for f in order)
+
+
+@pytest.mark.parametrize("scale", [5, 20])
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def test_high_demand_matches_baseline(variant, scale):
+    solver, key = VARIANTS[variant]
+    for seed in INSTANCES[1:4]:
+        stocks, order = random_instance(seed)
+        order = {f: {**info, "demand": info["demand"] * scale} for f, info in order.items()}
+        expected = baseline_greedy(order, stocks, key(order))
+        stock_usage, total_cost, _ = solver(order, stocks)
+        if expected is not None:
+            assert (stock_usage, total_cost) == expected
+
+
+@pytest.mark.parametrize("scale", [1, 7, 100, 1000])
+@pytest.mark.parametrize("variant", sorted(VARIANTS))
+def test_bulk_rounds_match_bar_by_bar(variant, scale):
+    solver, key = VARIANTS[variant]
+    stocks, order = bundled_instance(scale)
+    stock_usage, total_cost, _ = solver(order, stocks)
+    assert (stock_usage, total_cost) == baseline_greedy(order, stocks, key(order), fallback=True)
@@ -0,0 +1,60 @@
+"""Incremental re-solving after a demand change."""
+
+import pytest
+
+from conftest import check_stock_usage
+from cutting_stock import evaluate_stock_usage, solve
+from cutting_stock.incremental import apply_delta, repair_plan, resolve
+
+
+def test_apply_delta(order):
+    changed = apply_delta(order, {"S": 5, "XL": -7})
+    assert changed["S"]["demand"] == 25 and changed["XL"]["demand"] == 0
+    assert changed["M"] == order["M"] and order["S"]["demand"] == 20
+    with pytest.raises(ValueError, match="not in the order"):
+        apply_delta(order, {"XXL": 1})
+
+
+def test_repair_keeps_the_bars_it_can(stocks, order):
+    previous = solve(stocks, order, "ffd")
+    changed = apply_delta(order, {"S": 7})
+    stock_usage, stats = repair_plan(stocks, changed, previous.stock_usage)
+    assert stats["dropped"] == 0 and stats["added"] > 0
+    check_stock_usage(stock_usage, evaluate_stock_usage(stock_usage, stocks, changed)[0], stocks, changed)
+    for stock_id, patterns in previous.stock_usage.items():
+        for pattern_tuple, count in patterns.items():
+            assert stock_usage[stock_id][pattern_tuple] >= count
+
+
+@pytest.mark.parametrize("method", ["repair", "sa", "column_generation"])
+def test_resolve_meets_the_changed_order(method, stocks, order):
+    previous = solve(stocks, order, "sa", seed=1)
+    options = {"seed": 1} if method == "sa" else {}
+    plan = resolve(stocks, order, previous, {"S": 7, "XL": -2}, method, **options)
+    assert plan.method == f"resolve:{method}" and plan.demand_met
+    assert plan.cut_counts == check_stock_usage(plan.stock_usage, plan.total_cost, stocks, plan.stats["order"])
+    assert plan.stats["kept"] > 0
+    if method != "repair":
+        # The search step never returns a worse plan than the repair
+        assert plan.total_cost <= resolve(stocks, order, previous, {"S": 7, "XL": -2}).total_cost
+
+
+def test_cancellations_drop_redundant_bars(stocks, order):
+    previous = solve(stocks, order, "column_generation")
+    plan = resolve(stocks, order, previous, {"S": -20, "M": -10})
+    assert plan.demand_met and plan.stats["dropped"] > 0 and plan.stats["added"] == 0
+    assert plan.total_cost < previous.total_cost
+
+
+@pytest.mark.parametrize("method", ["repair", "sa", "column_generation"])
+def test_cancelling_all_demand_gives_the_empty_plan(method, stocks, order):
+    previous = solve(stocks, order, "greedy")
+    plan = resolve(stocks, order, previous, {f: -info["demand"] for f, info in order.items()}, method)
+    assert plan.demand_met and plan.total_cost == 0
+    assert not any(plan.stock_usage.values())
+    assert plan.stats["kept"] == 0
+
+
+def test_unknown_method(stocks, order):
+    with pytest.raises(ValueError, match="unknown method"):
+        resolve(stocks, order, solve(stocks, order), {}, "greedy")
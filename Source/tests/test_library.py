@@ -0,0 +1,58 @@
+"""Persistent pattern library behind the pattern cache."""
+
+import os
+
+from cutting_stock.library import PatternLibrary, use_library
+from cutting_stock.patterns import PatternCache, pattern_vectors
+
+LENGTHS = [15, 30, 34, 47]
+
+
+def test_hit_across_cache_instances(tmp_path):
+    first = PatternCache(library=PatternLibrary(tmp_path))
+    vectors = first.get(100, LENGTHS)
+    assert first.library.info()["files"] == 1 and first.library.misses == 1
+
+    # A fresh cache (as in another process) reads the stored file instead of enumerating
+    second = PatternCache(library=PatternLibrary(tmp_path))
+    assert second.get(100, LENGTHS) == vectors == tuple(pattern_vectors(100, LENGTHS))
+    assert second.library.hits == 1 and second.library.misses == 0
+    assert second.info()["library"]["files"] == 1
+    # Signatures differing in any part of the key are separate files
+    second.get(100, LENGTHS, maximal=False)
+    second.get(100, LENGTHS[:3])
+    assert second.library.info()["files"] == 3
+
+
+def test_unreadable_file_is_a_miss(tmp_path):
+    library = PatternLibrary(tmp_path)
+    with open(library.path(100, LENGTHS), "wb") as f:
+        f.write(b"garbage")
+    cache = PatternCache(library=library)
+    assert cache.get(100, LENGTHS) == tuple(pattern_vectors(100, LENGTHS))
+    assert library.misses == 1
+    assert PatternLibrary(tmp_path).load(100, LENGTHS) == cache.get(100, LENGTHS)
+
+
+def test_least_recently_used_files_are_evicted(tmp_path):
+    library = PatternLibrary(tmp_path)
+    for k, stock_length in enumerate((80, 100, 120)):
+        library.store(stock_length, LENGTHS, True, pattern_vectors(stock_length, LENGTHS))
+        os.utime(library.path(stock_length, LENGTHS), (1000 + k, 1000 + k))
+    # Reading a file makes it the most recently used one
+    library.load(80, LENGTHS)
+    sizes = {path: size for _, size, path in library.files()}
+    library.max_bytes = sizes[library.path(80, LENGTHS)] + sizes[library.path(120, LENGTHS)]
+    library.evict()
+    assert sorted(path for _, _, path in library.files()) == sorted(
+        [library.path(80, LENGTHS), library.path(120, LENGTHS)])
+
+    library.clear()
+    assert library.info()["files"] == 0
+
+
+def test_use_library(tmp_path):
+    cache = PatternCache()
+    library = use_library(tmp_path / "library", cache=cache)
+    assert cache.library is library and os.path.isdir(library.directory)
+    assert use_library(None, cache=cache) is None and cache.library is None
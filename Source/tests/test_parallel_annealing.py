@@ -0,0 +1,40 @@
+"""Multi-chain simulated annealing."""
+
+import pytest
+
+from conftest import check_stock_usage, random_instance
+from cutting_stock.annealing import parallel_simulated_annealing
+
+
+@pytest.mark.parametrize("exchange_interval", [None, 250], ids=["independent", "tempering"])
+def test_result_does_not_depend_on_workers(exchange_interval, stocks, order):
+    runs = [parallel_simulated_annealing(order, stocks, chains=3, master_seed=11, max_iterations=1500,
+                                         exchange_interval=exchange_interval, workers=workers)
+            for workers in (1, 2, 3)]
+    assert runs[0] == runs[1] == runs[2]
+    stock_usage, total_cost, demand_met = runs[0]
+    assert demand_met
+    check_stock_usage(stock_usage, total_cost, stocks, order)
+
+
+def test_master_seed_changes_the_chains():
+    stocks, order = random_instance(3, items=6)
+    plans = {parallel_simulated_annealing(order, stocks, chains=2, master_seed=seed, max_iterations=300,
+                                          workers=1)[1] for seed in range(6)}
+    assert len(plans) > 1
+
+
+@pytest.mark.parametrize("empty", [False, True], ids=["all-zero", "empty"])
+def test_order_without_demand(empty, stocks, order):
+    order = {} if empty else {f: {**info, "demand": 0} for f, info in order.items()}
+    assert parallel_simulated_annealing(order, stocks, chains=2, workers=1) == (
+        {stock_id: {} for stock_id in stocks}, 0, True)
+
+
+def test_without_a_feasible_chain_returns_the_last_plan(stocks, order):
+    stock_usage, total_cost, demand_met = parallel_simulated_annealing(order, stocks, chains=2, max_iterations=0,
+                                                                        workers=1)
+    assert isinstance(total_cost, int)
+    # The chains start from random plans that already meet the demand
+    assert demand_met
+    check_stock_usage(stock_usage, total_cost, stocks, order)
@@ -0,0 +1,31 @@
+"""Reuse of generated patterns across calls and orders."""
+
+from cutting_stock.patterns import PatternCache, generate_patterns, pattern_cache, pattern_vectors
+
+
+def test_cache_hits_and_lru_eviction():
+    cache = PatternCache(maxsize=2)
+    first = cache.get(100, [20, 30])
+    assert cache.get(100, [20, 30]) is first
+    assert list(first) == pattern_vectors(100, [20, 30])
+    # Same lengths under the other rule are a separate entry
+    cache.get(100, [20, 30], maximal=False)
+    cache.get(120, [20, 30])
+    assert cache.info() == {"hits": 1, "misses": 3, "size": 2, "maxsize": 2}
+    # The least recently used entry was dropped
+    cache.get(100, [20, 30])
+    assert cache.misses == 4
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+
+
+def test_orders_with_the_same_lengths_share_entries(stocks, order):
+    pattern_cache.clear()
+    renamed = {f"{label}-copy": dict(info, demand=1) for label, info in order.items()}
+    for stock_info in stocks.values():
+        generate_patterns(stock_info["length"], order)
+    for stock_info in stocks.values():
+        patterns = generate_patterns(stock_info["length"], renamed)
+        assert set(patterns[0]) == set(renamed)
+    assert pattern_cache.misses == len(stocks)
+    assert pattern_cache.hits == len(stocks)
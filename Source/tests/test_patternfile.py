@@ -0,0 +1,74 @@
+"""Binary pattern files and memory-mapped pattern matrices."""
+
+import numpy as np
+import pytest
+
+from conftest import random_instance
+from cutting_stock import pattern_cache, solve, solve_batch
+from cutting_stock.patternfile import load_pattern_file, write_pattern_file
+from cutting_stock.patterns import PatternMatrix, order_lengths, pattern_vectors
+
+
+@pytest.mark.parametrize("maximal", [True, False], ids=["maximal", "fits"])
+def test_round_trip(maximal, stocks, order, tmp_path):
+    path = tmp_path / "patterns.bin"
+    matrix = PatternMatrix(stocks, order, maximal)
+    assert write_pattern_file(path, stocks, order, maximal) == len(matrix)
+
+    pattern_file = load_pattern_file(path)
+    assert pattern_file.maximal == maximal
+    assert pattern_file.items == list(order) and pattern_file.stocks == stocks
+    assert pattern_file.data.dtype == np.dtype("<i1")
+    assert pattern_file.counts.tolist() == matrix.counts.tolist()
+    assert pattern_file.length.tolist() == matrix.length.tolist()
+    assert pattern_file.waste.tolist() == matrix.waste.tolist()
+    lengths = tuple(order_lengths(order))
+    for stock_info in stocks.values():
+        key = (stock_info["length"], lengths, maximal)
+        assert list(pattern_file.cache_entries()[key]) == pattern_vectors(*key)
+
+
+def test_matrix_from_file_is_zero_copy(stocks, order, tmp_path):
+    path = tmp_path / "patterns.bin"
+    write_pattern_file(path, stocks, order)
+    pattern_file = load_pattern_file(path)
+    assert isinstance(pattern_file.data, np.memmap) and not pattern_file.data.flags.writeable
+
+    matrix = PatternMatrix.from_file(pattern_file, order)
+    for array in (matrix.counts, matrix.length, matrix.waste):
+        assert np.shares_memory(array, pattern_file.data)
+    expected = PatternMatrix(stocks, order)
+    assert matrix.counts.tolist() == expected.counts.tolist()
+    assert matrix.cost.tolist() == expected.cost.tolist()
+
+    # A subset of the stock types gathers its rows instead
+    subset = {stock_id: stocks[stock_id] for stock_id in ("Type 3", "Type 1")}
+    matrix = PatternMatrix.from_file(pattern_file, order, subset)
+    assert not np.shares_memory(matrix.counts, pattern_file.data)
+    assert matrix.counts.tolist() == PatternMatrix(subset, order).counts.tolist()
+
+
+def test_mismatches_are_rejected(stocks, order, tmp_path):
+    path = tmp_path / "patterns.bin"
+    write_pattern_file(path, stocks, order)
+    pattern_file = load_pattern_file(path)
+    with pytest.raises(ValueError, match="item lengths"):
+        PatternMatrix.from_file(pattern_file, {"S": {"length": 16, "demand": 1}})
+    with pytest.raises(ValueError, match="not in the pattern file"):
+        PatternMatrix.from_file(pattern_file, order, {"Type 1": {"length": 81, "cost": 90}})
+    bad = tmp_path / "bad.bin"
+    bad.write_bytes(b"not a pattern file")
+    with pytest.raises(ValueError, match="not a pattern file"):
+        load_pattern_file(bad)
+
+
+def test_batch_reads_pattern_files(stocks, tmp_path):
+    # Same item lengths, different demands: one pattern file covers the whole batch
+    _, base = random_instance(0)
+    orders = [{f: {**info, "demand": info["demand"] + k} for f, info in base.items()} for k in range(3)]
+    path = tmp_path / "patterns.bin"
+    write_pattern_file(path, stocks, orders[0])
+    pattern_cache.clear()
+    results = dict(solve_batch(orders, stocks, "greedy", workers=1, pattern_files=[path]))
+    assert pattern_cache.misses == 0
+    assert [results[k] for k in range(3)] == [solve(stocks, order, "greedy") for order in orders]
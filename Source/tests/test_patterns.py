@@ -0,0 +1,42 @@
+"""Pattern enumeration against the original product-based scripts."""
+
+from itertools import product
+
+import pytest
+
+from conftest import random_instance
+from cutting_stock.patterns import generate_patterns, pattern_vectors
+
+
+def baseline_generate_patterns(stock_length, order, maximal=True):
+    """The original enumeration: filter the product of the per-item cut ranges."""
+    min_length = min(order[f]["length"] for f in order)
+    max_cuts = [stock_length // order[f]["length"] for f in order]
+    feasible_patterns = []
+    for pattern in product(*(range(m + 1) for m in max_cuts)):
+        pattern_dict = dict(zip(order.keys(), pattern))
+        total_length = sum(order[f]["length"] * count for f, count in pattern_dict.items())
+        remaining_length = stock_length - total_length
+        if remaining_length < 0 or (maximal and 0 < remaining_length and remaining_length >= min_length):
+            continue
+        feasible_patterns.append(pattern_dict)
+    return feasible_patterns
+
+
+@pytest.mark.parametrize("seed", [None] + list(range(8)))
+@pytest.mark.parametrize("maximal", [True, False], ids=["maximal", "fits"])
+def test_generate_patterns_matches_baseline(seed, maximal, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    for stock_info in stocks.values():
+        expected = baseline_generate_patterns(stock_info["length"], order, maximal)
+        assert generate_patterns(stock_info["length"], order, maximal) == expected
+
+
+def test_pattern_vectors_edge_cases():
+    assert pattern_vectors(100, []) == []
+    # No item fits: the empty pattern already leaves less than the smallest item
+    assert pattern_vectors(10, [20, 30]) == [(0, 0)]
+    assert pattern_vectors(60, [20, 30]) == [(0, 2), (1, 1), (3, 0)]
+    assert pattern_vectors(50, [20, 30]) == [(1, 1), (2, 0)]
+    assert len(pattern_vectors(50, [20, 30], maximal=False)) == 5
@@ -0,0 +1,81 @@
+"""Per-phase memory profiling."""
+
+import json
+import pstats
+import tracemalloc
+
+from cutting_stock.patterns import pattern_cache
+from cutting_stock.profiling import MemoryProfile, Trace, active_trace, count, phase, profile_memory, profile_solve
+
+
+def test_profile_memory_phases(stocks, order):
+    plan, report = profile_memory(stocks, order, "greedy")
+    assert plan.demand_met
+    assert set(report["phases"]) == {"patterns", "search", "evaluation", "reporting"}
+    for record in report["phases"].values():
+        assert record["calls"] == 1 and record["peak"] >= 0 and record["elapsed"] >= 0
+        assert all(site["size"] > 0 for site in record["top"])
+    assert report["peak"] == max(record["peak"] for record in report["phases"].values())
+    assert report["method"] == "greedy"
+    assert not tracemalloc.is_tracing()
+
+
+def test_nested_and_repeated_phases():
+    with MemoryProfile(top=0) as profile:
+        for _ in range(2):
+            with profile.phase("outer"):
+                with phase("inner"):
+                    block = bytearray(1 << 20)
+                    del block
+    phases = profile.report()["phases"]
+    assert phases["inner"]["calls"] == phases["outer"]["calls"] == 2
+    assert phases["inner"]["peak"] >= 1 << 20
+    # The outer peak includes the allocations of the inner phase
+    assert phases["outer"]["peak"] >= phases["inner"]["peak"]
+    assert "top" not in phases["inner"]
+
+
+def test_phase_without_profile_is_a_no_op():
+    assert phase("search") is phase("patterns")
+    with phase("search"):
+        pass
+    assert not tracemalloc.is_tracing()
+
+
+def test_profile_solve_greedy_counters(stocks, order, tmp_path):
+    log = tmp_path / "greedy.jsonl"
+    pattern_cache.clear()
+    plan, report = profile_solve(stocks, order, "greedy", log=log, cprofile=tmp_path / "greedy.prof")
+    counters = report["counters"]
+    assert counters["greedy.bars"] == sum(sum(patterns.values()) for patterns in plan.stock_usage.values())
+    assert counters["patterns.generated"] > 0
+    assert {"patterns", "search", "evaluation"} <= set(report["timers"])
+    records = [json.loads(line) for line in log.read_text().splitlines()]
+    assert {"kind": "counter", "name": "greedy.bars", "value": counters["greedy.bars"]} in records
+    assert pstats.Stats(str(tmp_path / "greedy.prof")).total_calls > 0
+
+
+def test_profile_solve_sa_counters(stocks, order):
+    _, report = profile_solve(stocks, order, "sa", sample_every=100, seed=1, max_iterations=1000)
+    counters = report["counters"]
+    assert counters["sa.iterations"] == 1000
+    assert counters["sa.accepted"] + counters["sa.rejected"] + counters["sa.idle"] == 1000
+    assert len(report["samples"]["sa.temperature"]) == 10
+    assert {"sa.setup", "sa.anneal"} <= set(report["timers"])
+
+
+def test_profile_solve_sa_counts_iterations_run_before_the_deadline(stocks, order):
+    _, report = profile_solve(stocks, order, "sa", seed=0, max_iterations=None, deadline=0.05)
+    counters = report["counters"]
+    assert counters["sa.iterations"] > 0
+    assert counters["sa.accepted"] + counters["sa.rejected"] + counters["sa.idle"] == counters["sa.iterations"]
+
+
+def test_counters_without_trace_are_dropped():
+    assert active_trace() is None
+    count("greedy.bars")
+    with Trace() as trace:
+        assert active_trace() is trace
+        count("greedy.bars", 2)
+    count("greedy.bars")
+    assert trace.report()["counters"] == {"greedy.bars": 2}
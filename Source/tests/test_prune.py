@@ -0,0 +1,64 @@
+"""Dominated and duplicate pattern pruning."""
+
+import numpy as np
+import pytest
+
+from conftest import random_instance
+from cutting_stock.bnb import branch_and_bound
+from cutting_stock.patterns import PatternMatrix
+from test_branch_and_bound import brute_force_optimum
+
+
+def pairwise_redundant(matrix):
+    """`PatternMatrix.redundant` by comparing every pair of rows."""
+    rank = {s: k for k, s in enumerate(sorted(matrix.stock_ids, key=lambda s: (matrix.stock_costs[matrix.stock_ids.index(s)],
+                                                                              matrix.stock_ids.index(s))))}
+    dominated = np.zeros(len(matrix), dtype=bool)
+    duplicate = np.zeros(len(matrix), dtype=bool)
+    for p in range(len(matrix)):
+        for q in range(len(matrix)):
+            if q == p or matrix.cost[q] > matrix.cost[p] or not (matrix.counts[q] >= matrix.counts[p]).all():
+                continue
+            if (matrix.counts[q] != matrix.counts[p]).any():
+                dominated[p] = True
+            elif rank[matrix.stock_ids[matrix.stock_index[q]]] < rank[matrix.stock_ids[matrix.stock_index[p]]]:
+                duplicate[p] = True
+    return dominated, duplicate & ~dominated
+
+
+@pytest.mark.parametrize("seed", [None, 1, 2, 3])
+def test_redundant_matches_pairwise_comparison(seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+        # Equal costs make duplicates across stock types possible
+        stocks["Type 2"]["cost"] = stocks["Type 3"]["cost"]
+    matrix = PatternMatrix(stocks, order)
+    dominated, duplicate = matrix.redundant()
+    expected = pairwise_redundant(matrix)
+    assert dominated.tolist() == expected[0].tolist()
+    assert duplicate.tolist() == expected[1].tolist()
+
+
+def test_report_and_kept_rows(stocks, order):
+    matrix = PatternMatrix(stocks, order)
+    pruned, report = matrix.prune()
+    assert report["before"] == len(matrix) and report["after"] == len(pruned)
+    assert report["before"] - report["after"] == report["dominated"] + report["duplicates"]
+    assert sum(after for _, after in report["by_stock"].values()) == len(pruned)
+    assert sum(before for before, _ in report["by_stock"].values()) == len(matrix)
+    for stock_id in stocks:
+        rows = pruned.rows(stock_id)
+        assert (pruned.stock_index[rows] == matrix.stock_ids.index(stock_id)).all()
+    # Every dropped row has a kept row covering it at no higher cost
+    for p in range(len(matrix)):
+        assert ((pruned.counts >= matrix.counts[p]).all(axis=1) & (pruned.cost <= matrix.cost[p])).any()
+
+
+def test_pruning_keeps_the_optimum(stocks):
+    # Type 2 costs as much as the longer Type 3, so its patterns are dominated or duplicated
+    stocks["Type 2"]["cost"] = stocks["Type 3"]["cost"]
+    order = {"A": {"length": 45, "demand": 3}, "B": {"length": 28, "demand": 2}, "C": {"length": 17, "demand": 4}}
+    _, total_cost, stats = branch_and_bound(order, stocks, patterns="all")
+    assert stats["status"] == "optimal"
+    assert stats["pruning"]["by_stock"]["Type 2"][1] == 0
+    assert total_cost == brute_force_optimum(order, stocks)
@@ -0,0 +1,101 @@
+"""The result cache."""
+
+import pytest
+
+from cutting_stock import solve
+from cutting_stock.results import ResultCache, cacheable, plan_from_json, plan_to_json, result_key
+
+
+def test_repeated_order_is_cached(stocks, order):
+    cache = ResultCache()
+    first = solve(stocks, order, "sa", seed=1, cache=cache)
+    # Defaults are part of the key: spelling one out hits the same entry
+    second = solve(stocks, order, "sa", seed=1, max_iterations=5000, cache=cache)
+    assert second == first
+    assert cache.info()["hits"] == 1
+
+    # Callers get copies
+    second.stock_usage.clear()
+    assert solve(stocks, order, "sa", seed=1, cache=cache).stock_usage == first.stock_usage
+
+    solve(stocks, order, "sa", seed=2, cache=cache)
+    assert cache.info()["misses"] == 2 and len(cache) == 2
+
+
+def test_memory_tier_is_lru(stocks, order):
+    cache = ResultCache(maxsize=2)
+    for seed in (1, 2, 3):
+        solve(stocks, order, "sa", seed=seed, cache=cache)
+    assert len(cache) == 2
+    solve(stocks, order, "sa", seed=1, cache=cache)
+    assert cache.info()["hits"] == 0
+
+
+def test_plan_json_round_trip(stocks, order):
+    plan = solve(stocks, order, "column_generation")
+    assert plan_from_json(plan_to_json(plan)) == plan
+
+
+def test_disk_tier_is_shared_and_capped(tmp_path, stocks, order):
+    plan = solve(stocks, order, "greedy", cache=ResultCache(directory=tmp_path))
+    cache = ResultCache(directory=tmp_path)
+    assert solve(stocks, order, "greedy", cache=cache) == plan
+    assert cache.info()["disk_hits"] == 1 and cache.info()["files"] == 1
+
+    cache.disk.max_bytes = 0
+    cache.disk.evict()
+    assert cache.info()["files"] == 0
+
+
+@pytest.mark.parametrize("method,options,expected", [
+    ("greedy", {}, True),
+    ("sa", {}, False),
+    ("sa", {"seed": 4}, True),
+    ("genetic", {"seed": 0, "deadline": 1.0}, False),
+])
+def test_cacheable(method, options, expected):
+    assert cacheable(method, options) is expected
+
+
+def test_unseeded_runs_are_not_cached(stocks, order):
+    cache = ResultCache()
+    solve(stocks, order, "sa", cache=cache)
+    assert len(cache) == 0
+
+
+def test_time_limited_plans_are_cached_only_when_optimal(stocks, order):
+    cache = ResultCache()
+    plan = solve(stocks, order, "branch_and_bound", time_limit=1e-9, cache=cache)
+    assert plan.stats["status"] != "optimal"
+    assert len(cache) == 0
+    assert solve(stocks, order, "branch_and_bound", cache=cache).stats["status"] == "optimal"
+    assert len(cache) == 1
+
+
+def test_options_without_json_form_skip_the_cache(stocks, order):
+    cache = ResultCache()
+    initial = solve(stocks, order, "greedy").stock_usage
+    with pytest.raises(TypeError):
+        result_key(stocks, order, "sa", {"initial": initial})
+    assert solve(stocks, order, "sa", seed=1, initial=initial, cache=cache).demand_met
+    assert len(cache) == 0
+
+
+def test_key_keeps_item_and_stock_order(stocks, order):
+    key = result_key(stocks, order, "greedy")
+    reversed_order = dict(reversed(order.items()))
+    reversed_stocks = dict(reversed(stocks.items()))
+    assert result_key(stocks, reversed_order, "greedy") != key
+    assert result_key(reversed_stocks, order, "greedy") != key
+    # The fields of an entry and the options are not ordered
+    fields = {f: {"demand": info["demand"], "length": info["length"]} for f, info in order.items()}
+    assert result_key(stocks, fields, "greedy") == key
+    assert result_key(stocks, order, "sa", {"seed": 1, "prune": True}) == result_key(stocks, order, "sa",
+                                                                                     {"prune": True, "seed": 1})
+
+    # A plan cached for one item order is not served for another
+    cache = ResultCache()
+    plan = solve(stocks, order, "greedy", cache=cache)
+    assert list(solve(stocks, reversed_order, "greedy", cache=cache).cut_counts) == list(reversed_order)
+    assert list(plan.cut_counts) == list(order)
+    assert cache.info()["hits"] == 0
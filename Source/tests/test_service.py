@@ -0,0 +1,248 @@
+"""Round trips through the HTTP service."""
+
+import asyncio
+import inspect
+import json
+
+import pytest
+
+from cutting_stock.api import SOLVERS, get_solver
+from cutting_stock.results import ResultCache
+from cutting_stock.service import OPTION_RULES, PlanService, RequestError, check_options, check_order
+
+
+async def request(port, head, body=b""):
+    """
+    Send a raw request, read one complete response (by Content-Length or up
+    to the last chunk) and wait for the server to close the connection.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(head + body)
+    await writer.drain()
+    response = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout=60)
+    status_line, *header_lines = response.decode("latin-1").strip().split("\r\n")
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in header_lines)}
+    if headers.get("transfer-encoding") == "chunked":
+        payload = await asyncio.wait_for(reader.readuntil(b"0\r\n\r\n"), timeout=60)
+    else:
+        payload = await asyncio.wait_for(reader.readexactly(int(headers["content-length"])), timeout=60)
+    # A connection left open (e.g. by a worker process holding its socket) fails here
+    assert await asyncio.wait_for(reader.read(), timeout=60) == b""
+    writer.close()
+    return int(status_line.split()[1]), payload, headers
+
+
+def post(port, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return request(port, b"POST /solve HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body), body)
+
+
+def get(port, path):
+    return request(port, b"GET %s HTTP/1.1\r\n\r\n" % path.encode("latin-1"))
+
+
+@pytest.fixture
+def run_service():
+    def run(scenario, **kwargs):
+        async def main():
+            service = PlanService(workers=1, **kwargs)
+            server = await service.start("127.0.0.1", 0)
+            try:
+                return await scenario(service, server.sockets[0].getsockname()[1])
+            finally:
+                await service.close()
+
+        return asyncio.run(main())
+
+    return run
+
+
+def test_solve_round_trip(run_service, stocks, order):
+    async def scenario(service, port):
+        solved = await post(port, {"stocks": stocks, "order": order, "method": "sa", "options": {"seed": 1}})
+        streamed = await post(port, {"stocks": stocks, "order": order, "method": "greedy", "stream": True})
+        return solved, streamed, await get(port, "/status")
+
+    solved, streamed, status = run_service(scenario)
+    assert solved[0] == 200
+    summary = json.loads(solved[1])
+    assert summary["demand_met"] and summary["total_cost"] == 1560
+    assert json.loads(status[1])["solved"] == 2
+
+    # Chunked JSON Lines: queued, one line per plan entry, done
+    assert streamed[0] == 200 and streamed[2]["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in streamed[1].split(b"\r\n") if line.startswith(b"{")]
+    assert lines[0]["status"] == "queued" and lines[-1]["status"] == "done"
+    assert lines[-1]["total_cost"] == 1590
+    assert all("pattern" in line for line in lines[1:-1])
+
+
+def test_repeated_orders_are_answered_from_the_cache(run_service, stocks, order):
+    async def scenario(service, port):
+        payload = {"stocks": stocks, "order": order, "method": "sa", "options": {"seed": 1}}
+        first = await post(port, payload)
+        second = await post(port, payload)
+        streamed = await post(port, {**payload, "stream": True})
+        return first, second, streamed, service.status()
+
+    first, second, streamed, status = run_service(scenario, cache=ResultCache())
+    assert first[0] == second[0] == 200
+    assert json.loads(first[1]) == json.loads(second[1])
+    assert status["solved"] == 1 and status["cached"] == 2
+    assert status["cache"]["hits"] == 2
+    lines = [json.loads(line) for line in streamed[1].split(b"\r\n") if line.startswith(b"{")]
+    assert lines[-1]["status"] == "done" and lines[-1]["total_cost"] == 1560
+
+
+def test_timed_out_plans_are_not_cached(run_service, stocks, order):
+    async def scenario(service, port):
+        payload = {"stocks": stocks, "order": order, "method": "branch_and_bound", "options": {"time_limit": 1e-9}}
+        for _ in range(2):
+            assert (await post(port, payload))[0] == 200
+        return service.status()
+
+    status = run_service(scenario, cache=ResultCache())
+    assert status["solved"] == 2 and status["cached"] == 0
+
+
+def test_identical_orders_are_coalesced(run_service, stocks, order):
+    async def scenario(service, port):
+        payload = {"stocks": stocks, "order": order, "method": "sa", "options": {"seed": 2}}
+        responses = await asyncio.gather(*(post(port, payload) for _ in range(3)))
+        return responses, service.status()
+
+    responses, status = run_service(scenario)
+    assert [response[0] for response in responses] == [200] * 3
+    assert len({response[1] for response in responses}) == 1
+    assert status["solved"] == 1 and status["coalesced"] == 2
+
+
+def test_full_queue_refuses_orders(run_service, stocks, order):
+    async def scenario(service, port):
+        # A slow order keeps the only worker busy while the queue fills up
+        slow = {"stocks": stocks, "order": order, "method": "sa", "options": {"seed": 0, "max_iterations": 300000}}
+        first = asyncio.ensure_future(post(port, slow))
+        while not service.status()["in_flight"]:
+            await asyncio.sleep(0.01)
+        payloads = [{"stocks": stocks, "order": order, "method": "sa", "options": {"seed": seed}} for seed in (1, 2, 3)]
+        responses = await asyncio.gather(*(post(port, payload) for payload in payloads))
+        await first
+        return responses, service.status()
+
+    responses, status = run_service(scenario, max_pending=1)
+    codes = sorted(response[0] for response in responses)
+    assert 503 in codes and 200 in codes
+    refused = next(response for response in responses if response[0] == 503)
+    assert refused[2]["retry-after"] == "1"
+    assert status["rejected"] == codes.count(503)
+
+
+@pytest.mark.parametrize("head,code", [
+    (b"GET /nowhere HTTP/1.1\r\n\r\n", 404),
+    (b"GET /solve HTTP/1.1\r\n\r\n", 405),
+    (b"POST /status HTTP/1.1\r\n\r\n", 405),
+    (b"POST /solve HTTP/1.1\r\nContent-Length: 5\r\n\r\nnope!", 400),
+    (b"POST /solve HTTP/1.1\r\nContent-Length: abc\r\n\r\n", 400),
+    (b"POST /solve HTTP/1.1\r\nContent-Length: -3\r\n\r\n", 400),
+    (b"POST /solve HTTP/1.1\r\nContent-Length: 99999999\r\n\r\n", 413),
+])
+def test_bad_requests(run_service, head, code):
+    async def scenario(service, port):
+        return await request(port, head)
+
+    status, payload, _ = run_service(scenario)
+    assert status == code
+    assert "error" in json.loads(payload)
+
+
+def test_unknown_method(run_service, stocks, order):
+    async def scenario(service, port):
+        return await post(port, {"stocks": stocks, "order": order, "method": "simplex"})
+
+    status, payload, _ = run_service(scenario)
+    assert status == 400 and "unknown method" in json.loads(payload)["error"]
+
+
+@pytest.mark.parametrize("change", [{"options": [1]}, {"method": ["sa"]}, {"stocks": [1]}, {"order": "S"}])
+def test_fields_of_the_wrong_type(run_service, stocks, order, change):
+    async def scenario(service, port):
+        return await post(port, {"stocks": stocks, "order": order, **change})
+
+    status, payload, _ = run_service(scenario)
+    assert status == 400 and "error" in json.loads(payload)
+
+
+@pytest.mark.parametrize("stock,item,message", [
+    ({"length": -100, "cost": 10}, {}, "positive integer length"),
+    ({"length": 100.5, "cost": 10}, {}, "positive integer length"),
+    ({"length": True, "cost": 10}, {}, "positive integer length"),
+    ({"length": 100, "cost": -1}, {}, "non-negative cost"),
+    ({"length": 100}, {}, "non-negative cost"),
+    ({"length": 100, "cost": 10}, {"length": 0}, "positive integer length"),
+    ({"length": 100, "cost": 10}, {"demand": -1}, "non-negative integer demand"),
+    ({"length": 100, "cost": 10}, {"demand": 1.5}, "non-negative integer demand"),
+    ({"length": 100, "cost": 10}, {"length": 101}, "longer than every stock type"),
+])
+def test_invalid_entries(stock, item, message):
+    order = {"A": {"length": 40, "demand": 3, **item}}
+    with pytest.raises(RequestError, match=message) as error:
+        check_order({"Type 1": stock}, order)
+    assert error.value.status == 400
+
+
+def test_entries_must_be_objects():
+    with pytest.raises(RequestError, match="item A must be an object"):
+        check_order({"Type 1": {"length": 100, "cost": 10}}, {"A": [40, 3]})
+    with pytest.raises(RequestError, match="stock Type 1 must be an object"):
+        check_order({"Type 1": 100}, {})
+
+
+@pytest.mark.parametrize("method,options,message", [
+    ("genetic", {"generations": 1e9}, "'generations' of method 'genetic' must be an integer"),
+    ("genetic", {"generations": 10**9}, r"in \[0, 10000\]"),
+    ("genetic", {"patience": None}, "'patience'"),
+    ("parallel_sa", {"workers": 64}, "'workers' is not accepted"),
+    ("sa", {"initial": {}}, "'initial' is not accepted"),
+    ("sa", {"prune": 1}, "must be a boolean"),
+    ("branch_and_bound", {"patterns": "some"}, "one of"),
+    ("ffd", {"deadline": 1.0}, "'deadline' is not accepted"),
+    ("sa", {"deadline": "soon"}, "positive number of seconds"),
+    ("sa", {"deadline": 0}, "positive number of seconds"),
+])
+def test_invalid_options(method, options, message):
+    with pytest.raises(RequestError, match=message):
+        check_options(method, options)
+
+
+def test_allowed_options():
+    check_options("sa", {"seed": None, "max_iterations": 100, "cooling_rate": 0.99, "deadline": None})
+    check_options("parallel_sa", {"exchange_interval": None, "chains": 4, "deadline": 2})
+    check_options("branch_and_bound", {"patterns": "all", "time_limit": 1})
+    # Every rule names a parameter of its solver
+    assert set(OPTION_RULES) == set(SOLVERS)
+    for method, rules in OPTION_RULES.items():
+        assert set(rules) <= set(inspect.signature(get_solver(method)).parameters)
+
+
+def test_deadline_default_and_maximum():
+    service = PlanService(workers=1, deadline=5.0, max_deadline=20.0)
+    assert service.solver_options("sa", {"seed": 1}) == {"seed": 1, "deadline": 5.0}
+    assert service.solver_options("sa", {"deadline": None})["deadline"] == 5.0
+    assert service.solver_options("genetic", {"deadline": 100})["deadline"] == 20.0
+    assert service.solver_options("parallel_sa", {}) == {"workers": 1, "deadline": 5.0}
+    assert service.solver_options("ffd", {}) == {}
+
+
+def test_invalid_requests_are_answered_with_400(run_service, stocks, order):
+    async def scenario(service, port):
+        too_long = {**order, "XXL": {"length": 150, "demand": 1}}
+        return [await post(port, {"stocks": stocks, "order": too_long, "method": "sa"}),
+                await post(port, {"stocks": stocks, "order": order, "method": "genetic",
+                                  "options": {"generations": 1e9, "patience": None}}),
+                await post(port, {"stocks": stocks, "order": order, "method": "parallel_sa",
+                                  "options": {"workers": 64}})], service.status()
+
+    responses, status = run_service(scenario)
+    assert [response[0] for response in responses] == [400] * 3
+    assert "item XXL is longer than every stock type" in json.loads(responses[0][1])["error"]
+    assert status["solved"] == 0
@@ -0,0 +1,64 @@
+"""Streamed plans and their JSON Lines and CSV sinks."""
+
+import csv
+import io
+import json
+from collections import Counter
+
+import pytest
+
+from conftest import random_instance
+from cutting_stock import solve
+from cutting_stock.ffd import ffd_cutting
+from cutting_stock.stream import main, plan_entries, solve_stream, write_csv, write_jsonl
+
+
+def totals(entries):
+    """Bars per (stock, pattern) over a stream, where a pattern may come more than once."""
+    bars = Counter()
+    for entry in entries:
+        bars[entry.stock, entry.pattern] += entry.count
+    return bars
+
+
+@pytest.mark.parametrize("seed", [None, 3, 7])
+def test_streamed_ffd_matches_the_packing(seed, stocks, order):
+    if seed is not None:
+        stocks, order = random_instance(seed)
+    stock_usage, _, _ = ffd_cutting(order, stocks)
+    assert totals(solve_stream(stocks, order)) == totals(plan_entries(stock_usage, order))
+
+
+def test_other_methods_stream_their_plan(stocks, order):
+    plan = solve(stocks, order, "greedy")
+    assert list(solve_stream(stocks, order, "greedy")) == list(plan_entries(plan.stock_usage, order))
+
+
+def test_streamed_ffd_takes_no_options(stocks, order):
+    with pytest.raises(TypeError, match="method 'ffd'.*'seed'"):
+        next(solve_stream(stocks, order, "ffd", seed=1))
+
+
+def test_sinks(stocks, order):
+    entries = list(solve_stream(stocks, order))
+
+    out = io.StringIO()
+    assert write_jsonl(entries, out, order) == len(entries)
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert lines[0] == {"items": list(order)}
+    assert [(r["stock"], tuple(r["pattern"]), r["count"]) for r in lines[1:]] == entries
+
+    out = io.StringIO()
+    assert write_csv(entries, out, order) == len(entries)
+    rows = list(csv.reader(io.StringIO(out.getvalue())))
+    assert rows[0] == ["stock", *order, "count"]
+    assert [(r[0], tuple(map(int, r[1:-1])), int(r[-1])) for r in rows[1:]] == entries
+
+
+def test_command_line(stocks, order, tmp_path):
+    problem = tmp_path / "problem.json"
+    problem.write_text(json.dumps({"stocks": stocks, "order": order}))
+    output = tmp_path / "plan.csv"
+    assert main([str(problem), "--format", "csv", "--output", str(output)]) == 0
+    rows = list(csv.DictReader(output.open()))
+    assert sum(int(row["S"]) * int(row["count"]) for row in rows) >= order["S"]["demand"]